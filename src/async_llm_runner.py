@@ -0,0 +1,228 @@
+import argparse
+import asyncio
+import json
+import logging
+import random
+
+from wordle_solver import WordListGeneratorLLM, AsyncOpenAIInterface
+from wordle_judge import WordleJudge
+from word_matrix import read_word_file
+from experiment_recorder import BufferedExperimentRecorder
+from llm_cache import PromptCache
+from openai_clients import DEFAULT_TIMEOUT, pool_metrics, read_api_key, shared_client
+from prompt_builder import DEFAULT_RANKING, RANKINGS
+from trace_sink import NULL_TRACE_SINK, TRACE_MODES, TraceSink
+from experiment_runner import CANIDATE_FIRST_WORD_LIST, MAX_ATTEMPTS, WORDS_FP, GameResult
+from solver_logging import add_logging_arguments, configure_logging_from_args, get_logger, log_event
+
+logger = get_logger(__name__)
+
+
+async def play_llm_game_async(wordle_virtual_assistant, llm_interface, answer, first_word, semaphore=None,
+                              max_attempts=MAX_ATTEMPTS):
+    """
+    Plays one game with the LLM solver, awaiting the LLM instead of blocking on it.
+
+    The generator holds the state of this game only; give every concurrent game its own generator, e.g.
+    from WordListGeneratorBase.clone.  A failed request or an unreadable LLM answer is logged as an 
+    "llm_error" event and ends this game unsolved, without affecting the other games of a run.
+
+    Args:
+        wordle_virtual_assistant (WordListGeneratorLLM): The generator of this game.
+        llm_interface (AsyncOpenAIInterface): The interface used to ask the LLM for a recommendation.
+        answer (str): The correct word.
+        first_word (str): The first guess.
+        semaphore (asyncio.Semaphore, optional): Limits the chat requests in flight across games. Defaults to None.
+        max_attempts (int, optional): The number of attempts after which the game is aborted. Defaults to MAX_ATTEMPTS.
+
+    Returns:
+        tuple: The last guessed word, or None if the generator ran out of candidates or the LLM failed, and the 
+            number of attempts.
+    """
+    import openai
+
+    wordle_virtual_assistant.trace("game", answer=answer, first_word=first_word)
+    wordle_game = WordleJudge(answer)
+
+    word = first_word
+    attempt_count = 0
+    while True:
+        attempt_count += 1
+        if attempt_count > max_attempts:
+            break
+
+        result = wordle_game.judge_guess(word)
+        if result is True:
+            break
+
+        wordle_virtual_assistant.update_state(result, word)
+        generated_prompt = wordle_virtual_assistant.generate_llm_prompt()
+        if generated_prompt is None:
+            word = None
+            break
+
+        try:
+            if semaphore is None:
+                content = await llm_interface.chat(generated_prompt)
+            else:
+                async with semaphore:
+                    content = await llm_interface.chat(generated_prompt)
+
+            llm_response = json.loads(content)
+            word = llm_response["recommendation"]
+        except (openai.APIError, ValueError, KeyError, TypeError) as e:
+            log_event(logger, logging.ERROR, "llm_error", "Game of %s failed at attempt %d: %s", answer, attempt_count,
+                      e, answer=answer, attempt=attempt_count, error=repr(e))
+            word = None
+            break
+        wordle_virtual_assistant.record_llm_response(llm_response)
+
+    wordle_virtual_assistant.trace("result", word=word, num_attempts=attempt_count)
+    return word, attempt_count
+
+
+async def run_llm_games_async(llm_interface, answers, trials=1, first_word=None, concurrency=16, seed=None,
+                              recorder=None, words_fp=WORDS_FP, dump_file_dir="llm_trace_data", trace_sink=None,
+                              token_budget=None, rank_by=DEFAULT_RANKING, answers_fp=None):
+    """
+    Plays every answer for a number of trials with the LLM solver, all games concurrently.
+
+    The word list is loaded once and every game gets a clone of the loaded generator, so the games share
+    nothing but the read-only word list.  At most concurrency chat requests are in flight at any time.  A game 
+    that fails is logged and recorded unsolved, with word None, while the other games keep running.
+
+    Args:
+        llm_interface (AsyncOpenAIInterface): The interface used to ask the LLM for recommendations.
+        answers (list): The correct words to play.
+        trials (int, optional): The number of games per answer. Defaults to 1.
+        first_word (str, optional): The first guess of every game. Defaults to a random choice from CANIDATE_FIRST_WORD_LIST.
+        concurrency (int, optional): The maximum number of chat requests in flight. Defaults to 16.
+        seed (int, optional): Seeds the random module for the first words and prompt sampling. Defaults to None.
+        recorder (BufferedExperimentRecorder, optional): Records every game. Defaults to None.
+        words_fp (str, optional): The file path to the word list. Defaults to WORDS_FP.
+        dump_file_dir (str, optional): The directory for the prompt and response files. Defaults to "llm_trace_data".
+        trace_sink (TraceSink, optional): Receives the trace records of the games. Defaults to no tracing.
+        token_budget (int, optional): The most tokens of a prompt. Defaults to None, which samples
+            WordListGeneratorLLM.MAX_SIZE candidate words.
+        rank_by (str, optional): The ranking of the candidate words filling the token budget, see prompt_builder.py.
+            Defaults to DEFAULT_RANKING.
+        answers_fp (str, optional): The answer list of the "answers" ranking. Defaults to None.
+
+    Returns:
+        list: A GameResult for every game, in answer then trial order.
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    template = WordListGeneratorLLM(words_fp, token_budget=token_budget, rank_by=rank_by, answers_fp=answers_fp)
+    template.dump_file_dir = dump_file_dir
+    template.load()
+    template.trace_sink = NULL_TRACE_SINK if trace_sink is None else trace_sink
+
+    semaphore = asyncio.Semaphore(concurrency)
+    games = []
+    for answer in answers:
+        answer = answer.lower()
+        for _ in range(trials):
+            initial_word = first_word if first_word else random.choice(CANIDATE_FIRST_WORD_LIST)
+            games.append((answer, initial_word))
+
+    outcomes = await asyncio.gather(*(
+        play_llm_game_async(template.clone(), llm_interface, answer, initial_word, semaphore)
+        for answer, initial_word in games
+    ), return_exceptions=True)
+
+    results = []
+    for (answer, initial_word), outcome in zip(games, outcomes):
+        if isinstance(outcome, Exception):
+            log_event(logger, logging.ERROR, "llm_error", "Game of %s failed: %s", answer, outcome,
+                      answer=answer, error=repr(outcome))
+            outcome = (None, 0)
+        word, num_attempts = outcome
+        results.append(GameResult("llm", initial_word, answer, word, num_attempts))
+        if recorder is not None:
+            recorder.record("llm", initial_word, str(word), num_attempts)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run many LLM solver games concurrently.')
+    parser.add_argument('--answers_fp', type=str, default='data/f-past-wordle-answers.txt', help='File path to the answers to play')
+    parser.add_argument('--num_words', type=int, default=None, help='Number of answers to sample, defaults to all answers')
+    parser.add_argument('--trials', type=int, default=1, help='Number of games per answer')
+    parser.add_argument('--first_word', type=str, default=None, help='The first word to use')
+    parser.add_argument('--concurrency', type=int, default=16, help='Maximum number of chat requests in flight')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for the answer sample and the solver')
+    parser.add_argument('--exp_fp', type=str, default=None, help='File path to record experiment results')
+    parser.add_argument('--api_key_fp', type=str, default='/openai/api_key.json', help='JSON file with the OpenAI API key')
+    parser.add_argument('--base_url', type=str, default=None, help='Base URL of an OpenAI-compatible API, e.g. the fake server')
+    parser.add_argument('--trace', type=str, default='off', choices=TRACE_MODES, help='Trace no games, a sample of the games or every game')
+    parser.add_argument('--trace_fp', type=str, default='llm_trace_data/trace.jsonl.gz', help='File path to the gzip JSON lines trace')
+    parser.add_argument('--trace_sample_rate', type=float, default=0.1, help='Fraction of games traced with --trace sampled')
+    parser.add_argument('--cache_fp', type=str, default=None, help='SQLite file caching LLM responses')
+    parser.add_argument('--max_connections', type=int, default=None, help='Size of the HTTP connection pool, defaults to the concurrency')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='Seconds to wait for each chat response')
+    parser.add_argument('--token_budget', type=int, default=None, help='Most tokens of a prompt, defaults to sampling a fixed number of candidates')
+    parser.add_argument('--rank_by', type=str, default=DEFAULT_RANKING, choices=RANKINGS, help='Ranking of the candidates filling the token budget')
+
+    add_logging_arguments(parser)
+
+    args = parser.parse_args()
+    configure_logging_from_args(args)
+
+    answers = read_word_file(args.answers_fp)
+    if args.num_words is not None:
+        answers = random.Random(args.seed).sample(answers, args.num_words)
+
+    if args.base_url:
+        # a local OpenAI-compatible server does not check the key
+        api_key = "local"
+    else:
+        api_key = read_api_key(args.api_key_fp)
+    client = shared_client(
+        api_key,
+        args.base_url,
+        asynchronous=True,
+        max_connections=args.max_connections or args.concurrency,
+        timeout=args.timeout,
+    )
+    cache = None if args.cache_fp is None else PromptCache(args.cache_fp)
+    llm_interface = AsyncOpenAIInterface(api_key, base_url=args.base_url, cache=cache, client=client)
+
+    log_event(logger, logging.INFO, "run", "Running llm solver for %d words and %d trials, %d requests in flight",
+              len(answers), args.trials, args.concurrency, solver="llm", num_words=len(answers), trials=args.trials,
+              concurrency=args.concurrency)
+
+    experiment_recorder = BufferedExperimentRecorder(args.exp_fp)
+    trace_sink = TraceSink(args.trace_fp, args.trace, args.trace_sample_rate) if args.trace != 'off' else None
+    results = asyncio.run(run_llm_games_async(
+        llm_interface,
+        answers,
+        trials=args.trials,
+        first_word=args.first_word,
+        concurrency=args.concurrency,
+        seed=args.seed,
+        recorder=experiment_recorder,
+        trace_sink=trace_sink,
+        token_budget=args.token_budget,
+        rank_by=args.rank_by,
+        answers_fp=args.answers_fp,
+    ))
+    experiment_recorder.close()
+    if trace_sink is not None:
+        trace_sink.close()
+    pool = pool_metrics(client).snapshot()
+    log_event(logger, logging.INFO, "connection_pool", "Connection pool: %s", pool, pool=pool)
+    if cache is not None:
+        cache_stats = cache.stats()
+        log_event(logger, logging.INFO, "prompt_cache", "Prompt cache: %s", cache_stats, cache=cache_stats)
+        cache.close()
+
+    solved = sum(1 for result in results if result.word == result.answer and result.num_attempts <= 6)
+    log_event(logger, logging.INFO, "solved", "Solved %d of %d games in 6 attempts or fewer", solved, len(results),
+              solved=solved, games=len(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import argparse
+import json
+import logging
+import random
+import re
+
+from wordle_solver import WordListGeneratorLLM, OpenAIInterface
+from wordle_judge import WordleJudge
+from word_matrix import read_word_file
+from experiment_recorder import BufferedExperimentRecorder
+from experiment_runner import CANIDATE_FIRST_WORD_LIST, MAX_ATTEMPTS, WORDS_FP, GameResult
+from openai_clients import read_api_key, shared_client
+from prompt_builder import DEFAULT_RANKING, RANKINGS
+from trace_sink import NULL_TRACE_SINK, TRACE_MODES, TraceSink
+from solver_logging import add_logging_arguments, configure_logging_from_args, get_logger, log_event
+
+DEFAULT_BATCH_SIZE = 8
+PUZZLE_HEADER = "### Puzzle {game}\n"
+
+_WORD_PATTERN = re.compile(r"^[a-z]{5}$")
+_CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.S)
+
+logger = get_logger(__name__)
+
+
+def build_batch_prompt(prompts):
+    """
+    Packs the prompts of several independent games into one prompt asking for a JSON array of answers.
+
+    Args:
+        prompts (list): Prompts generated by WordListGeneratorLLM.generate_llm_prompt, one per game.
+
+    Returns:
+        str: The batched prompt.  Puzzle n of the prompt is prompts[n - 1].
+    """
+    sections = [PUZZLE_HEADER.format(game=game) + prompt for game, prompt in enumerate(prompts, start=1)]
+    return (
+        f"Solve each of the following {len(prompts)} independent Wordle puzzles on its own, using only "
+        + "the clues and candidate words of that puzzle.\n"
+        + "Return only a json array with one object per puzzle, in puzzle order, with the key 'game' for "
+        + "the puzzle number, 'recommendation' for the recommended word and 'explanation' for a brief "
+        + "explanation. This replaces the json structure requested inside the puzzles.\n\n"
+        + "\n\n".join(sections)
+    )
+
+
+def parse_batch_response(content, num_games):
+    """
+    Validates the reply to a batched prompt and splits it into one response per game.
+
+    An answer is valid if it is an object with a five-letter 'recommendation'.  It belongs to the game named
+    by its 'game' key, or to the game at its position in the array if the key is missing.  Games without a
+    valid answer get None.
+
+    Args:
+        content (str): The content returned by the chat API.
+        num_games (int): The number of games in the batched prompt.
+
+    Returns:
+        list: For every game the response dictionary with 'recommendation' and 'explanation', or None.
+    """
+    responses = [None] * num_games
+    if not isinstance(content, str):
+        return responses
+
+    fenced = _CODE_FENCE_PATTERN.match(content.strip())
+    try:
+        answers = json.loads(fenced.group(1) if fenced else content)
+    except ValueError:
+        return responses
+    if not isinstance(answers, list):
+        return responses
+
+    for position, answer in enumerate(answers):
+        if not isinstance(answer, dict):
+            continue
+        game = answer.get("game", position + 1)
+        recommendation = answer.get("recommendation")
+        if not isinstance(game, int) or isinstance(game, bool) or not 1 <= game <= num_games:
+            continue
+        if not isinstance(recommendation, str) or not _WORD_PATTERN.match(recommendation.strip().lower()):
+            continue
+        if responses[game - 1] is None:
+            responses[game - 1] = {
+                "recommendation": recommendation.strip().lower(),
+                "explanation": answer.get("explanation", ""),
+            }
+
+    return responses
+
+
+class BatchChat:
+    """
+    Sends the prompts of several games as batched chat requests, falling back to one request per game.
+
+    Attributes:
+        llm_interface (OpenAIInterface): The interface used for the batched and the individual requests.
+        batch_size (int): The maximum number of games per batched request.
+        batch_requests (int): The number of batched requests sent.
+        fallback_requests (int): The number of individual requests sent for games missing from a batched reply.
+    """
+
+    def __init__(self, llm_interface, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Initializes the BatchChat with the interface and the batch size.
+
+        Args:
+            llm_interface (OpenAIInterface): The interface used for the requests.
+            batch_size (int, optional): The maximum number of games per batched request. Defaults to DEFAULT_BATCH_SIZE.
+        """
+        self.llm_interface = llm_interface
+        self.batch_size = batch_size
+        self.batch_requests = 0
+        self.fallback_requests = 0
+
+    def chat(self, prompts):
+        """
+        Asks the LLM for a recommendation for every prompt.
+
+        A single prompt is sent on its own.  Otherwise the prompts are sent in batches of up to batch_size, and
+        every game whose answer is missing or malformed, or every game of a batch whose request fails with an
+        API error or an unreadable response, is asked again with its own prompt.  Other errors are raised.
+
+        Args:
+            prompts (list): Prompts generated by WordListGeneratorLLM.generate_llm_prompt.
+
+        Returns:
+            list: The response dictionary with 'recommendation' and 'explanation' of every prompt.
+        """
+        import openai
+
+        responses = []
+        for start in range(0, len(prompts), self.batch_size):
+            batch = prompts[start:start + self.batch_size]
+            if len(batch) == 1:
+                batch_responses = [None]
+            else:
+                self.batch_requests += 1
+                try:
+                    content = self.llm_interface.chat(build_batch_prompt(batch))
+                except (openai.APIError, ValueError) as e:
+                    log_event(logger, logging.WARNING, "batch_error", "Batched request of %d games failed, asking "
+                              "each game on its own: %s", len(batch), e, games=len(batch), error=repr(e))
+                    content = None
+                batch_responses = parse_batch_response(content, len(batch))
+
+            for prompt, response in zip(batch, batch_responses):
+                if response is None:
+                    if len(batch) > 1:
+                        self.fallback_requests += 1
+                    response = json.loads(self.llm_interface.chat(prompt))
+                responses.append(response)
+
+        return responses
+
+
+class _BatchedGame:
+    """
+    The state of one game played in lockstep with the others of a batched run.
+    """
+
+    def __init__(self, wordle_virtual_assistant, answer, initial_word):
+        self.wordle_virtual_assistant = wordle_virtual_assistant
+        self.wordle_game = WordleJudge(answer)
+        self.answer = answer
+        self.initial_word = initial_word
+        self.word = initial_word
+        self.attempt_count = 0
+
+
+def run_llm_games_batched(llm_interface, answers, trials=1, first_word=None, batch_size=DEFAULT_BATCH_SIZE,
+                          seed=None, recorder=None, words_fp=WORDS_FP, dump_file_dir="llm_trace_data",
+                          max_attempts=MAX_ATTEMPTS, trace_sink=None, token_budget=None, rank_by=DEFAULT_RANKING,
+                          answers_fp=None):
+    """
+    Plays every answer for a number of trials with the LLM solver, packing the prompts of several games into
+    each chat request.
+
+    The games advance in lockstep: every round each unfinished game judges its guess and generates its prompt,
+    and the prompts of the round are sent through a BatchChat.  Every game gets a clone of one loaded generator.
+
+    Args:
+        llm_interface (OpenAIInterface): The interface used to ask the LLM for recommendations.
+        answers (list): The correct words to play.
+        trials (int, optional): The number of games per answer. Defaults to 1.
+        first_word (str, optional): The first guess of every game. Defaults to a random choice from CANIDATE_FIRST_WORD_LIST.
+        batch_size (int, optional): The maximum number of games per chat request. Defaults to DEFAULT_BATCH_SIZE.
+        seed (int, optional): Seeds the random module for the first words and prompt sampling. Defaults to None.
+        recorder (BufferedExperimentRecorder, optional): Records every game. Defaults to None.
+        words_fp (str, optional): The file path to the word list. Defaults to WORDS_FP.
+        dump_file_dir (str, optional): The directory for the prompt and response files. Defaults to "llm_trace_data".
+        max_attempts (int, optional): The number of attempts after which a game is aborted. Defaults to MAX_ATTEMPTS.
+        trace_sink (TraceSink, optional): Receives the trace records of the games. Defaults to no tracing.
+        token_budget (int, optional): The most tokens of a prompt. Defaults to None, which samples
+            WordListGeneratorLLM.MAX_SIZE candidate words.
+        rank_by (str, optional): The ranking of the candidate words filling the token budget, see prompt_builder.py.
+            Defaults to DEFAULT_RANKING.
+        answers_fp (str, optional): The answer list of the "answers" ranking. Defaults to None.
+
+    Returns:
+        tuple: A GameResult for every game, in answer then trial order, and the BatchChat with the request counters.
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    template = WordListGeneratorLLM(words_fp, token_budget=token_budget, rank_by=rank_by, answers_fp=answers_fp)
+    template.dump_file_dir = dump_file_dir
+    template.load()
+    template.trace_sink = NULL_TRACE_SINK if trace_sink is None else trace_sink
+
+    games = []
+    for answer in answers:
+        answer = answer.lower()
+        for _ in range(trials):
+            initial_word = first_word if first_word else random.choice(CANIDATE_FIRST_WORD_LIST)
+            game = _BatchedGame(template.clone(), answer, initial_word)
+            game.wordle_virtual_assistant.trace("game", answer=answer, first_word=initial_word)
+            games.append(game)
+
+    batch_chat = BatchChat(llm_interface, batch_size)
+    active = games
+    while active:
+        waiting = []
+        prompts = []
+        for game in active:
+            game.attempt_count += 1
+            if game.attempt_count > max_attempts:
+                continue
+
+            result = game.wordle_game.judge_guess(game.word)
+            if result is True:
+                continue
+
+            game.wordle_virtual_assistant.update_state(result, game.word)
+            generated_prompt = game.wordle_virtual_assistant.generate_llm_prompt()
+            if generated_prompt is None:
+                game.word = None
+                continue
+
+            waiting.append(game)
+            prompts.append(generated_prompt)
+
+        for game, llm_response in zip(waiting, batch_chat.chat(prompts)):
+            game.wordle_virtual_assistant.record_llm_response(llm_response)
+            game.word = llm_response["recommendation"]
+        active = waiting
+
+    results = []
+    for game in games:
+        game.wordle_virtual_assistant.trace("result", word=game.word, num_attempts=game.attempt_count)
+        results.append(GameResult("llm", game.initial_word, game.answer, game.word, game.attempt_count))
+        if recorder is not None:
+            recorder.record("llm", game.initial_word, str(game.word), game.attempt_count)
+
+    return results, batch_chat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run LLM solver games with several games per chat request.')
+    parser.add_argument('--answers_fp', type=str, default='data/f-past-wordle-answers.txt', help='File path to the answers to play')
+    parser.add_argument('--num_words', type=int, default=None, help='Number of answers to sample, defaults to all answers')
+    parser.add_argument('--trials', type=int, default=1, help='Number of games per answer')
+    parser.add_argument('--first_word', type=str, default=None, help='The first word to use')
+    parser.add_argument('--batch_size', type=int, default=DEFAULT_BATCH_SIZE, help='Maximum number of games per chat request')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for the answer sample and the solver')
+    parser.add_argument('--exp_fp', type=str, default=None, help='File path to record experiment results')
+    parser.add_argument('--api_key_fp', type=str, default='/openai/api_key.json', help='JSON file with the OpenAI API key')
+    parser.add_argument('--trace', type=str, default='off', choices=TRACE_MODES, help='Trace no games, a sample of the games or every game')
+    parser.add_argument('--trace_fp', type=str, default='llm_trace_data/trace.jsonl.gz', help='File path to the gzip JSON lines trace')
+    parser.add_argument('--trace_sample_rate', type=float, default=0.1, help='Fraction of games traced with --trace sampled')
+    parser.add_argument('--base_url', type=str, default=None, help='Base URL of an OpenAI-compatible API, e.g. the fake server')
+    parser.add_argument('--token_budget', type=int, default=None, help='Most tokens of a prompt, defaults to sampling a fixed number of candidates')
+    parser.add_argument('--rank_by', type=str, default=DEFAULT_RANKING, choices=RANKINGS, help='Ranking of the candidates filling the token budget')
+
+    add_logging_arguments(parser)
+
+    args = parser.parse_args()
+    configure_logging_from_args(args)
+
+    answers = read_word_file(args.answers_fp)
+    if args.num_words is not None:
+        answers = random.Random(args.seed).sample(answers, args.num_words)
+
+    # a local OpenAI-compatible server does not check the key
+    api_key = "local" if args.base_url else read_api_key(args.api_key_fp)
+    llm_interface = OpenAIInterface(api_key, client=shared_client(api_key, args.base_url))
+
+    log_event(logger, logging.INFO, "run", "Running llm solver for %d words and %d trials, %d games per request",
+              len(answers), args.trials, args.batch_size, solver="llm", num_words=len(answers), trials=args.trials,
+              batch_size=args.batch_size)
+
+    experiment_recorder = BufferedExperimentRecorder(args.exp_fp)
+    trace_sink = TraceSink(args.trace_fp, args.trace, args.trace_sample_rate) if args.trace != 'off' else None
+    results, batch_chat = run_llm_games_batched(
+        llm_interface,
+        answers,
+        trials=args.trials,
+        first_word=args.first_word,
+        batch_size=args.batch_size,
+        seed=args.seed,
+        recorder=experiment_recorder,
+        trace_sink=trace_sink,
+        token_budget=args.token_budget,
+        rank_by=args.rank_by,
+        answers_fp=args.answers_fp,
+    )
+    experiment_recorder.close()
+    if trace_sink is not None:
+        trace_sink.close()
+
+    log_event(logger, logging.INFO, "requests", "Sent %d batched requests and %d fallback requests",
+              batch_chat.batch_requests, batch_chat.fallback_requests, batch_requests=batch_chat.batch_requests,
+              fallback_requests=batch_chat.fallback_requests)
+    solved = sum(1 for result in results if result.word == result.answer and result.num_attempts <= 6)
+    log_event(logger, logging.INFO, "solved", "Solved %d of %d games in 6 attempts or fewer", solved, len(results),
+              solved=solved, games=len(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import word_dictionary
+from trace_sink import NULL_TRACE_SINK
+from wordle_judge import WordleJudge
+from wordle_solver import WordListGeneratorBase, WordListGeneratorLLM
+
+WORDS_FP = "data/five-letter-words.txt"
+ANSWERS_FP = "data/f-past-wordle-answers.txt"
+DEFAULT_THRESHOLD = 0.25
+
+# realistic game states: the guesses played so far against an answer
+GAME_STATES = {
+    "turn2": ("cigar", ["trace"]),
+    "turn3": ("humph", ["adieu", "story"]),
+    "turn4": ("knoll", ["crate", "sound", "blimp"]),
+}
+
+Benchmark = namedtuple("Benchmark", ["name", "setup", "run"])
+
+
+def game_state(answer, guesses):
+    """
+    Returns the global_state of a generator after playing guesses against an answer.
+
+    Args:
+        answer (str): The correct word.
+        guesses (list): The guessed words.
+
+    Returns:
+        dict: The "present", "correct" and "absent" constraints.
+    """
+    wordle_virtual_assistant = WordListGeneratorBase(WORDS_FP)
+    wordle_game = WordleJudge(answer)
+    for guess in guesses:
+        wordle_virtual_assistant.update_state(wordle_game.judge_guess(guess), guess)
+    return wordle_virtual_assistant.global_state
+
+
+def _loaded_generator(generator_class=WordListGeneratorBase, words_fp=WORDS_FP, **kwargs):
+    wordle_virtual_assistant = generator_class(words_fp, **kwargs)
+    wordle_virtual_assistant.load()
+    # measure the filters themselves, not the opening book lookup that replaces the first pass
+    wordle_virtual_assistant.opening_book = None
+    wordle_virtual_assistant.trace_sink = NULL_TRACE_SINK
+    return wordle_virtual_assistant
+
+
+def _start_game(wordle_virtual_assistant, state):
+    wordle_virtual_assistant.reset()
+    for key, value in state.items():
+        wordle_virtual_assistant.global_state[key].update(value)
+
+
+def build_benchmarks(words_fp=WORDS_FP, answers_fp=ANSWERS_FP):
+    """
+    Returns the benchmarks of the hot paths of the solvers on the word lists.
+
+    A benchmark's setup runs before every call and is not timed; run is the timed call.
+
+    Args:
+        words_fp (str, optional): The file path to the word list. Defaults to WORDS_FP.
+        answers_fp (str, optional): The file path to the answer list. Defaults to ANSWERS_FP.
+
+    Returns:
+        list: The Benchmark of every hot path.
+    """
+    benchmarks = []
+
+    def load_cold():
+        word_dictionary._DICTIONARY_CACHE.clear()
+
+    benchmarks.append(Benchmark("load[cold]", load_cold, lambda: WordListGeneratorBase(words_fp).load()))
+    benchmarks.append(Benchmark("load[shared]", None, lambda: WordListGeneratorBase(words_fp).load()))
+
+    states = {name: game_state(answer, guesses) for name, (answer, guesses) in GAME_STATES.items()}
+
+    regex_generator = _loaded_generator(words_fp=words_fp)
+    for method in ("_eliminate_words_with_absent_letters", "_eliminate_words_with_present_letters",
+                   "_keep_words_with_correct_letters"):
+        benchmarks.append(Benchmark(
+            f"{method}[turn2]",
+            lambda: _start_game(regex_generator, states["turn2"]),
+            getattr(regex_generator, method),
+        ))
+
+    for engine in WordListGeneratorBase.ENGINES:
+        wordle_virtual_assistant = _loaded_generator(words_fp=words_fp, engine=engine)
+        for state_name, state in states.items():
+            benchmarks.append(Benchmark(
+                f"update_candidate_words[{engine},{state_name}]",
+                lambda wordle_virtual_assistant=wordle_virtual_assistant, state=state: _start_game(
+                    wordle_virtual_assistant, state
+                ),
+                wordle_virtual_assistant.update_candidate_words,
+            ))
+
+    answers = [word.lower() for word in word_dictionary.WordDictionary.for_file(answers_fp).words[:100]]
+    guesses = ["trace", "adieu", "speed", "llama", "knoll"]
+
+    def judge_guesses():
+        for answer in answers:
+            wordle_game = WordleJudge(answer)
+            for guess in guesses:
+                wordle_game.judge_guess(guess)
+
+    benchmarks.append(Benchmark(f"judge_guess[x{len(answers) * len(guesses)}]", None, judge_guesses))
+
+    llm_generator = _loaded_generator(WordListGeneratorLLM, words_fp=words_fp)
+    for state_name in ("turn2", "turn3"):
+        def start_llm_game(state=states[state_name], guessed_word=GAME_STATES[state_name][1][-1]):
+            _start_game(llm_generator, state)
+            llm_generator.guessed_word = guessed_word
+
+        benchmarks.append(Benchmark(f"generate_llm_prompt[{state_name}]", start_llm_game, llm_generator.generate_llm_prompt))
+
+    return benchmarks
+
+
+def time_benchmark(benchmark, rounds=7, min_time=0.02):
+    """
+    Times a benchmark.
+
+    Each round calls run as often as needed to last min_time, running setup before every call, and the time
+    per call of every round is recorded.
+
+    Args:
+        benchmark (Benchmark): The benchmark.
+        rounds (int, optional): The number of timed rounds. Defaults to 7.
+        min_time (float, optional): The minimum seconds of calls per round. Defaults to 0.02.
+
+    Returns:
+        dict: The minimum and median microseconds per call, the number of rounds and the calls per round.
+    """
+    def run_round(calls):
+        elapsed = 0.0
+        for _ in range(calls):
+            if benchmark.setup is not None:
+                benchmark.setup()
+            start = time.perf_counter()
+            benchmark.run()
+            elapsed += time.perf_counter() - start
+        return elapsed
+
+    # warm up and calibrate the calls per round
+    calls = 1
+    while run_round(calls) < min_time and calls < 1 << 16:
+        calls *= 2
+
+    times = [run_round(calls) / calls * 1e6 for _ in range(rounds)]
+    return {"min_us": min(times), "median_us": statistics.median(times), "rounds": rounds, "calls": calls}
+
+
+def run_benchmarks(benchmarks, rounds=7, min_time=0.02, name_filter=None):
+    """
+    Times benchmarks with the output of the solvers suppressed.
+
+    Args:
+        benchmarks (list): The benchmarks.
+        rounds (int, optional): The number of timed rounds per benchmark. Defaults to 7.
+        min_time (float, optional): The minimum seconds of calls per round. Defaults to 0.02.
+        name_filter (str, optional): Only times the benchmarks whose name contains this string. Defaults to None.
+
+    Returns:
+        dict: The metadata of the run and the timings of every benchmark by name.
+    """
+    results = {}
+    for benchmark in benchmarks:
+        if name_filter is not None and name_filter not in benchmark.name:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[benchmark.name] = time_benchmark(benchmark, rounds, min_time)
+
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares the median times of a run against a baseline run.
+
+    Args:
+        results (dict): The run, as returned by run_benchmarks.
+        baseline (dict): The baseline run.
+        threshold (float, optional): The fraction a median may exceed the baseline by before it counts as a
+            regression. Defaults to DEFAULT_THRESHOLD.
+
+    Returns:
+        list: A (name, baseline median, median, ratio, regressed) tuple for every benchmark in both runs.
+    """
+    comparisons = []
+    for name, timing in results["results"].items():
+        if name not in baseline["results"]:
+            continue
+        baseline_median = baseline["results"][name]["median_us"]
+        ratio = timing["median_us"] / baseline_median if baseline_median > 0 else 1.0
+        comparisons.append((name, baseline_median, timing["median_us"], ratio, ratio > 1 + threshold))
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the hot paths of the solvers on the word lists.')
+    parser.add_argument('--words_fp', type=str, default=WORDS_FP, help='File path to the word list')
+    parser.add_argument('--answers_fp', type=str, default=ANSWERS_FP, help='File path to the answer list')
+    parser.add_argument('--rounds', type=int, default=7, help='Timed rounds per benchmark')
+    parser.add_argument('--min_time', type=float, default=0.02, help='Minimum seconds of calls per round')
+    parser.add_argument('--filter', type=str, default=None, help='Only run the benchmarks whose name contains this string')
+    parser.add_argument('--json_fp', type=str, default=None, help='File path to write the results as JSON')
+    parser.add_argument('--baseline_fp', type=str, default=None, help='JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Fraction a median may exceed the baseline by before the run fails')
+
+    args = parser.parse_args()
+
+    results = run_benchmarks(build_benchmarks(args.words_fp, args.answers_fp), args.rounds, args.min_time, args.filter)
+    for name, timing in results["results"].items():
+        print(f"{name:55} {timing['median_us']:12.1f} us  (min {timing['min_us']:.1f} us)")
+
+    if args.json_fp is not None:
+        with open(args.json_fp, 'w') as file:
+            json.dump(results, file, indent=4)
+
+    if args.baseline_fp is not None:
+        with open(args.baseline_fp) as file:
+            baseline = json.load(file)
+        comparisons = compare(results, baseline, args.threshold)
+        print(f"\nCompared with {args.baseline_fp}:")
+        for name, baseline_median, median, ratio, regressed in comparisons:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:55} {baseline_median:12.1f} -> {median:12.1f} us  x{ratio:.2f}{flag}")
+        regressions = [comparison[0] for comparison in comparisons if comparison[4]]
+        if regressions:
+            sys.exit(f"{len(regressions)} benchmarks regressed by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
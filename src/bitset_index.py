@@ -0,0 +1,117 @@
+import numpy as np
+
+from word_matrix import ALPHABET_SIZE, WORD_LENGTH, encode_words, letter_index
+
+
+def _mask_to_bits(mask):
+    """
+    Converts a boolean mask to a Python int with bit i set when mask[i] is True.
+    """
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+class WordBitsetIndex:
+    """
+    A bitset index over a word list for resolving game states with a handful of bitwise operations.
+
+    Word i of the list is bit i of every bitset.  There is one bitset per (position, letter), set for the
+    words with that letter at that position, and one per letter, set for the words containing it.  A game
+    state is resolved by AND-ing the correct bitsets and AND-NOT-ing the present and absent bitsets, with
+    the same semantics as the filters in WordListGeneratorBase.  The index of a word list file is shared by
+    every generator through WordDictionary.bitset_index.
+
+    Attributes:
+        words (list): The indexed words.
+        word_index (dict): Maps a word to its bit.
+        all_bits (int): The bitset of every word.
+        position_bits (list): position_bits[position][letter] is the bitset of words with the letter at the position.
+        letter_bits (list): letter_bits[letter] is the bitset of words containing the letter.
+    """
+
+    def __init__(self, words, matrix=None):
+        """
+        Builds the index for a list of five-letter words.
+
+        Args:
+            words (list): The lowercase five-letter words to index.
+            matrix (numpy.ndarray, optional): The letter matrix of the words. Defaults to encoding the words.
+        """
+        self.words = list(words)
+        self.word_index = {word: i for i, word in enumerate(self.words)}
+        self.all_bits = (1 << len(self.words)) - 1
+
+        if matrix is None:
+            matrix = encode_words(self.words)
+        self.position_bits = [
+            [_mask_to_bits(matrix[:, position] == letter) for letter in range(ALPHABET_SIZE)]
+            for position in range(WORD_LENGTH)
+        ]
+        self.letter_bits = [
+            _mask_to_bits((matrix == letter).any(axis=1)) for letter in range(ALPHABET_SIZE)
+        ]
+
+    def bits_for_words(self, words):
+        """
+        Returns the bitset of a list of indexed words.
+
+        Args:
+            words (list): Words of the index.
+
+        Returns:
+            int: The bitset with the bit of every word set.
+
+        Raises:
+            KeyError: If a word is not in the index.
+        """
+        mask = np.zeros(len(self.words), dtype=bool)
+        mask[[self.word_index[word] for word in words]] = True
+        return _mask_to_bits(mask)
+
+    def candidate_bits(self, state, within=None):
+        """
+        Resolves a game state to the bitset of the words satisfying it.
+
+        Args:
+            state (dict): A dictionary with "absent", "present" and "correct" constraints. Missing keys are ignored.
+            within (int, optional): A bitset to narrow instead of the whole word list. Defaults to None.
+
+        Returns:
+            int: The bitset of the candidate words.
+        """
+        bits = self.all_bits if within is None else within
+        for position, letter in state.get("correct", ()):
+            bits &= self.position_bits[position][letter_index(letter)]
+        for position, letter in state.get("present", ()):
+            bits &= ~self.position_bits[position][letter_index(letter)]
+        for letter in state.get("absent", ()):
+            bits &= ~self.letter_bits[letter_index(letter)]
+        return bits
+
+    def count(self, state, within=None):
+        """
+        Counts the words satisfying a game state without building the list of words.
+
+        Args:
+            state (dict): A dictionary with "absent", "present" and "correct" constraints.
+            within (int, optional): A bitset to narrow instead of the whole word list. Defaults to None.
+
+        Returns:
+            int: The number of candidate words.
+        """
+        return self.candidate_bits(state, within).bit_count()
+
+    def words_for(self, bits):
+        """
+        Returns the words of a bitset in word list order.
+
+        Args:
+            bits (int): A bitset of the index.
+
+        Returns:
+            list: The words whose bits are set.
+        """
+        if bits == 0:
+            return []
+        raw = np.frombuffer(bits.to_bytes((len(self.words) + 7) // 8, 'little'), dtype=np.uint8)
+        positions = np.flatnonzero(np.unpackbits(raw, bitorder='little'))
+        return [self.words[i] for i in positions.tolist()]
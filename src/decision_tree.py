@@ -0,0 +1,339 @@
+import argparse
+import os
+
+import numpy as np
+
+from feedback_patterns import ALL_CORRECT_PATTERN, ENTROPY_CHUNK_CELLS, NUM_PATTERNS, judge_patterns
+from word_matrix import WORD_LENGTH, encode_words, read_word_file
+
+HEURISTICS = ("entropy", "minimax")
+ROOT = 0
+
+
+def decision_tree_path(answers_fp, opener):
+    """
+    Returns the default file path of the decision tree for an answer list and opener, next to the answer list.
+
+    Args:
+        answers_fp (str): The file path to the answer word list.
+        opener (str): The first guess of the tree.
+
+    Returns:
+        str: The tree file path, e.g. data/f-past-wordle-answers.trace.tree.npz for the opener "trace".
+    """
+    return f"{os.path.splitext(answers_fp)[0]}.{opener}.tree.npz"
+
+
+def score_guesses(patterns, heuristic="entropy"):
+    """
+    Scores guesses by the partition their feedback induces over the remaining answers, higher is better.
+
+    The patterns of each row are sorted and counted as runs, so the cost does not depend on the number of
+    possible patterns and stays low for the small answer sets deep in a tree.
+
+    Args:
+        patterns (numpy.ndarray): A (G, M) uint8 matrix of the pattern codes of G guesses against M answers.
+        heuristic (str, optional): "entropy" scores the expected information in bits, "minimax" the negated size of
+            the largest partition. Defaults to "entropy".
+
+    Returns:
+        numpy.ndarray: The score of each guess.
+
+    Raises:
+        ValueError: If the heuristic is unknown.
+    """
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic '{heuristic}', expected one of {HEURISTICS}")
+
+    num_guesses, num_answers = patterns.shape
+    scores = np.zeros(num_guesses)
+    if num_answers == 0:
+        return scores
+
+    chunk_rows = max(1, ENTROPY_CHUNK_CELLS // num_answers)
+    for start in range(0, num_guesses, chunk_rows):
+        chunk = np.sort(patterns[start:start + chunk_rows], axis=1)
+        rows = len(chunk)
+        run_starts = np.ones(chunk.shape, dtype=bool)
+        run_starts[:, 1:] = chunk[:, 1:] != chunk[:, :-1]
+
+        run_ids = np.cumsum(run_starts.ravel()) - 1
+        run_sizes = np.bincount(run_ids)
+        runs_per_row = run_starts.sum(axis=1)
+        if heuristic == "entropy":
+            run_rows = np.repeat(np.arange(rows), runs_per_row)
+            information = np.bincount(run_rows, weights=run_sizes * np.log2(run_sizes), minlength=rows)
+            scores[start:start + rows] = np.log2(num_answers) - information / num_answers
+        else:
+            first_runs = np.concatenate(([0], np.cumsum(runs_per_row)[:-1]))
+            scores[start:start + rows] = -np.maximum.reduceat(run_sizes, first_runs)
+
+    return scores
+
+
+class DecisionTree:
+    """
+    A precomputed Wordle strategy, mapping the feedback sequence of a game to the next guess.
+
+    Nodes are numbered from the ROOT, whose guess is the opener.  The child of a node for a feedback pattern is
+    found in one dictionary lookup keyed by node * NUM_PATTERNS + pattern.  A node without a child for a
+    pattern is a leaf of the tree: the guess of the node is the answer.
+
+    Attributes:
+        guesses (list): The guess of every node.
+        transitions (dict): Maps node * NUM_PATTERNS + pattern to the child node.
+        attempts (numpy.ndarray): The number of answers solved in i attempts at index i.
+    """
+
+    def __init__(self, guesses, transitions, attempts):
+        """
+        Initializes the DecisionTree with its nodes.
+
+        Args:
+            guesses (list): The guess of every node, the opener first.
+            transitions (dict): Maps node * NUM_PATTERNS + pattern to the child node.
+            attempts (numpy.ndarray): The number of answers solved in i attempts at index i.
+        """
+        self.guesses = guesses
+        self.transitions = transitions
+        self.attempts = attempts
+
+    @property
+    def opener(self):
+        """
+        str: The first guess.
+        """
+        return self.guesses[ROOT]
+
+    @property
+    def num_answers(self):
+        """
+        int: The number of answers the tree solves.
+        """
+        return int(self.attempts.sum())
+
+    @property
+    def expected_attempts(self):
+        """
+        float: The mean number of attempts over the answers, counting the winning guess.
+        """
+        return float(np.arange(len(self.attempts)) @ self.attempts) / max(1, self.num_answers)
+
+    @property
+    def worst_case_attempts(self):
+        """
+        int: The largest number of attempts any answer takes.
+        """
+        return int(np.flatnonzero(self.attempts)[-1]) if self.num_answers else 0
+
+    def child(self, node, pattern):
+        """
+        Returns the node reached from a node by the feedback to its guess.
+
+        Args:
+            node (int): The current node.
+            pattern (int): The feedback pattern code of the node's guess, see WordleJudge.judge_guess.
+
+        Returns:
+            int or None: The child node, or None if the feedback is not in the tree.
+        """
+        return self.transitions.get(node * NUM_PATTERNS + pattern)
+
+    def save(self, fp):
+        """
+        Writes the tree to a compressed .npz file.
+
+        The guesses are stored as five bytes per node and every edge as a key and a child node.
+
+        Args:
+            fp (str): The file path.
+        """
+        keys = np.fromiter(self.transitions.keys(), dtype=np.int32, count=len(self.transitions))
+        children = np.fromiter(self.transitions.values(), dtype=np.int32, count=len(self.transitions))
+        tmp_fp = f"{fp}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            tmp_fp,
+            guesses=np.array(self.guesses, dtype=f"S{WORD_LENGTH}"),
+            edge_keys=keys,
+            edge_children=children,
+            attempts=self.attempts,
+        )
+        os.replace(tmp_fp, fp)
+
+    @classmethod
+    def load(cls, fp):
+        """
+        Reads a tree written by save.
+
+        Args:
+            fp (str): The file path.
+
+        Returns:
+            DecisionTree: The tree.
+        """
+        with np.load(fp, allow_pickle=False) as data:
+            guesses = [guess.decode('ascii') for guess in data["guesses"].tolist()]
+            transitions = dict(zip(data["edge_keys"].tolist(), data["edge_children"].tolist()))
+            attempts = data["attempts"]
+        return cls(guesses, transitions, attempts)
+
+
+class _TreeBuilder:
+    """
+    Searches the guess of every node of a decision tree, see build_decision_tree.
+    """
+
+    def __init__(self, guess_words, answer_words, heuristic, beam):
+        self.guess_words = guess_words
+        self.heuristic = heuristic
+        self.beam = beam
+        guess_index = {word: i for i, word in enumerate(guess_words)}
+        self.answer_rows = np.array([guess_index[word] for word in answer_words], dtype=np.int64)
+        self.patterns = judge_patterns(encode_words(guess_words), encode_words(answer_words))
+        self.memo = {}
+
+    def ranked_guesses(self, answers):
+        """
+        Returns the guess rows by decreasing score over a set of answer columns, candidates first among ties.
+        """
+        scores = np.round(score_guesses(self.patterns[:, answers], self.heuristic), 9)
+        is_candidate = np.zeros(len(self.guess_words), dtype=bool)
+        is_candidate[self.answer_rows[answers]] = True
+        # lexsort sorts by the last key first, the lowest row wins remaining ties
+        return np.lexsort((np.arange(len(scores)), ~is_candidate, -scores))
+
+    def build(self, answers, search_depth):
+        """
+        Builds the subtree of a set of answer columns, searching the best beam guesses for search_depth levels.
+
+        Returns:
+            tuple: The subtree as (guess row, answered here, {pattern: subtree}) and its total number of attempts.
+        """
+        if len(answers) <= 2:
+            # guessing a remaining answer is optimal for one or two answers
+            return self.split(answers, int(self.answer_rows[answers[0]]), 0)
+
+        key = (answers.tobytes(), search_depth)
+        if key in self.memo:
+            return self.memo[key]
+
+        ranked = self.ranked_guesses(answers)
+        width = self.beam if search_depth > 0 else 1
+        best = None
+        for guess in ranked[:width].tolist():
+            row = self.patterns[guess, answers]
+            if best is not None and np.all(row == row[0]) and row[0] != ALL_CORRECT_PATTERN:
+                # a guess that does not split the answers never leads to a better subtree
+                continue
+            subtree = self.split(answers, guess, max(0, search_depth - 1))
+            if best is None or subtree[1] < best[1]:
+                best = subtree
+        self.memo[key] = best
+        return best
+
+    def split(self, answers, guess, search_depth):
+        """
+        Builds the subtree of a set of answer columns whose guess is given.
+        """
+        row = self.patterns[guess, answers]
+        answered_here = bool(np.any(row == ALL_CORRECT_PATTERN))
+        total = len(answers)
+        children = {}
+        for pattern in np.unique(row).tolist():
+            if pattern == ALL_CORRECT_PATTERN:
+                continue
+            child, child_total = self.build(answers[row == pattern], search_depth)
+            children[pattern] = child
+            total += child_total
+        return (guess, answered_here, children), total
+
+
+def build_decision_tree(answer_words, guess_words=None, opener=None, heuristic="entropy", beam=1, search_depth=0):
+    """
+    Searches a decision tree that solves every answer of a fixed answer list.
+
+    Every node guesses the word with the best heuristic score over the answers still possible there, preferring
+    words that are still possible on ties.  With search_depth > 0 the best beam guesses of the first search_depth
+    searched levels, below the opener when it is given, are each expanded into full subtrees and the one with the
+    fewest total attempts is kept, which trades build time for a better tree.
+
+    Args:
+        answer_words (list): The answers, lowercase five-letter words.
+        guess_words (list, optional): The words that may be guessed. The answers are always allowed. Defaults to
+            the answers.
+        opener (str, optional): The first guess. Defaults to the best guess by the heuristic.
+        heuristic (str, optional): "entropy" or "minimax", see score_guesses. Defaults to "entropy".
+        beam (int, optional): The number of guesses expanded per node by the deeper search. Defaults to 1.
+        search_depth (int, optional): The number of levels searched with the beam. Defaults to 0.
+
+    Returns:
+        DecisionTree: The tree.
+
+    Raises:
+        ValueError: If the heuristic is unknown or there are no answers.
+    """
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic '{heuristic}', expected one of {HEURISTICS}")
+    if len(answer_words) == 0:
+        raise ValueError("Cannot build a decision tree without answers")
+
+    answer_words = list(dict.fromkeys(answer_words))
+    guess_words = list(dict.fromkeys(list(guess_words or []) + answer_words + ([opener] if opener else [])))
+    builder = _TreeBuilder(guess_words, answer_words, heuristic, beam)
+
+    answers = np.arange(len(answer_words))
+    if opener is None:
+        root, _ = builder.build(answers, search_depth)
+    else:
+        root, _ = builder.split(answers, guess_words.index(opener), search_depth)
+
+    # number the nodes breadth first so the root is ROOT
+    guesses = []
+    transitions = {}
+    attempts = np.zeros(1, dtype=np.int64)
+    level = [(root, 1)]
+    while level:
+        next_level = []
+        next_level_start = len(guesses) + len(level)
+        for (guess, answered_here, children), depth in level:
+            node = len(guesses)
+            guesses.append(guess_words[guess])
+            if answered_here:
+                if depth >= len(attempts):
+                    attempts = np.pad(attempts, (0, depth + 1 - len(attempts)))
+                attempts[depth] += 1
+            for pattern, child in children.items():
+                transitions[node * NUM_PATTERNS + pattern] = next_level_start + len(next_level)
+                next_level.append((child, depth + 1))
+        level = next_level
+
+    return DecisionTree(guesses, transitions, attempts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a decision tree that solves a fixed answer list.')
+    parser.add_argument('--answers_fp', type=str, default='data/f-past-wordle-answers.txt', help='File path to the answers')
+    parser.add_argument('--guesses_fp', type=str, default='data/five-letter-words.txt', help='File path to the words that may be guessed')
+    parser.add_argument('--opener', type=str, default='trace', help='The first guess, empty to search it')
+    parser.add_argument('--heuristic', type=str, default='entropy', choices=HEURISTICS, help='The score of a guess')
+    parser.add_argument('--beam', type=int, default=1, help='Guesses expanded per node by the deeper search')
+    parser.add_argument('--search_depth', type=int, default=0, help='Levels searched with the beam')
+    parser.add_argument('--tree_fp', type=str, default=None, help='File path to write the tree, defaults to next to the answers')
+
+    args = parser.parse_args()
+
+    answer_words = [word.lower() for word in read_word_file(args.answers_fp)]
+    guess_words = [word.lower() for word in read_word_file(args.guesses_fp)] if args.guesses_fp else None
+    tree = build_decision_tree(
+        answer_words, guess_words, opener=args.opener or None,
+        heuristic=args.heuristic, beam=args.beam, search_depth=args.search_depth,
+    )
+
+    tree_fp = args.tree_fp or decision_tree_path(args.answers_fp, tree.opener)
+    tree.save(tree_fp)
+    print(f"Wrote a tree of {len(tree.guesses)} nodes for {tree.num_answers} answers to {tree_fp}")
+    print(f"Expected attempts: {tree.expected_attempts:.4f}, worst case: {tree.worst_case_attempts}")
+
+
+if __name__ == "__main__":
+    main()
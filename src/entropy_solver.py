@@ -0,0 +1,96 @@
+import argparse
+import json
+import logging
+import random
+
+from wordle_solver import WordListGeneratorEntropy, ExperimentRecorder
+from wordle_judge import WordleJudge
+from solver_logging import add_logging_arguments, configure_logging_from_args, get_logger, log_event
+
+CANIDATE_FIRST_WORD_LIST = ["adieu", "trace", "crate",]
+
+logger = get_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Process some inputs.',
+        epilog='Scoring is fast with a cached judge-rule pattern table of the word list. Build it once with '
+               '"python src/feedback_patterns.py data/five-letter-words.txt --rules judge" or pass --build_table, '
+               'otherwise the patterns are computed on every turn and the first scored turn takes several seconds.')
+    parser.add_argument('word', type=str, help='A 5-letter word')
+    parser.add_argument('--exp_fp', type=str, default=None, help='File path to record experiment results')
+    parser.add_argument('--first_word', type=str, default=None, help='The first word to use')
+    parser.add_argument('--engine', type=str, default='numpy', choices=['regex', 'numpy', 'bitset'], help='The candidate filtering engine')
+    parser.add_argument('--build_table', action='store_true', help='Build and cache the pattern table if it is not cached')
+    add_logging_arguments(parser)
+
+    args = parser.parse_args()
+    configure_logging_from_args(args)
+
+    # Access the arguments
+    word = args.word
+    experiment_fp = args.exp_fp
+    first_word = args.first_word
+
+    # Ensure the word is 5 letters long
+    if len(word) != 5:
+        raise argparse.ArgumentTypeError("Word must be 5 letters long")
+
+    log_event(logger, logging.INFO, "start", "Word: %s, experiment_fp: %s, First Word: %s", word, experiment_fp, first_word,
+              word=word, experiment_fp=experiment_fp, first_word=first_word)
+
+    # Create a WordleJudge object
+    wordle_game = WordleJudge(word)
+
+    # Create a ExperimentRecorder object
+    if experiment_fp:
+        experiment_recorder = ExperimentRecorder(experiment_fp)
+
+    # Create a WordList object
+    wordle_virtual_assistant = WordListGeneratorEntropy("data/five-letter-words.txt", engine=args.engine,
+                                                        build_table=args.build_table)
+    wordle_virtual_assistant.load()
+
+    # create initial guess
+    if first_word:
+        initial_word = word = first_word
+    else:
+        initial_word = word = random.choice(CANIDATE_FIRST_WORD_LIST)
+        
+    result = False
+    attemp_count = 0
+    while not isinstance(result, bool) or not result:
+        attemp_count += 1
+        if attemp_count < 7:
+            log_event(logger, logging.INFO, "attempt", 'attempt %d guess is %s', attemp_count, word,
+                      attempt=attemp_count, word=word)
+        else:
+            log_event(logger, logging.INFO, "attempt", 'Failed wordle game: attempt %d guess is %s', attemp_count, word,
+                      attempt=attemp_count, word=word, failed=True)
+
+        if attemp_count > 20:
+            log_event(logger, logging.WARNING, "max_attempts", 'Exceed max attempt: attempt %d', attemp_count,
+                      attempt=attemp_count)
+            break
+
+        result = wordle_game.judge_guess(word)
+        log_event(logger, logging.INFO, "result", 'The result is %s', result, result=result)
+        if not isinstance(result, bool):
+            # Update the word list
+            wordle_virtual_assistant.update_state(result, word)
+            wordle_virtual_assistant.print_state()
+            
+            # Get the guess with the highest expected information
+            word = wordle_virtual_assistant.get_candidate_word()
+            if word is None:
+                log_event(logger, logging.WARNING, "no_candidates", "No candidate words left")
+                break
+    
+    wordle_virtual_assistant.print_state()
+    if experiment_fp:
+        experiment_recorder.record("entropy", initial_word, word, attemp_count)
+        experiment_recorder.close()
+        
+if __name__ == "__main__":
+    main()
\ No newline at end of file
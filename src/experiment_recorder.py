@@ -0,0 +1,180 @@
+import contextlib
+import os
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # no advisory file locks, e.g. on Windows
+    fcntl = None
+
+COLUMNS = ("solver_type", "initial_word", "word", "num_attempts")
+CSV_HEADER = ",".join(COLUMNS) + "\n"
+COLUMNAR_FORMATS = ("parquet", "arrow")
+DEFAULT_FLUSH_ROWS = 1000
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+
+@contextlib.contextmanager
+def _locked(file):
+    """
+    Holds an exclusive advisory lock on an open file, so processes appending to it do not interleave.
+    """
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class BufferedExperimentRecorder:
+    """
+    Records the results of an experiment in batches, as CSV and optionally as Parquet or Arrow files.
+
+    Rows are kept in memory and written when flush_rows rows are buffered, when a row is recorded more than
+    flush_interval seconds after the last write, and on flush and close.  The CSV file has the same header
+    and rows as ExperimentRecorder and is appended to under a file lock, so recorders in several threads or
+    worker processes can share one file.  Columnar output is written as one part file per flush into
+    columnar_dir, named after the process, so a sweep is read back with pandas.read_parquet(columnar_dir)
+    without parsing text.  Create one recorder per process; a recorder can be shared by the threads of a
+    process.
+
+    Attributes:
+        fp (str): The file path to the CSV file, or None for no CSV output.
+        columnar_dir (str): The directory for the columnar part files, or None for no columnar output.
+        columnar_format (str): "parquet" or "arrow".
+        flush_rows (int): The number of buffered rows that triggers a write.
+        flush_interval (float): The age in seconds of the last write that triggers a write.
+        rows_written (int): The number of rows written so far.
+    """
+
+    def __init__(self, fp=None, flush_rows=DEFAULT_FLUSH_ROWS, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 columnar_dir=None, columnar_format="parquet"):
+        """
+        Initializes the recorder, creating the CSV file with its header if it does not exist.
+
+        Args:
+            fp (str, optional): The file path to the CSV file. Defaults to None.
+            flush_rows (int, optional): The number of buffered rows that triggers a write. Defaults to DEFAULT_FLUSH_ROWS.
+            flush_interval (float, optional): The age in seconds of the last write that triggers a write. Defaults to DEFAULT_FLUSH_INTERVAL.
+            columnar_dir (str, optional): The directory for Parquet or Arrow part files. Defaults to None.
+            columnar_format (str, optional): "parquet" or "arrow". Defaults to "parquet".
+
+        Raises:
+            ValueError: If the columnar format is unknown.
+            ImportError: If columnar output is requested and pyarrow is not installed.
+        """
+        if columnar_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format '{columnar_format}', expected one of {COLUMNAR_FORMATS}")
+
+        self.fp = fp
+        self.columnar_dir = columnar_dir
+        self.columnar_format = columnar_format
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self._rows = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._part_count = 0
+        self._part_prefix = f"part-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._pyarrow = None
+
+        if self.columnar_dir:
+            try:
+                import pyarrow
+                import pyarrow.feather
+                import pyarrow.parquet
+            except ImportError as e:
+                raise ImportError("Columnar experiment output requires pyarrow: pip install pyarrow") from e
+            self._pyarrow = pyarrow
+            os.makedirs(self.columnar_dir, exist_ok=True)
+
+        self.file = None
+        if self.fp:
+            self.file = open(self.fp, 'a')
+            with _locked(self.file):
+                if os.fstat(self.file.fileno()).st_size == 0:
+                    self.file.write(CSV_HEADER)
+                    self.file.flush()
+
+    def record(self, solver_type, initial_word, word, num_attempts):
+        """
+        Buffers the result of a game, writing the buffer if a flush threshold is reached.
+
+        Args:
+            solver_type (str): The solver type.
+            initial_word (str): The first guess.
+            word (str): The last guessed word.
+            num_attempts (int): The number of attempts.
+        """
+        with self._lock:
+            self._rows.append((solver_type, initial_word, word, int(num_attempts)))
+            if (len(self._rows) >= self.flush_rows
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self):
+        """
+        Writes the buffered rows.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        rows, self._rows = self._rows, []
+        self._last_flush = time.monotonic()
+        if not rows:
+            return
+
+        if self.file is not None:
+            data = "".join(f"{solver_type},{initial_word},{word},{num_attempts}\n"
+                           for solver_type, initial_word, word, num_attempts in rows)
+            with _locked(self.file):
+                self.file.write(data)
+                self.file.flush()
+
+        if self.columnar_dir:
+            self._write_part(rows)
+
+        self.rows_written += len(rows)
+
+    def _write_part(self, rows):
+        """
+        Writes rows to a new columnar part file, renamed into place once complete.
+        """
+        pyarrow = self._pyarrow
+        table = pyarrow.table({
+            column: pyarrow.array(values, type=pyarrow.int64() if column == "num_attempts" else pyarrow.string())
+            for column, values in zip(COLUMNS, zip(*rows))
+        })
+        self._part_count += 1
+        part_name = f"{self._part_prefix}-{self._part_count:06}.{self.columnar_format}"
+        part_fp = os.path.join(self.columnar_dir, part_name)
+        # dataset readers skip hidden files, so a part being written is never read
+        tmp_fp = os.path.join(self.columnar_dir, f".{part_name}.tmp")
+        if self.columnar_format == "parquet":
+            pyarrow.parquet.write_table(table, tmp_fp)
+        else:
+            pyarrow.feather.write_feather(table, tmp_fp)
+        os.replace(tmp_fp, part_fp)
+
+    def close(self):
+        """
+        Writes the buffered rows and closes the CSV file.
+        """
+        with self._lock:
+            self._flush_locked()
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,393 @@
+import argparse
+import logging
+import os
+import random
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from decision_tree import DecisionTree
+from wordle_solver import (
+    WordListGeneratorBase,
+    WordListGeneratorRandom,
+    WordListGeneratorEntropy,
+    WordListGeneratorTree,
+    WordListGeneratorLLM,
+    OpenAIInterface,
+)
+from wordle_judge import WordleJudge
+from word_dictionary import WordDictionary
+from word_matrix import encode_words, read_word_file
+from experiment_recorder import BufferedExperimentRecorder, COLUMNAR_FORMATS
+from instrumentation import PROFILE_MODES, GameProfiler, PhaseTimer
+from prompt_builder import DEFAULT_RANKING, RANKINGS
+from solver_logging import add_logging_arguments, configure_logging_from_args, get_logger, log_event
+from trace_sink import NULL_TRACE_SINK, TRACE_MODES, TraceSink
+
+CANIDATE_FIRST_WORD_LIST = ["adieu", "trace", "crate",]
+WORDS_FP = "data/five-letter-words.txt"
+MAX_ATTEMPTS = 20
+
+logger = get_logger(__name__)
+
+# the generator of a worker process of run_games_parallel, created once by _init_worker
+_worker_assistant = None
+
+GameResult = namedtuple("GameResult", ["solver_type", "initial_word", "answer", "word", "num_attempts"])
+
+
+def play_game(wordle_virtual_assistant, answer, first_word, max_attempts=MAX_ATTEMPTS):
+    """
+    Plays one game with a loaded generator against the WordleJudge.
+
+    The generator must provide get_candidate_word.  It is reset before the game, so one generator can
+    play any number of games without reloading its word list.  Judging and choosing the next guess are 
+    timed as the "judge" and "guess" phases of every turn on the generator's timer.
+
+    Args:
+        wordle_virtual_assistant (WordListGeneratorBase): The loaded generator recommending the guesses.
+        answer (str): The correct word.
+        first_word (str): The first guess.
+        max_attempts (int, optional): The number of attempts after which the game is aborted. Defaults to MAX_ATTEMPTS.
+
+    Returns:
+        tuple: The last guessed word, or None if the generator ran out of candidates, and the number of attempts.
+    """
+    wordle_virtual_assistant.reset()
+    wordle_virtual_assistant.trace("game", answer=answer, first_word=first_word)
+    wordle_game = WordleJudge(answer)
+    timer = wordle_virtual_assistant.timer
+
+    word = first_word
+    attempt_count = 0
+    while True:
+        attempt_count += 1
+        if attempt_count > max_attempts:
+            break
+
+        timer.next_turn()
+        with timer.phase("judge"):
+            result = wordle_game.judge_guess(word)
+        if result is True:
+            break
+
+        with timer.phase("guess"):
+            wordle_virtual_assistant.update_state(result, word)
+            word = wordle_virtual_assistant.get_candidate_word()
+        if word is None:
+            break
+
+    wordle_virtual_assistant.trace("result", word=word, num_attempts=attempt_count)
+    log_event(logger, logging.DEBUG, "game", "%s: %s in %d attempts", answer, word, attempt_count,
+              answer=answer, first_word=first_word, word=word, num_attempts=attempt_count)
+    return word, attempt_count
+
+
+def run_games(solver_factory, answers, trials=1, first_word=None, seed=None, recorder=None, solver_type="random",
+              profiler=None):
+    """
+    Plays every answer for a number of trials in this process and records the results.
+
+    The solver_factory is called once; the generator it returns, with its loaded word list, is reused by
+    every game.
+
+    Args:
+        solver_factory (callable): Returns a loaded generator providing get_candidate_word.
+        answers (list): The correct words to play.
+        trials (int, optional): The number of games per answer. Defaults to 1.
+        first_word (str, optional): The first guess of every game. Defaults to a random choice from CANIDATE_FIRST_WORD_LIST.
+        seed (int, optional): Seeds the random module before the first game for reproducible runs. Defaults to None.
+        recorder (ExperimentRecorder, optional): Records every game. Defaults to None.
+        solver_type (str, optional): The solver type written to the recorder. Defaults to "random".
+        profiler (GameProfiler, optional): Profiles every game into a file named after its number and answer. 
+            Defaults to None.
+
+    Returns:
+        list: A GameResult for every game, in answer then trial order.
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    wordle_virtual_assistant = solver_factory()
+
+    results = []
+    for answer in answers:
+        answer = answer.lower()
+        for _ in range(trials):
+            initial_word = first_word if first_word else random.choice(CANIDATE_FIRST_WORD_LIST)
+            if profiler is None:
+                word, num_attempts = play_game(wordle_virtual_assistant, answer, initial_word)
+            else:
+                with profiler.game(f"{len(results):05}_{answer}"):
+                    word, num_attempts = play_game(wordle_virtual_assistant, answer, initial_word)
+
+            game_result = GameResult(solver_type, initial_word, answer, word, num_attempts)
+            results.append(game_result)
+            if recorder is not None:
+                recorder.record(solver_type, initial_word, str(word), num_attempts)
+
+    # streamed LLM responses are recorded in the background, so the trace is complete before it is closed
+    wordle_virtual_assistant.wait_for_responses()
+    return results
+
+
+def _init_worker(solver_type, words_fp, engine, word_matrix_fp, cache_fp=None, tree_fp=None, llm_options=None):
+    """
+    Creates the generator of a worker process on the memory-mapped letter matrix.
+
+    The matrix is handed to the dictionary of the worker before the generator loads, so the worker never 
+    encodes the words itself.
+    """
+    global _worker_assistant
+    WordDictionary.for_file(words_fp, matrix=np.load(word_matrix_fp, mmap_mode='r'))
+    _worker_assistant = solver_factory_for(solver_type, words_fp, engine, cache_fp=cache_fp, tree_fp=tree_fp,
+                                           **(llm_options or {}))()
+
+
+def _play_job(job):
+    """
+    Plays one game in a worker process with its own random stream.
+    """
+    answer, first_word, job_seed = job
+    random.seed(job_seed)
+    return play_game(_worker_assistant, answer, first_word)
+
+
+def run_games_parallel(solver_type, answers, trials=1, first_word=None, seed=None, recorder=None,
+                       max_workers=None, words_fp=WORDS_FP, engine=None, cache_fp=None, tree_fp=None,
+                       token_budget=None, rank_by=DEFAULT_RANKING, answers_fp=None, stream=False):
+    """
+    Plays every answer for a number of trials sharded across a pool of worker processes.
+
+    Each worker loads its generator once.  The encoded letter matrix of the word list is written once to
+    a .npy file and memory-mapped by every worker, as is the cached pattern matrix used by the entropy
+    solver, so the workers share one copy through the page cache.  Every (answer, trial) job seeds the
+    random module from (seed, answer, trial), so the results do not depend on the number of workers or
+    on which worker plays which job.  Results are returned and recorded in answer then trial order.
+
+    Args:
+        solver_type (str): "random", "entropy", "tree" or "llm", see solver_factory_for.
+        answers (list): The correct words to play.
+        trials (int, optional): The number of games per answer. Defaults to 1.
+        first_word (str, optional): The first guess of every game. Defaults to a random choice from CANIDATE_FIRST_WORD_LIST.
+        seed (int, optional): The seed of the per-job random streams. Defaults to None.
+        recorder (ExperimentRecorder, optional): Records every game. Defaults to None.
+        max_workers (int, optional): The number of worker processes. Defaults to the number of cpus.
+        words_fp (str, optional): The file path to the word list. Defaults to WORDS_FP.
+        engine (str, optional): The filtering engine. Defaults to the generator's default engine.
+        cache_fp (str, optional): The SQLite file of a PromptCache shared by the workers. Defaults to no cache.
+        tree_fp (str, optional): The decision tree file of the "tree" solver. Defaults to None.
+        token_budget (int, optional): The most tokens of an "llm" prompt, see solver_factory_for. Defaults to None.
+        rank_by (str, optional): The ranking of the candidate words of an "llm" prompt. Defaults to DEFAULT_RANKING.
+        answers_fp (str, optional): The answer list of the "answers" ranking. Defaults to None.
+        stream (bool, optional): Streams the "llm" responses, see solver_factory_for. Defaults to False.
+
+    Returns:
+        list: A GameResult for every game, in answer then trial order.
+    """
+    llm_options = {"token_budget": token_budget, "rank_by": rank_by, "answers_fp": answers_fp, "stream": stream}
+    jobs = []
+    for answer in answers:
+        answer = answer.lower()
+        for trial in range(trials):
+            job_seed = None if seed is None else f"{seed}:{answer}:{trial}"
+            initial_word = first_word if first_word else random.Random(job_seed).choice(CANIDATE_FIRST_WORD_LIST)
+            jobs.append((answer, initial_word, job_seed))
+
+    dictionary = WordListGeneratorBase(words_fp)
+    dictionary.load()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        word_matrix_fp = os.path.join(tmp_dir, "word_matrix.npy")
+        np.save(word_matrix_fp, encode_words(dictionary.loaded_words))
+
+        max_workers = max_workers or os.cpu_count()
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(solver_type, words_fp, engine, word_matrix_fp, cache_fp, tree_fp, llm_options),
+        ) as executor:
+            chunksize = max(1, len(jobs) // (4 * max_workers))
+            outcomes = list(executor.map(_play_job, jobs, chunksize=chunksize))
+
+    results = []
+    for (answer, initial_word, _), (word, num_attempts) in zip(jobs, outcomes):
+        results.append(GameResult(solver_type, initial_word, answer, word, num_attempts))
+        if recorder is not None:
+            recorder.record(solver_type, initial_word, str(word), num_attempts)
+
+    return results
+
+
+def solver_factory_for(solver_type, words_fp=WORDS_FP, engine=None, api_key_fp="/openai/api_key.json", cache_fp=None,
+                       trace_sink=None, tree_fp=None, timer=None, token_budget=None, rank_by=DEFAULT_RANKING,
+                       answers_fp=None, stream=False):
+    """
+    Returns a factory for the generator of a solver type.
+
+    Args:
+        solver_type (str): "random", "entropy", "tree" or "llm".
+        words_fp (str, optional): The file path to the word list. Defaults to WORDS_FP.
+        engine (str, optional): The filtering engine. Defaults to the generator's default engine.
+        api_key_fp (str, optional): The JSON file with the OpenAI API key, only read for "llm".
+        cache_fp (str, optional): The SQLite file of a PromptCache for "llm" responses. Defaults to no cache.
+        trace_sink (TraceSink, optional): Receives the trace records of the games. Defaults to no tracing.
+        tree_fp (str, optional): The decision tree file, only read for "tree". Defaults to None.
+        timer (PhaseTimer, optional): Times the phases of loading and of every game. Defaults to no timing.
+        token_budget (int, optional): The most tokens of an "llm" prompt. Defaults to None, which samples
+            WordListGeneratorLLM.MAX_SIZE candidate words.
+        rank_by (str, optional): The ranking of the candidate words of an "llm" prompt, see prompt_builder.py.
+            Defaults to DEFAULT_RANKING.
+        answers_fp (str, optional): The answer list of the "answers" ranking, only read for "llm". Defaults to None.
+        stream (bool, optional): Streams the "llm" responses and plays on at the recommendation, before the
+            explanation has streamed in. Defaults to False.
+
+    Returns:
+        callable: A function returning a loaded generator.
+
+    Raises:
+        ValueError: If the solver type is unknown.
+    """
+    kwargs = {} if engine is None else {"engine": engine}
+
+    def make_random():
+        return WordListGeneratorRandom(words_fp, **kwargs)
+
+    def make_entropy():
+        return WordListGeneratorEntropy(words_fp, **kwargs)
+
+    def make_tree():
+        return WordListGeneratorTree(words_fp, tree_fp, **kwargs)
+
+    def make_llm():
+        from llm_cache import PromptCache
+        from openai_clients import read_api_key, shared_client
+
+        api_key = read_api_key(api_key_fp)
+        cache = None if cache_fp is None else PromptCache(cache_fp)
+        llm_interface = OpenAIInterface(api_key, cache=cache, client=shared_client(api_key))
+        return WordListGeneratorLLM(words_fp, llm_interface=llm_interface, token_budget=token_budget, rank_by=rank_by,
+                                    answers_fp=answers_fp, stream=stream, **kwargs)
+
+    factories = {"random": make_random, "entropy": make_entropy, "tree": make_tree, "llm": make_llm}
+    if solver_type not in factories:
+        raise ValueError(f"Unknown solver type '{solver_type}', expected one of {sorted(factories)}")
+
+    def factory():
+        wordle_virtual_assistant = factories[solver_type]()
+        if timer is not None:
+            wordle_virtual_assistant.timer = timer
+        wordle_virtual_assistant.load()
+        wordle_virtual_assistant.trace_sink = NULL_TRACE_SINK if trace_sink is None else trace_sink
+        return wordle_virtual_assistant
+
+    return factory
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a batch of Wordle games in process.')
+    parser.add_argument('--solver', type=str, default='random', choices=['random', 'entropy', 'tree', 'llm'], help='The solver to run')
+    parser.add_argument('--answers_fp', type=str, default='data/f-past-wordle-answers.txt', help='File path to the answers to play')
+    parser.add_argument('--num_words', type=int, default=None, help='Number of answers to sample, defaults to all answers')
+    parser.add_argument('--trials', type=int, default=1, help='Number of games per answer')
+    parser.add_argument('--first_word', type=str, default=None, help='The first word to use')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for the answer sample and the solver')
+    parser.add_argument('--exp_fp', type=str, default=None, help='File path to record experiment results')
+    parser.add_argument('--engine', type=str, default=None, choices=['regex', 'numpy', 'bitset'], help='The candidate filtering engine')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes, 0 for one per cpu')
+    parser.add_argument('--columnar_dir', type=str, default=None, help='Directory to also record experiment results as columnar part files')
+    parser.add_argument('--columnar_format', type=str, default='parquet', choices=COLUMNAR_FORMATS, help='Format of the columnar part files')
+    parser.add_argument('--trace', type=str, default='off', choices=TRACE_MODES, help='Trace no games, a sample of the games or every game')
+    parser.add_argument('--trace_fp', type=str, default='llm_trace_data/trace.jsonl.gz', help='File path to the gzip JSON lines trace')
+    parser.add_argument('--trace_sample_rate', type=float, default=0.1, help='Fraction of games traced with --trace sampled')
+    parser.add_argument('--cache_fp', type=str, default=None, help='SQLite file caching LLM responses, only used by the llm solver')
+    parser.add_argument('--tree_fp', type=str, default=None, help='Decision tree file of the tree solver, see decision_tree.py')
+    parser.add_argument('--token_budget', type=int, default=None, help='Most tokens of an llm prompt, defaults to sampling a fixed number of candidates')
+    parser.add_argument('--rank_by', type=str, default=DEFAULT_RANKING, choices=RANKINGS, help='Ranking of the candidates filling the token budget')
+    parser.add_argument('--stream', action='store_true', help='Stream llm responses and play on as soon as the recommendation arrives')
+    parser.add_argument('--timing', action='store_true', help='Time the phases of every game and print a summary')
+    parser.add_argument('--timing_fp', type=str, default=None, help='File path to write the phases of every game and turn as JSON')
+    parser.add_argument('--profile', type=str, default=None, choices=PROFILE_MODES, help='Profile every game with cProfile or a stack sampler')
+    parser.add_argument('--profile_dir', type=str, default='llm_trace_data/profiles', help='Directory of the per-game profiles')
+    add_logging_arguments(parser)
+
+    args = parser.parse_args()
+    configure_logging_from_args(args)
+    if args.workers != 1 and args.trace != 'off':
+        parser.error('--trace is only supported with --workers 1')
+    if args.workers != 1 and (args.timing or args.timing_fp or args.profile):
+        parser.error('--timing, --timing_fp and --profile are only supported with --workers 1')
+    if args.solver == 'tree':
+        if args.tree_fp is None:
+            parser.error('--tree_fp is required by the tree solver')
+        # games starting with another word leave the tree on the first turn
+        args.first_word = args.first_word or DecisionTree.load(args.tree_fp).opener
+
+    answers = read_word_file(args.answers_fp)
+    if args.num_words is not None:
+        answers = random.Random(args.seed).sample(answers, args.num_words)
+
+    log_event(logger, logging.INFO, "run", "Running %s solver for %d words and %d trials", args.solver, len(answers),
+              args.trials, solver=args.solver, num_words=len(answers), trials=args.trials)
+
+    experiment_recorder = BufferedExperimentRecorder(
+        args.exp_fp,
+        columnar_dir=args.columnar_dir,
+        columnar_format=args.columnar_format,
+    )
+    trace_sink = TraceSink(args.trace_fp, args.trace, args.trace_sample_rate) if args.trace != 'off' else None
+    timer = PhaseTimer() if args.timing or args.timing_fp else None
+    profiler = GameProfiler(args.profile_dir, args.profile) if args.profile else None
+    if args.workers == 1:
+        results = run_games(
+            solver_factory_for(args.solver, engine=args.engine, cache_fp=args.cache_fp, trace_sink=trace_sink,
+                               tree_fp=args.tree_fp, timer=timer, token_budget=args.token_budget,
+                               rank_by=args.rank_by, answers_fp=args.answers_fp, stream=args.stream),
+            answers,
+            trials=args.trials,
+            first_word=args.first_word,
+            seed=args.seed,
+            recorder=experiment_recorder,
+            solver_type=args.solver,
+            profiler=profiler,
+        )
+    else:
+        results = run_games_parallel(
+            args.solver,
+            answers,
+            trials=args.trials,
+            first_word=args.first_word,
+            seed=args.seed,
+            recorder=experiment_recorder,
+            max_workers=args.workers or None,
+            engine=args.engine,
+            cache_fp=args.cache_fp,
+            tree_fp=args.tree_fp,
+            token_budget=args.token_budget,
+            rank_by=args.rank_by,
+            answers_fp=args.answers_fp,
+            stream=args.stream,
+        )
+    experiment_recorder.close()
+    if trace_sink is not None:
+        trace_sink.close()
+
+    solved = sum(1 for result in results if result.word == result.answer and result.num_attempts <= 6)
+    log_event(logger, logging.INFO, "solved", "Solved %d of %d games in 6 attempts or fewer", solved, len(results),
+              solved=solved, games=len(results))
+
+    if timer is not None:
+        log_event(logger, logging.INFO, "timing", "Phase timings:", phases=timer.summary())
+        for name, phase in timer.summary().items():
+            logger.info("    %-16s %8d x %10.1f us = %8.3f s", name, phase['count'], phase['mean_us'], phase['total_s'])
+        if args.timing_fp is not None:
+            timer.write_json(args.timing_fp)
+    if profiler is not None:
+        log_event(logger, logging.INFO, "profiles", "Wrote the profile of every game to %s", args.profile_dir,
+                  profile_dir=args.profile_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROMPT_WORD_LIST_MARKER = "List of candidate words:\n"
+# the characters of the content sent per chunk of a streamed completion, about one token
+STREAM_CHUNK_SIZE = 4
+# the puzzle headers of a prompt built by batch_llm_runner.build_batch_prompt
+PUZZLE_HEADER_PATTERN = re.compile(r"^### Puzzle (\d+)$", re.M)
+
+
+def recommend_from_prompt(prompt):
+    """
+    Picks the recommendation a fake LLM gives for a prompt: the first word of its candidate word list.
+
+    Args:
+        prompt (str): The prompt generated by WordListGeneratorLLM.generate_llm_prompt.
+
+    Returns:
+        str: The first candidate word, or an empty string if the prompt has no candidate word list.
+    """
+    _, _, word_list = prompt.partition(PROMPT_WORD_LIST_MARKER)
+    words = word_list.split()
+    return words[0] if words else ""
+
+
+class FakeOpenAIServer:
+    """
+    A local OpenAI-compatible chat completions server for offline tests and concurrency sizing.
+
+    The server answers POST /v1/chat/completions with a JSON recommendation of the first candidate word of
+    the prompt after an optional delay, and counts the requests in flight.  A batched prompt of several
+    puzzles is answered with a JSON array of one recommendation per puzzle.  A request with "stream": true is
+    answered with server-sent chat completion chunks of STREAM_CHUNK_SIZE characters, chunk_delay seconds
+    apart.  Point an OpenAIInterface or AsyncOpenAIInterface at it with base_url=server.base_url.
+
+    Attributes:
+        latency (float): Seconds to wait before answering each request.
+        chunk_delay (float): Seconds to wait before each chunk of a streamed answer.
+        request_count (int): The number of requests answered.
+        in_flight (int): The number of requests being answered.
+        max_in_flight (int): The highest number of requests in flight at once.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, responder=recommend_from_prompt, chunk_delay=0.0,
+                 replier=None):
+        """
+        Initializes the server, binding to the host and port. Port 0 picks a free port.
+
+        Args:
+            host (str, optional): The host to bind. Defaults to "127.0.0.1".
+            port (int, optional): The port to bind. Defaults to 0.
+            latency (float, optional): Seconds to wait before answering each request. Defaults to 0.0.
+            responder (callable, optional): Maps the user prompt to the recommended word. Defaults to recommend_from_prompt.
+            chunk_delay (float, optional): Seconds to wait before each chunk of a streamed answer. Defaults to 0.0.
+            replier (callable, optional): Maps the user prompt to the whole content of the answer, or to None for the 
+                JSON recommendation of the responder, e.g. to answer some prompts with malformed content. Defaults 
+                to None.
+        """
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.responder = responder
+        self.replier = replier
+        self.request_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self):
+        """
+        str: The base URL of the OpenAI API served by this server.
+        """
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                with server._lock:
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    if server.latency:
+                        time.sleep(server.latency)
+                    payload = server.completion(body)
+                    if body.get("stream"):
+                        self.write_stream(server.completion_chunks(payload))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+                        server.request_count += 1
+                if body.get("stream"):
+                    return
+
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def write_stream(self, chunks):
+                # server-sent events in HTTP chunked transfer encoding, so the connection is kept alive
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for chunk in chunks:
+                    if server.chunk_delay:
+                        time.sleep(server.chunk_delay)
+                    self.write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.write_chunk(b"data: [DONE]\n\n")
+                self.write_chunk(b"")
+
+            def write_chunk(self, data):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+    def completion(self, body):
+        """
+        Builds the chat completion returned for a request body.
+
+        Args:
+            body (dict): The JSON body of the chat completions request.
+
+        Returns:
+            dict: An OpenAI chat completion object.
+        """
+        prompt = body["messages"][-1]["content"]
+        sections = PUZZLE_HEADER_PATTERN.split(prompt)
+        content = None if self.replier is None else self.replier(prompt)
+        if content is None and len(sections) > 1:
+            content = json.dumps([
+                {
+                    "game": int(game),
+                    "recommendation": self.responder(section),
+                    "explanation": "Picked the first word of the candidate list.",
+                }
+                for game, section in zip(sections[1::2], sections[2::2])
+            ])
+        elif content is None:
+            content = json.dumps({
+                "recommendation": self.responder(prompt),
+                "explanation": "Picked the first word of the candidate list.",
+            })
+        return {
+            "id": f"chatcmpl-fake-{self.request_count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def completion_chunks(self, completion):
+        """
+        Splits a chat completion into the chunks of a streamed completion.
+
+        Args:
+            completion (dict): The chat completion built by completion().
+
+        Returns:
+            list: The OpenAI chat completion chunk objects, STREAM_CHUNK_SIZE characters of content each.
+        """
+        content = completion["choices"][0]["message"]["content"]
+
+        def chunk(delta, finish_reason=None):
+            return {
+                "id": completion["id"],
+                "object": "chat.completion.chunk",
+                "created": completion["created"],
+                "model": completion["model"],
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+
+        chunks = [chunk({"role": "assistant", "content": ""})]
+        chunks.extend(
+            chunk({"content": content[i:i + STREAM_CHUNK_SIZE]}) for i in range(0, len(content), STREAM_CHUNK_SIZE)
+        )
+        chunks.append(chunk({}, "stop"))
+        return chunks
+
+    def start(self):
+        """
+        Starts serving on a background thread.
+
+        Returns:
+            FakeOpenAIServer: The server, so it can be started and assigned in one expression.
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops serving and closes the socket.
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local fake OpenAI chat completions server.')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Host to bind')
+    parser.add_argument('--port', type=int, default=8000, help='Port to bind')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait before answering each request')
+    parser.add_argument('--chunk_delay', type=float, default=0.0, help='Seconds to wait before each chunk of a streamed answer')
+
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.host, args.port, args.latency, chunk_delay=args.chunk_delay)
+    print(f"Serving fake OpenAI API at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Answered {server.request_count} requests, at most {server.max_in_flight} in flight")
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
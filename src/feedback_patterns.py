@@ -0,0 +1,482 @@
+import argparse
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from word_matrix import WORD_LENGTH, encode_words, read_word_file
+
+# feedback value of a single letter, the pattern code is sum(value_i * 3**i) over the five positions
+ABSENT = 0
+PRESENT = 1
+CORRECT = 2
+
+NUM_PATTERNS = 3 ** WORD_LENGTH
+ALL_CORRECT_PATTERN = NUM_PATTERNS - 1
+
+# "wordle" codes follow the Wordle rules for repeated letters, "judge" codes the feedback of
+# WordleJudge.judge_guess, which the solvers filter their candidates with
+WORDLE_RULES = "wordle"
+JUDGE_RULES = "judge"
+FEEDBACK_RULES = (WORDLE_RULES, JUDGE_RULES)
+
+DEFAULT_CHUNK_SIZE = 256
+ENTROPY_CHUNK_CELLS = 1 << 22
+
+_POWERS_OF_THREE = (3 ** np.arange(WORD_LENGTH)).astype(np.uint8)
+
+
+def feedback_pattern(guess, answer):
+    """
+    Computes the Wordle feedback for a single guess as a base-3 pattern code.
+
+    This is the scalar reference implementation.  Repeated letters follow the Wordle rules: correct letters
+    are matched first, then the remaining occurrences of a letter in the answer are handed out as present
+    from left to right, any further occurrences in the guess are absent.
+
+    Args:
+        guess (str): The guessed word.
+        answer (str): The correct word.
+
+    Returns:
+        int: The pattern code in the range 0 to 242, where 242 means every letter is correct.
+    """
+    values = [ABSENT] * WORD_LENGTH
+    remaining = {}
+    for i in range(WORD_LENGTH):
+        if guess[i] == answer[i]:
+            values[i] = CORRECT
+        else:
+            remaining[answer[i]] = remaining.get(answer[i], 0) + 1
+
+    for i in range(WORD_LENGTH):
+        if values[i] != CORRECT and remaining.get(guess[i], 0) > 0:
+            values[i] = PRESENT
+            remaining[guess[i]] -= 1
+
+    return sum(value * 3 ** i for i, value in enumerate(values))
+
+
+def judge_feedback_pattern(guess, answer):
+    """
+    Computes the feedback of WordleJudge.judge_guess for a single guess as a base-3 pattern code.
+
+    judge_guess marks a letter present whenever the answer contains it elsewhere, also for repeated letters, so
+    for "eerie" against "apple" both leading e's are present where the Wordle rules of feedback_pattern mark
+    them absent.
+
+    Args:
+        guess (str): The guessed word.
+        answer (str): The correct word.
+
+    Returns:
+        int: The pattern code in the range 0 to 242, where 242 means every letter is correct.
+    """
+    pattern = 0
+    for i in range(WORD_LENGTH):
+        if guess[i] == answer[i]:
+            pattern += CORRECT * 3 ** i
+        elif guess[i] in answer:
+            pattern += PRESENT * 3 ** i
+    return pattern
+
+
+def judge_patterns(guess_matrix, answer_matrix):
+    """
+    Computes the pattern codes of WordleJudge.judge_guess for every guess against every answer.
+
+    judge_guess marks a letter present whenever the answer contains it elsewhere, also for repeated letters, so
+    these codes differ from the Wordle rules of build_pattern_matrix.  The solvers filter their candidates by
+    this feedback, so a guess partitions the candidates by these codes.
+
+    Args:
+        guess_matrix (numpy.ndarray): The (G, 5) uint8 letter matrix of the guesses.
+        answer_matrix (numpy.ndarray): The (A, 5) uint8 letter matrix of the answers.
+
+    Returns:
+        numpy.ndarray: A (G, A) uint8 matrix of pattern codes.
+    """
+    # one bit per letter contained in each answer
+    answer_letters = np.bitwise_or.reduce(np.left_shift(1, answer_matrix.astype(np.int32)), axis=1)
+
+    patterns = np.empty((len(guess_matrix), len(answer_matrix)), dtype=np.uint8)
+    chunk_rows = max(1, ENTROPY_CHUNK_CELLS // max(1, len(answer_matrix) * WORD_LENGTH))
+    for start in range(0, len(guess_matrix), chunk_rows):
+        guesses = guess_matrix[start:start + chunk_rows, None, :]
+        present = (answer_letters[None, :, None] >> guesses) & 1
+        values = np.where(guesses == answer_matrix[None, :, :], CORRECT, present * PRESENT).astype(np.uint8)
+        patterns[start:start + chunk_rows] = values @ _POWERS_OF_THREE
+    return patterns
+
+
+def _broadcast_patterns(guesses, answers):
+    """
+    Computes pattern codes for letter arrays of shape (..., 5) that broadcast against each other.
+
+    A non-correct letter at position i is present when the answer has more unmatched occurrences of the
+    letter than the guess has non-correct occurrences of it before position i, which gives the same
+    result as feedback_pattern without a per-letter loop.
+    """
+    correct = guesses == answers
+    unmatched = ~correct
+
+    patterns = np.zeros(correct.shape[:-1], dtype=np.uint8)
+    for i in range(WORD_LENGTH):
+        letter = guesses[..., i]
+
+        # occurrences of the letter in the answer that are not already matched as correct
+        available = np.zeros(patterns.shape, dtype=np.uint8)
+        for j in range(WORD_LENGTH):
+            available += (answers[..., j] == letter) & unmatched[..., j]
+
+        # occurrences of the letter earlier in the guess that consumed one of those
+        consumed = np.zeros(patterns.shape, dtype=np.uint8)
+        for k in range(i):
+            consumed += (guesses[..., k] == letter) & unmatched[..., k]
+
+        present = unmatched[..., i] & (consumed < available)
+        patterns += _POWERS_OF_THREE[i] * (CORRECT * correct[..., i] + present).astype(np.uint8)
+
+    return patterns
+
+
+def compute_patterns(guess_matrix, answer_matrix):
+    """
+    Computes the feedback pattern codes for every (guess, answer) pair of two letter matrices.
+
+    Args:
+        guess_matrix (numpy.ndarray): A (G, 5) uint8 letter matrix of guesses.
+        answer_matrix (numpy.ndarray): An (A, 5) uint8 letter matrix of answers.
+
+    Returns:
+        numpy.ndarray: A (G, A) uint8 matrix of pattern codes.
+    """
+    return _broadcast_patterns(guess_matrix[:, None, :], answer_matrix[None, :, :])
+
+
+def compute_paired_patterns(guess_matrix, answer_matrix):
+    """
+    Computes the feedback pattern codes of row-aligned guesses and answers.
+
+    Args:
+        guess_matrix (numpy.ndarray): An (N, 5) uint8 letter matrix of guesses.
+        answer_matrix (numpy.ndarray): An (N, 5) uint8 letter matrix of answers.
+
+    Returns:
+        numpy.ndarray: An (N,) uint8 array with the pattern code of guess i against answer i.
+    """
+    return _broadcast_patterns(guess_matrix, answer_matrix)
+
+
+def build_pattern_matrix(guess_matrix, answer_matrix, out=None, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=None,
+                         rules=WORDLE_RULES):
+    """
+    Computes the full guess x answer pattern matrix in chunks of guesses, in parallel.
+
+    Each chunk only needs chunk_size x A intermediate arrays, so the full 15,920 x 15,920 table fits in
+    the memory of a laptop.  The numpy kernels release the GIL, so a thread pool keeps every core busy
+    while writing straight into the output array, which may be a memory-mapped file.
+
+    Args:
+        guess_matrix (numpy.ndarray): A (G, 5) uint8 letter matrix of guesses.
+        answer_matrix (numpy.ndarray): An (A, 5) uint8 letter matrix of answers.
+        out (numpy.ndarray, optional): A (G, A) uint8 array to fill. Defaults to a new in-memory array.
+        chunk_size (int, optional): The number of guesses per chunk. Defaults to DEFAULT_CHUNK_SIZE.
+        max_workers (int, optional): The number of worker threads. Defaults to the number of cpus.
+        rules (str, optional): WORDLE_RULES for the codes of compute_patterns, JUDGE_RULES for those of 
+            judge_patterns. Defaults to WORDLE_RULES.
+
+    Returns:
+        numpy.ndarray: The filled (G, A) pattern matrix.
+
+    Raises:
+        ValueError: If the rules are unknown.
+    """
+    kernel = _pattern_kernel(rules)
+    if out is None:
+        out = np.empty((len(guess_matrix), len(answer_matrix)), dtype=np.uint8)
+
+    def fill_chunk(start):
+        stop = min(start + chunk_size, len(guess_matrix))
+        out[start:stop] = kernel(guess_matrix[start:stop], answer_matrix)
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        # consume the results so exceptions raised in a worker propagate
+        list(executor.map(fill_chunk, range(0, len(guess_matrix), chunk_size)))
+
+    return out
+
+
+def _pattern_kernel(rules):
+    if rules not in FEEDBACK_RULES:
+        raise ValueError(f"Unknown feedback rules '{rules}', expected one of {FEEDBACK_RULES}")
+    return judge_patterns if rules == JUDGE_RULES else compute_patterns
+
+
+def pattern_entropy(patterns):
+    """
+    Computes the entropy of the feedback partition induced by each guess.
+
+    Row g of patterns holds the pattern code of guess g against every remaining candidate.  The
+    patterns of all rows are counted in a single bincount by offsetting each row into its own block
+    of NUM_PATTERNS bins.
+
+    Args:
+        patterns (numpy.ndarray): A (G, M) uint8 matrix of pattern codes.
+
+    Returns:
+        numpy.ndarray: The entropy in bits of each of the G guesses.
+    """
+    num_guesses, num_candidates = patterns.shape
+    entropy = np.zeros(num_guesses)
+    if num_candidates == 0:
+        return entropy
+
+    # bound the size of the int64 bin index array to about ENTROPY_CHUNK_CELLS entries
+    chunk_rows = max(1, ENTROPY_CHUNK_CELLS // num_candidates)
+    for start in range(0, num_guesses, chunk_rows):
+        chunk = np.asarray(patterns[start:start + chunk_rows])
+        rows = len(chunk)
+        offsets = np.arange(rows, dtype=np.int64)[:, None] * NUM_PATTERNS
+        counts = np.bincount((chunk + offsets).ravel(), minlength=rows * NUM_PATTERNS)
+        probabilities = counts.reshape(rows, NUM_PATTERNS) / num_candidates
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            information = np.where(probabilities > 0, probabilities * np.log2(probabilities), 0.0)
+        entropy[start:start + rows] = -information.sum(axis=1)
+
+    return entropy
+
+
+def file_checksum(fp):
+    """
+    Computes the SHA-256 checksum of a file.
+
+    Args:
+        fp (str): The file path.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    with open(fp, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def pattern_cache_path(words_fp, answers_fp=None, cache_dir=None, rules=WORDLE_RULES):
+    """
+    Returns the cache file path of the pattern matrix for a pair of word lists.
+
+    The file name is derived from the checksums of the word list files, so editing a word list
+    automatically selects a new cache file.  Matrices of judge codes are named judge_patterns_*.npy.
+
+    Args:
+        words_fp (str): The file path to the guess word list.
+        answers_fp (str, optional): The file path to the answer word list. Defaults to words_fp.
+        cache_dir (str, optional): The cache directory. Defaults to a "pattern_cache" directory next to words_fp.
+        rules (str, optional): The rules of the pattern codes, see FEEDBACK_RULES. Defaults to WORDLE_RULES.
+
+    Returns:
+        str: The path to the .npy cache file.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(words_fp), "pattern_cache")
+
+    key = file_checksum(words_fp)[:16]
+    if answers_fp is not None and os.path.abspath(answers_fp) != os.path.abspath(words_fp):
+        key += "_" + file_checksum(answers_fp)[:16]
+
+    prefix = "judge_patterns" if rules == JUDGE_RULES else "patterns"
+    return os.path.join(cache_dir, f"{prefix}_{key}.npy")
+
+
+def pattern_to_result(guess, pattern):
+    """
+    Converts a pattern code to the result of WordleJudge.judge_guess for the guess.
+
+    Both kinds of codes give the judge_guess result.  A judge code is decoded letter by letter.  In a code of the
+    Wordle rules a repeated letter may be absent while the letter is correct or present elsewhere in the guess,
+    which means the answer contains it, so judge_guess marks it present; e.g. "eerie" against "apple" gives
+    present (0, 'e') and (1, 'e') rather than absent e's, which would remove the answer from the candidates.
+
+    Args:
+        guess (str): The guessed word.
+        pattern (int): The pattern code, of either rules.
+
+    Returns:
+        bool or dict: True if every letter is correct. Otherwise, a dictionary with the "present" and
+        "correct" (position, letter) tuples and the "absent" letters.
+    """
+    pattern = int(pattern)
+    if pattern == ALL_CORRECT_PATTERN:
+        return True
+
+    values = [pattern // 3 ** i % 3 for i in range(WORD_LENGTH)]
+    # the letters the answer contains
+    contained = {letter for letter, value in zip(guess, values) if value != ABSENT}
+
+    result = {"present": [], "correct": [], "absent": []}
+    for i, (letter, value) in enumerate(zip(guess, values)):
+        if value == CORRECT:
+            result["correct"].append((i, letter))
+        elif letter in contained:
+            result["present"].append((i, letter))
+        else:
+            result["absent"].append(letter)
+
+    return result
+
+
+def result_to_pattern(guess, result):
+    """
+    Converts a result dictionary from WordleJudge.judge_guess back to a pattern code.
+
+    Positions listed in "correct" or "present" get that value, every other position is absent.
+
+    Args:
+        guess (str): The guessed word.
+        result (bool or dict): The result of judging the guess.
+
+    Returns:
+        int: The pattern code.
+    """
+    if result is True:
+        return ALL_CORRECT_PATTERN
+
+    correct = set(result.get("correct", ()))
+    present = set(result.get("present", ()))
+    pattern = 0
+    for i, letter in enumerate(guess):
+        if (i, letter) in correct:
+            pattern += CORRECT * 3 ** i
+        elif (i, letter) in present:
+            pattern += PRESENT * 3 ** i
+
+    return pattern
+
+
+class PatternTable:
+    """
+    A precomputed guess x answer feedback pattern matrix.
+
+    The matrix is persisted as a memory-mapped .npy file keyed by the checksums of the word list files,
+    so it is built once and afterwards loaded without reading it into memory.  A table holds the codes of
+    either rules, see FEEDBACK_RULES.
+
+    Attributes:
+        guess_words (list): The guess words, one per row.
+        answer_words (list): The answer words, one per column.
+        patterns (numpy.ndarray): The (G, A) uint8 pattern matrix, usually a read-only memmap.
+        guess_index (dict): Maps a guess word to its row.
+        answer_index (dict): Maps an answer word to its column.
+        rules (str): The rules of the pattern codes.
+    """
+
+    def __init__(self, guess_words, answer_words, patterns, rules=WORDLE_RULES):
+        """
+        Initializes the PatternTable with the word lists and the pattern matrix.
+
+        Args:
+            guess_words (list): The guess words, one per row.
+            answer_words (list): The answer words, one per column.
+            patterns (numpy.ndarray): The (G, A) uint8 pattern matrix.
+            rules (str, optional): The rules of the pattern codes. Defaults to WORDLE_RULES.
+        """
+        self.rules = rules
+        self.guess_words = guess_words
+        self.answer_words = answer_words
+        self.patterns = patterns
+        self.guess_index = {word: i for i, word in enumerate(guess_words)}
+        self.answer_index = {word: i for i, word in enumerate(answer_words)}
+
+    @classmethod
+    def load(cls, words_fp, answers_fp=None, cache_dir=None, build=True, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=None,
+             rules=WORDLE_RULES):
+        """
+        Loads the pattern matrix for a pair of word lists, building and caching it on the first call.
+
+        The matrix is written to a temporary file and renamed into place, so concurrent processes never
+        see a partially written cache file.
+
+        Args:
+            words_fp (str): The file path to the guess word list.
+            answers_fp (str, optional): The file path to the answer word list. Defaults to words_fp.
+            cache_dir (str, optional): The cache directory. See pattern_cache_path.
+            build (bool, optional): Whether to build the matrix when it is not cached. Defaults to True.
+            chunk_size (int, optional): The number of guesses per chunk when building.
+            max_workers (int, optional): The number of worker threads when building.
+            rules (str, optional): The rules of the pattern codes, see FEEDBACK_RULES. Defaults to WORDLE_RULES.
+
+        Returns:
+            PatternTable: The loaded table.
+
+        Raises:
+            FileNotFoundError: If the matrix is not cached and build is False.
+            ValueError: If the rules are unknown.
+        """
+        _pattern_kernel(rules)
+        guess_words = read_word_file(words_fp)
+        answer_words = guess_words if answers_fp is None else read_word_file(answers_fp)
+        cache_fp = pattern_cache_path(words_fp, answers_fp, cache_dir, rules)
+
+        if not os.path.exists(cache_fp):
+            if not build:
+                raise FileNotFoundError(f"No cached pattern matrix at {cache_fp}")
+
+            os.makedirs(os.path.dirname(cache_fp), exist_ok=True)
+            tmp_fp = f"{cache_fp}.{os.getpid()}.tmp"
+            out = np.lib.format.open_memmap(
+                tmp_fp, mode='w+', dtype=np.uint8, shape=(len(guess_words), len(answer_words))
+            )
+            build_pattern_matrix(
+                encode_words(guess_words), encode_words(answer_words), out=out,
+                chunk_size=chunk_size, max_workers=max_workers, rules=rules,
+            )
+            out.flush()
+            del out
+            os.replace(tmp_fp, cache_fp)
+
+        patterns = np.load(cache_fp, mmap_mode='r')
+        return cls(guess_words, answer_words, patterns, rules)
+
+    def pattern(self, guess, answer):
+        """
+        Looks up the pattern code of a guess against an answer.
+
+        Args:
+            guess (str): The guessed word.
+            answer (str): The correct word.
+
+        Returns:
+            int: The pattern code.
+
+        Raises:
+            KeyError: If either word is not in the table.
+        """
+        return int(self.patterns[self.guess_index[guess], self.answer_index[answer]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the cached feedback pattern matrix for a word list.')
+    parser.add_argument('words_fp', type=str, help='File path to the guess word list')
+    parser.add_argument('--answers_fp', type=str, default=None, help='File path to the answer word list, defaults to the guess word list')
+    parser.add_argument('--cache_dir', type=str, default=None, help='Directory for the cached pattern matrix')
+    parser.add_argument('--chunk_size', type=int, default=DEFAULT_CHUNK_SIZE, help='Number of guesses per chunk')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker threads')
+    parser.add_argument('--rules', type=str, default=WORDLE_RULES, choices=FEEDBACK_RULES,
+                        help='Wordle rules for repeated letters, or the judge_guess feedback the entropy solver scores with')
+
+    args = parser.parse_args()
+
+    table = PatternTable.load(
+        args.words_fp, args.answers_fp, args.cache_dir,
+        chunk_size=args.chunk_size, max_workers=args.workers, rules=args.rules,
+    )
+    print(f"pattern matrix {table.patterns.shape} at {pattern_cache_path(args.words_fp, args.answers_fp, args.cache_dir, args.rules)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import namedtuple
+
+# modules a short-lived worker imports, from the solver core to the runners
+DEFAULT_MODULES = ["wordle_solver", "random_solver", "experiment_runner", "llm_solver"]
+# dependencies only the LLM paths need, imported on first use
+DEFERRED_MODULES = ["openai", "httpx"]
+# the LLM entry points create their clients at startup and may import them
+LLM_MODULES = ["llm_solver", "llm_solver_nyt", "async_llm_runner", "batch_llm_runner"]
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ImportTime = namedtuple("ImportTime", ["module", "self_us", "cumulative_us", "depth"])
+
+
+def parse_importtime(output):
+    """
+    Parses the report that python -X importtime writes to stderr.
+
+    Args:
+        output (str): The stderr of the interpreter.
+
+    Returns:
+        list: An ImportTime per imported module, in the order of the report.
+    """
+    import_times = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            # the header line
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        import_times.append(ImportTime(name.strip(), int(self_us), int(cumulative_us), depth))
+    return import_times
+
+
+def measure_import(module, runs=5, python=sys.executable):
+    """
+    Imports a module of src in fresh interpreters and reports the fastest run.
+
+    Args:
+        module (str): The module to import.
+        runs (int, optional): The number of interpreters to start. Defaults to 5.
+        python (str, optional): The interpreter to run. Defaults to the running interpreter.
+
+    Returns:
+        list: The ImportTime report of the fastest run, ending with the module itself.
+
+    Raises:
+        RuntimeError: If the module fails to import.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")])))
+    fastest = None
+    for _ in range(runs):
+        completed = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                                   capture_output=True, text=True, env=env, cwd=SRC_DIR)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+        import_times = parse_importtime(completed.stderr)
+        if fastest is None or import_times[-1].cumulative_us < fastest[-1].cumulative_us:
+            fastest = import_times
+    return fastest
+
+
+def summarize(module, import_times, top=10):
+    """
+    Summarizes the import report of a module.
+
+    Args:
+        module (str): The imported module.
+        import_times (list): Its ImportTime report.
+        top (int, optional): The number of top-level dependencies to list. Defaults to 10.
+
+    Returns:
+        dict: The total milliseconds, the slowest direct dependencies and the deferred modules that were imported.
+    """
+    # the report lists a module after its dependencies, so the module's imports follow the previous top-level entry
+    start = len(import_times) - 1
+    while start > 0 and import_times[start - 1].depth > 0:
+        start -= 1
+    own_imports = import_times[start:]
+    names = {import_time.module for import_time in own_imports}
+    direct = [import_time for import_time in own_imports if import_time.depth == 1]
+    slowest = sorted(direct, key=lambda import_time: import_time.cumulative_us, reverse=True)[:top]
+    return {
+        "module": module,
+        "total_ms": import_times[-1].cumulative_us / 1000,
+        "slowest": [{"module": import_time.module, "ms": import_time.cumulative_us / 1000} for import_time in slowest],
+        "deferred_imported": [name for name in DEFERRED_MODULES if name in names],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how long importing the solver modules takes.')
+    parser.add_argument('modules', type=str, nargs='*', default=DEFAULT_MODULES, help='Modules of src to import')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per module, the fastest is reported')
+    parser.add_argument('--top', type=int, default=5, help='Slowest direct dependencies to list per module')
+    parser.add_argument('--json_fp', type=str, default=None, help='File path to write the results as JSON')
+    parser.add_argument('--check_deferred', action='store_true',
+                        help='Exit with an error if a module imports one of the deferred LLM dependencies')
+
+    args = parser.parse_args()
+
+    summaries = []
+    for module in args.modules:
+        summary = summarize(module, measure_import(module, args.runs), args.top)
+        summaries.append(summary)
+        print(f"{module}: {summary['total_ms']:.1f} ms")
+        for dependency in summary["slowest"]:
+            print(f"    {dependency['module']}: {dependency['ms']:.1f} ms")
+        if summary["deferred_imported"]:
+            print(f"    imports deferred modules: {', '.join(summary['deferred_imported'])}")
+
+    if args.json_fp is not None:
+        with open(args.json_fp, 'w') as file:
+            json.dump(summaries, file, indent=4)
+
+    offenders = [summary["module"] for summary in summaries
+                 if summary["deferred_imported"] and summary["module"] not in LLM_MODULES]
+    if args.check_deferred and offenders:
+        sys.exit(f"Deferred LLM dependencies imported by: {', '.join(offenders)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import collections
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+
+PROFILE_MODES = ("cprofile", "sample")
+DEFAULT_SAMPLE_INTERVAL = 0.001
+
+
+class _NullPhase:
+    """
+    The phase of a disabled timer, a shared context manager that does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class NullTimer:
+    """
+    A disabled timer.  Every method does nothing, so instrumented code costs one method call per phase.
+    """
+
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def game(self, game_id):
+        return self
+
+    def next_turn(self):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+class _Phase:
+    """
+    A timed phase of a PhaseTimer or GameTimer.  Time spent in nested phases is not counted twice.
+    """
+
+    __slots__ = ("timer", "name", "start", "nested")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.nested = 0.0
+        self.timer._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        stack = self.timer._stack
+        stack.pop()
+        if stack:
+            stack[-1].nested += elapsed
+        self.timer._record(self.name, elapsed - self.nested)
+        return False
+
+
+class PhaseTimer:
+    """
+    Times the phases of the games of a run: loading, filtering, guess selection, judging, prompt building and
+    LLM round trips.
+
+    The generators time their phases with `with self.timer.phase(name):`.  A phase records its own time, without
+    the time of the phases nested in it, so the phases of a game add up to the time spent in them.  The timer
+    of a run sums the phases over all games and hands out a GameTimer per game with game(), which also keeps
+    the phases of every turn of the game.
+
+    Attributes:
+        totals (dict): Maps a phase name to its [count, seconds] over all games.
+        games (list): The phases of every timed game, see GameTimer.record.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.totals = {}
+        self.games = []
+        self._stack = []
+        self._lock = threading.Lock()
+
+    def phase(self, name):
+        """
+        Returns a context manager timing a phase outside of any game, e.g. loading the word list.
+
+        Args:
+            name (str): The phase name.
+
+        Returns:
+            context manager: Times the phase.
+        """
+        return _Phase(self, name)
+
+    def game(self, game_id):
+        """
+        Returns the timer of a new game.
+
+        Args:
+            game_id (str): The ID of the game.
+
+        Returns:
+            GameTimer: The timer of the game.
+        """
+        return GameTimer(self, game_id)
+
+    def next_turn(self):
+        pass
+
+    def _record(self, name, seconds):
+        with self._lock:
+            total = self.totals.get(name)
+            if total is None:
+                self.totals[name] = [1, seconds]
+            else:
+                total[0] += 1
+                total[1] += seconds
+
+    def _add_game(self, record):
+        with self._lock:
+            self.games.append(record)
+
+    def summary(self):
+        """
+        Summarizes the phases over all games.
+
+        Returns:
+            dict: Maps a phase name to its count, total seconds and mean microseconds, slowest phase first.
+        """
+        with self._lock:
+            totals = sorted(self.totals.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            name: {"count": count, "total_s": seconds, "mean_us": seconds / count * 1e6}
+            for name, (count, seconds) in totals
+        }
+
+    def write_json(self, fp):
+        """
+        Writes the summary and the phases of every game and turn to a JSON file.
+
+        Args:
+            fp (str): The file path.
+        """
+        with open(fp, 'w') as file:
+            json.dump({"summary": self.summary(), "games": self.games}, file, indent=4)
+
+
+class GameTimer:
+    """
+    The timer of one game, created by PhaseTimer.game.  It adds its phases to the totals of the run and keeps
+    them per game and per turn.
+
+    Attributes:
+        record (dict): The game ID, the seconds of every phase of the game and of every turn.
+    """
+
+    enabled = True
+
+    def __init__(self, run_timer, game_id):
+        self.run_timer = run_timer
+        self.record = {"game": game_id, "phases": {}, "turns": [{}]}
+        self._stack = []
+        self._added = False
+
+    def phase(self, name):
+        """
+        Returns a context manager timing a phase of the current turn.
+
+        Args:
+            name (str): The phase name.
+
+        Returns:
+            context manager: Times the phase.
+        """
+        return _Phase(self, name)
+
+    def game(self, game_id):
+        return self.run_timer.game(game_id)
+
+    def next_turn(self):
+        """
+        Starts the next turn of the game.
+        """
+        if self.record["turns"][-1]:
+            self.record["turns"].append({})
+
+    def _record(self, name, seconds):
+        if not self._added:
+            # games whose generator was reset but never played are left out
+            self._added = True
+            self.run_timer._add_game(self.record)
+        phases = self.record["phases"]
+        phases[name] = phases.get(name, 0.0) + seconds
+        turn = self.record["turns"][-1]
+        turn[name] = turn.get(name, 0.0) + seconds
+        self.run_timer._record(name, seconds)
+
+
+class _StackSampler:
+    """
+    Samples the call stack of a thread from a background thread, counting the stacks in the folded format
+    of flame graph tools.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class GameProfiler:
+    """
+    Profiles games one at a time and writes a profile per game.
+
+    In "cprofile" mode every game is run under cProfile and its statistics are written to GAME.prof, which
+    pstats, snakeviz or flameprof read.  In "sample" mode the stack of the playing thread is sampled every
+    interval seconds and the counts are written to GAME.folded, one "frame;frame;frame count" line per stack,
+    the input of flamegraph.pl and speedscope.
+
+    Attributes:
+        out_dir (str): The directory of the profiles.
+        mode (str): "cprofile" or "sample".
+        interval (float): The seconds between two samples in "sample" mode.
+    """
+
+    def __init__(self, out_dir, mode="cprofile", interval=DEFAULT_SAMPLE_INTERVAL):
+        """
+        Initializes the GameProfiler and creates the profile directory.
+
+        Args:
+            out_dir (str): The directory of the profiles.
+            mode (str, optional): "cprofile" or "sample". Defaults to "cprofile".
+            interval (float, optional): The seconds between two samples. Defaults to DEFAULT_SAMPLE_INTERVAL.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+        self.out_dir = out_dir
+        self.mode = mode
+        self.interval = interval
+        os.makedirs(out_dir, exist_ok=True)
+
+    @contextlib.contextmanager
+    def game(self, name):
+        """
+        Profiles the code run in the context and writes its profile.
+
+        Args:
+            name (str): The file name of the profile without the extension, e.g. "00012_cigar".
+
+        Yields:
+            None
+        """
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                profile.dump_stats(os.path.join(self.out_dir, f"{name}.prof"))
+        else:
+            sampler = _StackSampler(threading.get_ident(), self.interval)
+            sampler.start()
+            try:
+                yield
+            finally:
+                sampler.stop()
+                with open(os.path.join(self.out_dir, f"{name}.folded"), 'w') as file:
+                    for stack, count in sampler.stacks.most_common():
+                        file.write(f"{stack} {count}\n")
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+class PromptCache:
+    """
+    A persistent prompt to response cache for chat completions, stored in a SQLite file.
+
+    Entries are keyed by a hash of the model, the temperature and the messages of the request.  When the
+    cache grows beyond max_entries entries or max_bytes bytes of responses, the least recently used entries
+    are evicted.  The cache can be shared by several interfaces and threads of one process.
+
+    Attributes:
+        fp (str): The file path to the SQLite database.
+        max_entries (int): The maximum number of entries, or None for no limit.
+        max_bytes (int): The maximum total size of the cached responses in bytes, or None for no limit.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups not found in the cache.
+    """
+
+    def __init__(self, fp, max_entries=None, max_bytes=None):
+        """
+        Opens the cache file, creating it if needed.
+
+        Args:
+            fp (str): The file path to the SQLite database, or ":memory:" for a cache that is not persisted.
+            max_entries (int, optional): The maximum number of entries. Defaults to None.
+            max_bytes (int, optional): The maximum total size of the cached responses in bytes. Defaults to None.
+        """
+        self.fp = fp
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(fp, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+
+    @staticmethod
+    def key(model, temperature, messages):
+        """
+        Computes the cache key of a chat completions request.
+
+        Args:
+            model (str): The model of the request.
+            temperature (float): The temperature of the request.
+            messages (list): The messages of the request.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the request.
+        """
+        request = json.dumps([model, temperature, messages], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(request.encode()).hexdigest()
+
+    def get(self, key):
+        """
+        Looks up a response and marks it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            str or None: The cached response, or None on a miss.
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._connection.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key, response):
+        """
+        Stores a response and evicts the least recently used entries beyond the limits.
+
+        Args:
+            key (str): The cache key.
+            response (str): The response to cache.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, len(response.encode()), time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        """
+        Deletes the least recently used entries until the cache is within its limits.
+        """
+        if self.max_entries is not None:
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+        if self.max_bytes is not None:
+            total_bytes = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total_bytes > self.max_bytes:
+                evicted = []
+                for key, size in self._connection.execute("SELECT key, size FROM responses ORDER BY last_access"):
+                    if total_bytes <= self.max_bytes:
+                        break
+                    evicted.append((key,))
+                    total_bytes -= size
+                self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def stats(self):
+        """
+        Returns the hit and miss counters and the size of the cache.
+
+        Returns:
+            dict: The "hits", "misses", "entries" and "bytes" of the cache.
+        """
+        with self._lock:
+            entries, total_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total_bytes}
+
+    def close(self):
+        """
+        Closes the cache file.
+        """
+        self._connection.close()
@@ -1,20 +1,28 @@
 import argparse
 import json
+import logging
 import random
 
 from wordle_solver import WordListGeneratorLLM, OpenAIInterface, ExperimentRecorder
 from wordle_judge import WordleJudge
+from openai_clients import read_api_key, shared_client
+from solver_logging import add_logging_arguments, configure_logging_from_args, get_logger, log_event
 
 CANIDATE_FIRST_WORD_LIST = ["adieu", "trace", "crate",]
 
+logger = get_logger(__name__)
+
 def main():
     parser = argparse.ArgumentParser(description='Process some inputs.')
     parser.add_argument('word', type=str, help='A 5-letter word')
     parser.add_argument('--api', action='store_true', help='A boolean flag for api')
     parser.add_argument('--exp_fp', type=str, default=None, help='File path to record experiment results')
     parser.add_argument('--first_word', type=str, default=None, help='The first word to use')
+    parser.add_argument('--engine', type=str, default='regex', choices=['regex', 'numpy', 'bitset'], help='The candidate filtering engine')
+    add_logging_arguments(parser)
 
     args = parser.parse_args()
+    configure_logging_from_args(args)
 
     # Access the arguments
     word = args.word
@@ -26,7 +34,8 @@ def main():
     if len(word) != 5:
         raise argparse.ArgumentTypeError("Word must be 5 letters long")
 
-    print(f"Word: {word}, API: {api}, experiment_fp: {experiment_fp}, First Word: {first_word}")
+    log_event(logger, logging.INFO, "start", "Word: %s, API: %s, experiment_fp: %s, First Word: %s", word, api, experiment_fp,
+              first_word, word=word, api=api, experiment_fp=experiment_fp, first_word=first_word)
 
     # Create a WordleJudge object
     wordle_game = WordleJudge(word)
@@ -36,13 +45,12 @@ def main():
         experiment_recorder = ExperimentRecorder(experiment_fp)
 
     # Create a WordList object
-    wordle_virtual_assistant = WordListGeneratorLLM("data/five-letter-words.txt")
+    wordle_virtual_assistant = WordListGeneratorLLM("data/five-letter-words.txt", engine=args.engine)
     wordle_virtual_assistant.load()
 
     # Create an OpenAIInterface object
-    with open("/openai/api_key.json") as f:
-        api_key = json.load(f)
-    openai_interface = OpenAIInterface(api_key["key"])
+    api_key = read_api_key("/openai/api_key.json")
+    openai_interface = OpenAIInterface(api_key, client=shared_client(api_key))
 
     # create initial guess
     if first_word:
@@ -52,43 +60,41 @@ def main():
         
     result = False
     attemp_count = 0
-    llm_response_count = 0
     while not isinstance(result, bool) or not result:
         attemp_count += 1
         if attemp_count < 7:
-            print(f'\nAttempt {attemp_count} guess is {word}')
+            log_event(logger, logging.INFO, "attempt", 'Attempt %d guess is %s', attemp_count, word,
+                      attempt=attemp_count, word=word)
         else:
-            print(f'\n>>>>Exceed wordle game limit: attempt {attemp_count} guess is {word}')
+            log_event(logger, logging.INFO, "attempt", 'Exceed wordle game limit: attempt %d guess is %s', attemp_count,
+                      word, attempt=attemp_count, word=word, failed=True)
 
         if attemp_count > 20:
-            print(f'\n>>>>Exceed max attempt: attempt {attemp_count} aborting...')
+            log_event(logger, logging.WARNING, "max_attempts", 'Exceed max attempt: attempt %d aborting...', attemp_count,
+                      attempt=attemp_count)
             break
 
         result = wordle_game.judge_guess(word)
-        print(f'The result is {result}')
+        log_event(logger, logging.INFO, "result", 'The result is %s', result, result=result)
         if not isinstance(result, bool):
             # Update the word list
-            wordle_virtual_assistant.guessed_word = word
-            wordle_virtual_assistant.update_state(result)
+            wordle_virtual_assistant.update_state(result, word)
             wordle_virtual_assistant.print_state()
             
             generated_prompt = wordle_virtual_assistant.generate_llm_prompt()
             if api:
                 llm_response = json.loads(openai_interface.chat(generated_prompt))
-                llm_response_count += 1
-                with open(f'llm_trace_data/llm_response_{llm_response_count:03}.txt', 'w') as f:
-                    pretty_json = json.dumps(llm_response, indent=4)
-                    f.write(pretty_json)
+                wordle_virtual_assistant.record_llm_response(llm_response)
 
                 word = llm_response["recommendation"]
             else:
                 print("\nCopy and paste the prompt file to OpenAI Playground and enter the recommendation")
                 word = input("Enter a word: ")
             if word is None:
-                print("\n>>>>No candidate words left")
+                log_event(logger, logging.WARNING, "no_candidates", "No candidate words left")
                 break
     
-    print(f"global_state: {wordle_virtual_assistant.global_state}")
+    wordle_virtual_assistant.print_state()
     if experiment_fp:
         experiment_recorder.record("llm", initial_word, word, attemp_count)
         experiment_recorder.close()
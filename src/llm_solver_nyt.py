@@ -1,31 +1,48 @@
 import argparse
 import json
+import logging
 import random
 import sys
 
-from wordle_solver import WordListGeneratorLLM, OpenAIInterface
+from wordle_solver import WordListGeneratorLLM, OpenAIInterface, AsyncOpenAIInterface
+from openai_clients import read_api_key, shared_client
+from solver_logging import add_logging_arguments, configure_logging_from_args, get_logger, log_event
+from speculative_prefetch import DEFAULT_MAX_PREFETCHES, SpeculativePrefetcher, local_suggestion, response_to_result
 
 CANIDATE_FIRST_WORD_LIST = ["trace",]
 
+logger = get_logger(__name__)
+
 def main():
     parser = argparse.ArgumentParser(description='Process some inputs.')
     parser.add_argument('--api', action='store_true', help='A boolean flag for api')
+    parser.add_argument('--speculative', action='store_true',
+                        help='Ask the LLM about the most probable responses while the response is typed, needs --api')
+    parser.add_argument('--max_prefetches', type=int, default=DEFAULT_MAX_PREFETCHES,
+                        help='The most responses prefetched per guess with --speculative')
+    add_logging_arguments(parser)
 
     args = parser.parse_args()
+    if args.speculative and not args.api:
+        parser.error('--speculative needs --api')
+    configure_logging_from_args(args)
 
     # Access the arguments
     api = args.api
 
-    print(f"API: {api}")
+    log_event(logger, logging.INFO, "start", "API: %s", api, api=api)
 
     # Create a WordList object
     wordle_virtual_assistant = WordListGeneratorLLM("data/five-letter-words.txt")
     wordle_virtual_assistant.load()
 
     # Create an OpenAIInterface object
-    with open("/openai/api_key.json") as f:
-        api_key = json.load(f)
-    openai_interface = OpenAIInterface(api_key["key"])
+    api_key = read_api_key("/openai/api_key.json")
+    openai_interface = OpenAIInterface(api_key, client=shared_client(api_key))
+    prefetcher = None
+    if args.speculative:
+        llm_interface = AsyncOpenAIInterface(api_key, client=shared_client(api_key, asynchronous=True))
+        prefetcher = SpeculativePrefetcher(llm_interface, max_prefetches=args.max_prefetches)
 
     # create initial guess
     word = random.choice(CANIDATE_FIRST_WORD_LIST)
@@ -34,16 +51,20 @@ def main():
     while attemp_count < 7:
         attemp_count += 1
         if attemp_count < 7:
-            print(f'\nattempt {attemp_count} word is {word}')
+            log_event(logger, logging.INFO, "attempt", 'attempt %d word is %s', attemp_count, word,
+                      attempt=attemp_count, word=word)
         else:
-            print(f'\n>>>>Failed wordle game: attempt {attemp_count} ')
+            log_event(logger, logging.INFO, "attempt", 'Failed wordle game: attempt %d', attemp_count,
+                      attempt=attemp_count, failed=True)
 
         if attemp_count > 20:
-            print(f'\n>>>>Exceed max attempt: attempt {attemp_count} aborting...')
+            log_event(logger, logging.WARNING, "max_attempts", 'Exceed max attempt: attempt %d aborting...', attemp_count,
+                      attempt=attemp_count)
             break
 
-        # Initialize a dictionary to store the result
-        result = {"correct": [], "present": [], "absent": []}
+        # Ask the LLM about the most probable responses while the user types the actual one
+        if prefetcher is not None:
+            prefetcher.start(wordle_virtual_assistant, word)
 
         # Initialize a variable to control the input loop
         input_ok = "n"
@@ -57,56 +78,64 @@ def main():
 
         # check if the guess is correct
         if wordle_response == "ggggg":
-            print(f'\n>>>>Success wordle game, correctly guessed {word} in {attemp_count} attempts')
+            log_event(logger, logging.INFO, "solved", 'Success wordle game, correctly guessed %s in %d attempts', word,
+                      attemp_count, word=word, num_attempts=attemp_count)
             break
 
-        # Loop over each letter in the word and its corresponding feedback
-        for i, feedback_pair in enumerate(zip(word, wordle_response)):
-            # Unpack the letter and feedback from the pair
-            letter, feedback = feedback_pair
-
-            # If the feedback is "g", the letter is correct and in the correct position
-            if feedback == "g":
-                # Add the position and letter to the "correct" list
-                result["correct"].append((i, letter))
-
-            # If the feedback is "y", the letter is correct but in the wrong position
-            elif feedback == "y":
-                # Add the position and letter to the "present" list
-                result["present"].append((i, letter))
-
-            # If the feedback is ".", the letter is not in the word
-            elif feedback == ".":
-                # Check if the letter is not already in the "correct" or "present" lists
-                if (letter not in [x[1] for x in result["correct"]] and 
-                    letter not in [x[1] for x in result["present"]] and
-                    not wordle_virtual_assistant.is_letter_in_correct(letter) and
-                    not wordle_virtual_assistant.is_letter_in_present(letter)):
-                    # Add the letter to the "absent" list
-                    result["absent"].append(letter)
-            # If the feedback is anything else, it's unknown and we exit the program
-            else:
-                print(f"Unknown feedback: {feedback}")
-                sys.exit(1)
+        # Convert the feedback of each letter to the result, exit the program on unknown feedback
+        try:
+            result = response_to_result(wordle_virtual_assistant, word, wordle_response)
+        except ValueError as e:
+            log_event(logger, logging.ERROR, "unknown_feedback", "%s", e, response=wordle_response)
+            sys.exit(1)
 
-        # Print the result
-        print(f'The result is {result}')
+        # Keep the prefetch of the entered response, if any, and cancel the others
+        prefetched = None if prefetcher is None else prefetcher.take(wordle_response)
 
-        wordle_virtual_assistant.guessed_word = word
+        # Log the result
+        log_event(logger, logging.INFO, "result", 'The result is %s', result, result=result)
 
         # Update the state of the word list with the result of the last guess
-        wordle_virtual_assistant.update_state(result)
+        wordle_virtual_assistant.update_state(result, word)
 
-        # Print the current state of the word list
+        # Log the current state of the word list
         wordle_virtual_assistant.print_state()
 
-        # Generate a new prompt for the language model
-        generated_prompt = wordle_virtual_assistant.generate_llm_prompt()
+        # On a prefetch hit continue from the fork, which already filtered the words and asked the LLM
+        llm_response = None
+        if prefetched is not None:
+            if not prefetched.done():
+                # Resolve the state on the bitset index for an instant suggestion, the fork filters the words meanwhile
+                index = wordle_virtual_assistant.bitset_index
+                candidate_words = index.words_for(index.candidate_bits(wordle_virtual_assistant.global_state))
+                print(f"Local suggestion: '{local_suggestion(candidate_words)}' (waiting for the LLM)")
+            try:
+                fork, generated_prompt, llm_response = prefetched.result()
+            except Exception as e:
+                log_event(logger, logging.WARNING, "prefetch_error", "Prefetch failed, asking again: %s", e, error=repr(e))
+                prefetched = None
+            else:
+                previous_words = wordle_virtual_assistant.candidate_words
+                wordle_virtual_assistant.adopt(fork)
+                if generated_prompt is not None:
+                    wordle_virtual_assistant.dump_prompt(generated_prompt, previous_words)
+
+        # Otherwise generate a new prompt for the language model
+        if prefetched is None:
+            generated_prompt = wordle_virtual_assistant.generate_llm_prompt()
 
         # If the API flag is set, use the OpenAI API to get a response
         if api:
-            # Send the generated prompt to the OpenAI API and parse the response
-            llm_response = json.loads(openai_interface.chat(generated_prompt))
+            if generated_prompt is None:
+                log_event(logger, logging.WARNING, "no_candidates", "No candidate words left aborting...")
+                break
+
+            if llm_response is None:
+                # Show a local suggestion until the LLM answer lands
+                print(f"Local suggestion: '{local_suggestion(wordle_virtual_assistant.candidate_words)}' (waiting for the LLM)")
+
+                # Send the generated prompt to the OpenAI API and parse the response
+                llm_response = json.loads(openai_interface.chat(generated_prompt))
             llm_response_count += 1
             with open(f'llm_trace_data/llm_response_{llm_response_count:03}.txt', 'w') as f:
                 pretty_json = json.dumps(llm_response, indent=4)
@@ -141,11 +170,14 @@ def main():
 
         # If no word was entered or recommended, abort the game
         if word is None:
-            print("\n>>>>No candidate words left aborting...")
+            log_event(logger, logging.WARNING, "no_candidates", "No candidate words left aborting...")
             break
 
-    # Print the final state of the word list
-    print(f"global_state: {wordle_virtual_assistant.global_state}")    
+    # Log the final state of the word list
+    wordle_virtual_assistant.print_state()
+    if prefetcher is not None:
+        prefetcher.close()
+        log_event(logger, logging.INFO, "prefetch", "Prefetches: %s", prefetcher.stats, **prefetcher.stats)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,274 @@
+import functools
+import json
+import threading
+import time
+
+import httpx
+
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+
+# httpcore trace events of opening a new connection
+_CONNECT_EVENTS = ("connection.connect_tcp", "connection.connect_unix_socket", "connection.start_tls")
+
+
+class PoolMetrics:
+    """
+    Counters of the requests sent through a pooled client, for telling whether the pool is the bottleneck.
+
+    Attributes:
+        requests (int): The number of requests completed.
+        in_flight (int): The number of requests being sent.
+        max_in_flight (int): The highest number of requests in flight at once.
+        connections_opened (int): The number of requests that opened a new connection.
+        connections_reused (int): The number of requests sent on a kept-alive connection.
+        wait_time (float): Total seconds requests waited for a connection from the pool, excluding connecting.
+        connect_time (float): Total seconds spent opening connections, including TLS handshakes.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.wait_time = 0.0
+        self.connect_time = 0.0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _finish(self, trace):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            if trace.sending is None:
+                return
+            if trace.connected:
+                self.connections_opened += 1
+            else:
+                self.connections_reused += 1
+            self.connect_time += trace.connect_time
+            self.wait_time += max(0.0, trace.sending - trace.started - trace.connect_time)
+
+    def snapshot(self):
+        """
+        Returns the counters and the mean pool wait per request.
+
+        Returns:
+            dict: The counters by attribute name, and "mean_wait_time".
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "connections_opened": self.connections_opened,
+                "connections_reused": self.connections_reused,
+                "wait_time": self.wait_time,
+                "connect_time": self.connect_time,
+                "mean_wait_time": self.wait_time / self.requests if self.requests else 0.0,
+            }
+
+
+class _RequestTrace:
+    """
+    An httpcore trace extension timing the connection setup of one request.
+    """
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.started = time.perf_counter()
+        self.sending = None
+        self.connected = False
+        self.connect_time = 0.0
+        self._connect_started = None
+
+    def _record(self, event_name):
+        now = time.perf_counter()
+        step, _, phase = event_name.rpartition(".")
+        if step in _CONNECT_EVENTS:
+            if phase == "started":
+                self.connected = True
+                self._connect_started = now
+            elif self._connect_started is not None:
+                self.connect_time += now - self._connect_started
+                self._connect_started = None
+        elif step.endswith("send_request_headers") and phase == "started" and self.sending is None:
+            self.sending = now
+
+    def __call__(self, event_name, info):
+        self._record(event_name)
+        if self.parent is not None:
+            self.parent(event_name, info)
+
+    async def trace_async(self, event_name, info):
+        self._record(event_name)
+        if self.parent is not None:
+            await self.parent(event_name, info)
+
+
+class _MeteredTransport(httpx.BaseTransport):
+    """
+    Wraps a pooled transport and records every request in a PoolMetrics.
+    """
+
+    def __init__(self, transport, metrics):
+        self.transport = transport
+        self.metrics = metrics
+
+    def handle_request(self, request):
+        trace = _RequestTrace(request.extensions.get("trace"))
+        request.extensions["trace"] = trace
+        self.metrics._start()
+        try:
+            return self.transport.handle_request(request)
+        finally:
+            self.metrics._finish(trace)
+
+    def close(self):
+        self.transport.close()
+
+
+class _AsyncMeteredTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a pooled asyncio transport and records every request in a PoolMetrics.
+    """
+
+    def __init__(self, transport, metrics):
+        self.transport = transport
+        self.metrics = metrics
+
+    async def handle_async_request(self, request):
+        trace = _RequestTrace(request.extensions.get("trace"))
+        request.extensions["trace"] = trace.trace_async
+        self.metrics._start()
+        try:
+            return await self.transport.handle_async_request(request)
+        finally:
+            self.metrics._finish(trace)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class ClientRegistry:
+    """
+    Hands out one pooled OpenAI client per configuration, so every interface and game of a run shares its
+    kept-alive connections instead of opening new ones.
+
+    Clients are keyed by API key, base URL, flavor and pool options.  An AsyncOpenAI client is bound to the
+    event loop it is first used on, so use asynchronous clients within one event loop.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def client(self, api_key, base_url=None, asynchronous=False, max_connections=DEFAULT_MAX_CONNECTIONS,
+               timeout=DEFAULT_TIMEOUT, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+               keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY):
+        """
+        Returns the pooled client of a configuration, creating it on first use.
+
+        Args:
+            api_key (str): API key string
+            base_url (str, optional): The base URL of an OpenAI-compatible API. Defaults to the OpenAI API.
+            asynchronous (bool, optional): Returns an AsyncOpenAI client instead of an OpenAI client. Defaults to False.
+            max_connections (int, optional): The size of the connection pool. Defaults to DEFAULT_MAX_CONNECTIONS.
+            timeout (float, optional): Seconds to wait for a response. Defaults to DEFAULT_TIMEOUT.
+            connect_timeout (float, optional): Seconds to wait for a connection. Defaults to DEFAULT_CONNECT_TIMEOUT.
+            keepalive_expiry (float, optional): Seconds an idle connection is kept open. Defaults to DEFAULT_KEEPALIVE_EXPIRY.
+
+        Returns:
+            OpenAI or AsyncOpenAI: The shared client.
+        """
+        key = (api_key, base_url, asynchronous, max_connections, timeout, connect_timeout, keepalive_expiry)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+                limits = httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_expiry,
+                )
+                timeouts = httpx.Timeout(timeout, connect=connect_timeout)
+                metrics = PoolMetrics()
+                if asynchronous:
+                    transport = _AsyncMeteredTransport(httpx.AsyncHTTPTransport(limits=limits), metrics)
+                    http_client = DefaultAsyncHttpxClient(transport=transport, timeout=timeouts)
+                    client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeouts, http_client=http_client)
+                else:
+                    transport = _MeteredTransport(httpx.HTTPTransport(limits=limits), metrics)
+                    http_client = DefaultHttpxClient(transport=transport, timeout=timeouts)
+                    client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeouts, http_client=http_client)
+                self._clients[key] = client
+                self._metrics[id(client)] = metrics
+        return client
+
+    def metrics(self, client):
+        """
+        Returns the pool metrics of a client of this registry.
+
+        Args:
+            client (OpenAI or AsyncOpenAI): A client returned by this registry.
+
+        Returns:
+            PoolMetrics: The metrics of the client's pool.
+
+        Raises:
+            KeyError: If the client was not created by this registry.
+        """
+        return self._metrics[id(client)]
+
+    def close(self):
+        """
+        Closes the synchronous clients and forgets every client.  Asynchronous clients are closed with their event loop.
+        """
+        with self._lock:
+            for (_, _, asynchronous, *_), client in self._clients.items():
+                if not asynchronous:
+                    client.close()
+            self._clients.clear()
+            self._metrics.clear()
+
+
+# the registry shared by the whole process
+_REGISTRY = ClientRegistry()
+
+
+def shared_client(api_key, base_url=None, asynchronous=False, **pool_options):
+    """
+    Returns the process-wide pooled client of a configuration, see ClientRegistry.client.
+    """
+    return _REGISTRY.client(api_key, base_url, asynchronous, **pool_options)
+
+
+def pool_metrics(client):
+    """
+    Returns the pool metrics of a process-wide client, see ClientRegistry.metrics.
+    """
+    return _REGISTRY.metrics(client)
+
+
+@functools.lru_cache(maxsize=None)
+def read_api_key(api_key_fp):
+    """
+    Reads the API key from a JSON file with a "key" entry, once per process.
+
+    Args:
+        api_key_fp (str): The file path to the JSON file.
+
+    Returns:
+        str: The API key.
+    """
+    with open(api_key_fp) as f:
+        return json.load(f)["key"]
@@ -0,0 +1,218 @@
+import argparse
+import os
+import threading
+
+import numpy as np
+
+from feedback_patterns import ALL_CORRECT_PATTERN, file_checksum, judge_patterns, pattern_to_result, result_to_pattern
+from word_dictionary import WordDictionary
+from word_matrix import constraint_mask, encode_words
+
+OPENING_BOOK_SUFFIX = ".openings.npz"
+# the CANIDATE_FIRST_WORD_LIST of the solver scripts
+DEFAULT_OPENERS = ["adieu", "trace", "crate"]
+
+# opening books shared by every generator in the process, keyed by word list file and its modification time
+_BOOK_CACHE = {}
+_BOOK_CACHE_LOCK = threading.Lock()
+
+
+def opening_book_path(words_fp):
+    """
+    Returns the path of the opening book of a word list file, next to the file.
+
+    Args:
+        words_fp (str): The file path to the word list.
+
+    Returns:
+        str: The book file path, e.g. data/five-letter-words.openings.npz for data/five-letter-words.txt.
+    """
+    return os.path.splitext(words_fp)[0] + OPENING_BOOK_SUFFIX
+
+
+def _state_of(result):
+    return {key: set(result.get(key, ())) for key in ("present", "correct", "absent")}
+
+
+class OpeningBook:
+    """
+    The candidate words and the entropy solver's next guess after every feedback to a set of openers.
+
+    For every opener and every feedback pattern the opener can receive against a word of the word list, the
+    book holds the positions of the words that remain candidates and the guess WordListGeneratorEntropy
+    recommends for them.  The candidates are selected with constraint_mask, which has the semantics of every
+    filtering engine, so the book replaces the filter pass and the scoring of the second turn with a lookup.
+
+    Attributes:
+        words_fp (str): The file path to the word list.
+        checksum (str): The SHA-256 checksum of the word list the book was built for.
+        entries (dict): Maps (opener, pattern) to the (start, stop) slice of indices and the next guess.
+        indices (numpy.ndarray): The int32 dictionary positions of the candidates of every entry.
+    """
+
+    def __init__(self, words_fp, checksum, entries, indices):
+        """
+        Initializes the OpeningBook with its entries.
+
+        Args:
+            words_fp (str): The file path to the word list.
+            checksum (str): The SHA-256 checksum of the word list.
+            entries (dict): Maps (opener, pattern) to ((start, stop), next guess or None).
+            indices (numpy.ndarray): The int32 dictionary positions of the candidates of every entry.
+        """
+        self.words_fp = words_fp
+        self.checksum = checksum
+        self.entries = entries
+        self.indices = indices
+
+    @property
+    def openers(self):
+        """
+        list: The openers of the book.
+        """
+        return sorted({opener for opener, _ in self.entries})
+
+    def lookup(self, opener, state):
+        """
+        Looks up the candidates left by a game state that is exactly the feedback to an opener.
+
+        Args:
+            opener (str): The guessed word.
+            state (dict): The "present", "correct" and "absent" constraints of the game.
+
+        Returns:
+            tuple or None: The int32 dictionary positions of the candidate words and the recommended next guess,
+                or None if the opener or its feedback is not in the book, or the state holds other constraints.
+        """
+        pattern = result_to_pattern(opener, state)
+        entry = self.entries.get((opener, pattern))
+        if entry is None or _state_of(state) != _state_of(pattern_to_result(opener, pattern)):
+            return None
+        (start, stop), next_guess = entry
+        return self.indices[start:stop], next_guess
+
+    def save(self, fp):
+        """
+        Writes the book to a compressed .npz file.
+
+        Args:
+            fp (str): The file path.
+        """
+        keys = sorted(self.entries)
+        slices = np.array([self.entries[key][0] for key in keys], dtype=np.int32).reshape(-1, 2)
+        tmp_fp = f"{fp}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            tmp_fp,
+            checksum=np.array(self.checksum),
+            openers=np.array([opener for opener, _ in keys]),
+            patterns=np.array([pattern for _, pattern in keys], dtype=np.uint8),
+            slices=slices,
+            next_guesses=np.array([self.entries[key][1] or "" for key in keys]),
+            indices=self.indices,
+        )
+        os.replace(tmp_fp, fp)
+
+    @classmethod
+    def load(cls, words_fp, fp=None):
+        """
+        Reads the book of a word list file written by save.
+
+        Args:
+            words_fp (str): The file path to the word list.
+            fp (str, optional): The book file path. Defaults to opening_book_path(words_fp).
+
+        Returns:
+            OpeningBook: The book.
+        """
+        with np.load(fp or opening_book_path(words_fp), allow_pickle=False) as data:
+            entries = {
+                (opener, pattern): ((start, stop), next_guess or None)
+                for opener, pattern, (start, stop), next_guess in zip(
+                    data["openers"].tolist(), data["patterns"].tolist(), data["slices"].tolist(),
+                    data["next_guesses"].tolist(),
+                )
+            }
+            return cls(words_fp, str(data["checksum"]), entries, data["indices"])
+
+    @classmethod
+    def for_file(cls, words_fp):
+        """
+        Returns the opening book of a word list file if one was built for its current contents.
+
+        The book is cached for the process and keyed by the file path, modification time and size, like the
+        WordDictionary of the file, and by the modification time of the book.
+
+        Args:
+            words_fp (str): The file path to the word list.
+
+        Returns:
+            OpeningBook or None: The shared book, or None if there is no book or it was built for other contents.
+        """
+        stat = os.stat(words_fp)
+        try:
+            book_mtime_ns = os.stat(opening_book_path(words_fp)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        key = (os.path.abspath(words_fp), stat.st_mtime_ns, stat.st_size, book_mtime_ns)
+        with _BOOK_CACHE_LOCK:
+            if key not in _BOOK_CACHE:
+                book = cls.load(words_fp)
+                _BOOK_CACHE[key] = book if book.checksum == file_checksum(words_fp) else None
+            return _BOOK_CACHE[key]
+
+
+def build_opening_book(words_fp, openers=DEFAULT_OPENERS):
+    """
+    Builds the opening book of a word list file for a set of openers.
+
+    The next guesses are chosen by a WordListGeneratorEntropy of the word list, so they are the guesses the
+    entropy solver would score on the second turn.  Building scores every guess against every word once per
+    opener; a cached pattern matrix of the word list (see feedback_patterns.py) makes it much faster.
+
+    Args:
+        words_fp (str): The file path to the word list.
+        openers (list, optional): The first guesses. Defaults to DEFAULT_OPENERS.
+
+    Returns:
+        OpeningBook: The book.
+    """
+    # wordle_solver loads the opening books, so it is imported here rather than at the top of the module
+    from wordle_solver import WordListGeneratorEntropy
+
+    dictionary = WordDictionary.for_file(words_fp)
+    wordle_virtual_assistant = WordListGeneratorEntropy(words_fp)
+    wordle_virtual_assistant.load()
+
+    entries = {}
+    indices = []
+    size = 0
+    for opener in openers:
+        # the feedback the opener can receive against any word of the list
+        for pattern in np.unique(judge_patterns(encode_words([opener]), dictionary.matrix)[0]).tolist():
+            if pattern == ALL_CORRECT_PATTERN:
+                continue
+            bucket = np.flatnonzero(constraint_mask(dictionary.matrix, pattern_to_result(opener, pattern)))
+            wordle_virtual_assistant.candidate_words = dictionary.words_for(bucket)
+            entries[(opener, pattern)] = ((size, size + len(bucket)), wordle_virtual_assistant.best_guess())
+            indices.append(bucket.astype(np.int32))
+            size += len(bucket)
+
+    return OpeningBook(words_fp, file_checksum(words_fp), entries, np.concatenate(indices))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the opening book of a word list for the solvers.')
+    parser.add_argument('words_fp', type=str, nargs='?', default='data/five-letter-words.txt', help='File path to the word list')
+    parser.add_argument('--openers', type=str, nargs='+', default=DEFAULT_OPENERS, help='The first guesses to book')
+
+    args = parser.parse_args()
+
+    book = build_opening_book(args.words_fp, [opener.lower() for opener in args.openers])
+    book_fp = opening_book_path(args.words_fp)
+    book.save(book_fp)
+    print(f"Wrote {len(book.entries)} feedback patterns of {len(book.openers)} openers to {book_fp}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import functools
+import math
+import re
+
+import numpy as np
+
+from feedback_patterns import NUM_PATTERNS, compute_patterns
+from word_matrix import encode_words
+
+RANKINGS = ("coverage", "answers", "partition")
+DEFAULT_RANKING = "coverage"
+DEFAULT_ENCODING = "cl100k_base"
+# the most candidates scored against each other by the "partition" ranking, the rest are ranked by coverage
+PARTITION_LIMIT = 2048
+
+# splits text like the pre-tokenizer of the GPT encodings: contractions, words with their leading space, numbers
+# of up to three digits, runs of punctuation and whitespace
+_PIECE_PATTERN = re.compile(r"'(?:s|t|re|ve|m|ll|d)| ?[A-Za-z]+| ?\d{1,3}| ?[^\sA-Za-z\d]+|\s+(?!\S)|\s+")
+# the average characters per token of English words in the GPT encodings
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """
+    Estimates the number of tokens of a text without a tokenizer.
+
+    The text is split like the pre-tokenizer of the GPT encodings and every piece counts one token per four
+    characters, rounded up.  Common long words are a single token in those encodings, so the estimate errs high
+    and a word list that fits a budget by the estimate also fits it with the tokenizer.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    return sum(math.ceil(len(piece.strip()) / _CHARS_PER_TOKEN) or 1 for piece in _PIECE_PATTERN.findall(text))
+
+
+@functools.lru_cache(maxsize=None)
+def token_counter(encoding_name=DEFAULT_ENCODING):
+    """
+    Returns a function counting the tokens of a text with tiktoken, or estimate_tokens if tiktoken is not installed.
+
+    tiktoken is an optional dependency and not in requirements.txt; the encoding is loaded once per process.
+
+    Args:
+        encoding_name (str, optional): The tiktoken encoding. Defaults to DEFAULT_ENCODING.
+
+    Returns:
+        callable: Maps a text to its number of tokens.
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding(encoding_name)
+    except Exception:  # not installed, or the encoding cannot be downloaded
+        return estimate_tokens
+    return lambda text: len(encoding.encode(text))
+
+
+def _coverage_scores(matrix):
+    # the number of candidates sharing each distinct letter of a word
+    presence = np.zeros((len(matrix), 26), dtype=bool)
+    presence[np.arange(len(matrix))[:, None], matrix] = True
+    return presence @ presence.sum(axis=0)
+
+
+def _expected_partition_sizes(matrix):
+    # the expected number of candidates left after guessing each word, if every candidate is equally likely
+    patterns = compute_patterns(matrix, matrix)
+    offsets = (np.arange(len(matrix)) * NUM_PATTERNS)[:, None]
+    counts = np.bincount((patterns + offsets).ravel(), minlength=len(matrix) * NUM_PATTERNS)
+    counts = counts.reshape(len(matrix), NUM_PATTERNS).astype(np.float64)
+    return (counts ** 2).sum(axis=1) / len(matrix)
+
+
+def rank_candidates(candidate_words, rank_by=DEFAULT_RANKING, answer_words=None):
+    """
+    Orders candidate words from the most to the least valuable to show the LLM.
+
+    "coverage" ranks words by how many candidates share their distinct letters, so the top words test the most
+    common letters.  "answers" puts the words of the answer list first, each group ranked by coverage.
+    "partition" ranks words by the expected number of candidates left after guessing them, smallest first; only the
+    PARTITION_LIMIT words with the best coverage are scored, since every pair of candidates is compared, and ties
+    are broken by coverage.  Other ties keep alphabetical order.
+
+    Args:
+        candidate_words (list): The candidate words, five lowercase letters each.
+        rank_by (str, optional): "coverage", "answers" or "partition". Defaults to DEFAULT_RANKING.
+        answer_words (set, optional): The words of the answer list, used by "answers". Defaults to None.
+
+    Returns:
+        list: The candidate words, the most valuable first.
+
+    Raises:
+        ValueError: If the ranking is unknown.
+    """
+    if rank_by not in RANKINGS:
+        raise ValueError(f"Unknown ranking '{rank_by}', expected one of {RANKINGS}")
+    if len(candidate_words) == 0:
+        return []
+
+    words = sorted(candidate_words)
+    matrix = encode_words(words)
+    coverage = _coverage_scores(matrix)
+    # lexsort sorts by the last key first and is stable, so ties keep alphabetical order
+    order = np.lexsort((-coverage,))
+    if rank_by == "answers":
+        in_answers = np.fromiter((word in (answer_words or ()) for word in words), dtype=bool, count=len(words))
+        order = np.lexsort((-coverage, ~in_answers))
+    elif rank_by == "partition":
+        top, rest = order[:PARTITION_LIMIT], order[PARTITION_LIMIT:]
+        top = top[np.argsort(_expected_partition_sizes(matrix[top]), kind="stable")]
+        order = np.concatenate([top, rest])
+    return [words[i] for i in order.tolist()]
+
+
+def fill_word_list(prompt_header, ranked_words, token_budget, count_tokens=None):
+    """
+    Returns the longest prefix of the ranked words that fits the token budget after the prompt header.
+
+    Words are added one per line while their estimated tokens fit, then words are dropped until the whole prompt
+    fits, since tokens may merge across lines.  At least one word is kept, even if the header alone exceeds
+    the budget.
+
+    Args:
+        prompt_header (str): The text of the prompt before the word list.
+        ranked_words (list): The candidate words, the most valuable first.
+        token_budget (int): The most tokens of the whole prompt.
+        count_tokens (callable, optional): Maps a text to its number of tokens. Defaults to token_counter().
+
+    Returns:
+        tuple: The selected words and the number of tokens of the prompt with them.
+    """
+    count_tokens = count_tokens or token_counter()
+    if len(ranked_words) == 0:
+        return [], count_tokens(prompt_header)
+
+    used = count_tokens(prompt_header)
+    selected = []
+    for word in ranked_words:
+        word_tokens = count_tokens(("\n" if selected else "") + word)
+        if selected and used + word_tokens > token_budget:
+            break
+        selected.append(word)
+        used += word_tokens
+
+    prompt_tokens = count_tokens(prompt_header + "\n".join(selected))
+    while len(selected) > 1 and prompt_tokens > token_budget:
+        selected.pop()
+        prompt_tokens = count_tokens(prompt_header + "\n".join(selected))
+    return selected, prompt_tokens
@@ -1,20 +1,27 @@
 import argparse
 import json
+import logging
 import random
 
 from wordle_solver import WordListGeneratorRandom, ExperimentRecorder
 from wordle_judge import WordleJudge
+from solver_logging import add_logging_arguments, configure_logging_from_args, get_logger, log_event
 
 CANIDATE_FIRST_WORD_LIST = ["adieu", "trace", "crate",]
 
+logger = get_logger(__name__)
+
 
 def main():
     parser = argparse.ArgumentParser(description='Process some inputs.')
     parser.add_argument('word', type=str, help='A 5-letter word')
     parser.add_argument('--exp_fp', type=str, default=None, help='File path to record experiment results')
     parser.add_argument('--first_word', type=str, default=None, help='The first word to use')
+    parser.add_argument('--engine', type=str, default='regex', choices=['regex', 'numpy', 'bitset'], help='The candidate filtering engine')
+    add_logging_arguments(parser)
 
     args = parser.parse_args()
+    configure_logging_from_args(args)
 
     # Access the arguments
     word = args.word
@@ -25,7 +32,8 @@ def main():
     if len(word) != 5:
         raise argparse.ArgumentTypeError("Word must be 5 letters long")
 
-    print(f"Word: {word}, experiment_fp: {experiment_fp}, First Word: {first_word}")
+    log_event(logger, logging.INFO, "start", "Word: %s, experiment_fp: %s, First Word: %s", word, experiment_fp, first_word,
+              word=word, experiment_fp=experiment_fp, first_word=first_word)
 
     # Create a WordleJudge object
     wordle_game = WordleJudge(word)
@@ -35,7 +43,7 @@ def main():
         experiment_recorder = ExperimentRecorder(experiment_fp)
 
     # Create a WordList object
-    wordle_virtual_assistant = WordListGeneratorRandom("data/five-letter-words.txt")
+    wordle_virtual_assistant = WordListGeneratorRandom("data/five-letter-words.txt", engine=args.engine)
     wordle_virtual_assistant.load()
 
     # create initial guess
@@ -49,28 +57,31 @@ def main():
     while not isinstance(result, bool) or not result:
         attemp_count += 1
         if attemp_count < 7:
-            print(f'attempt {attemp_count} guess is {word}')
+            log_event(logger, logging.INFO, "attempt", 'attempt %d guess is %s', attemp_count, word,
+                      attempt=attemp_count, word=word)
         else:
-            print(f'>>>>Failed wordle game: attempt {attemp_count} guess is {word}')
+            log_event(logger, logging.INFO, "attempt", 'Failed wordle game: attempt %d guess is %s', attemp_count, word,
+                      attempt=attemp_count, word=word, failed=True)
 
         if attemp_count > 20:
-            print(f'>>>>Exceed max attempt: attempt {attemp_count}')
+            log_event(logger, logging.WARNING, "max_attempts", 'Exceed max attempt: attempt %d', attemp_count,
+                      attempt=attemp_count)
             break
 
         result = wordle_game.judge_guess(word)
-        print(f'The result is {result}')
+        log_event(logger, logging.INFO, "result", 'The result is %s', result, result=result)
         if not isinstance(result, bool):
             # Update the word list
-            wordle_virtual_assistant.update_state(result)
+            wordle_virtual_assistant.update_state(result, word)
             wordle_virtual_assistant.print_state()
             
             # Get a random word
             word = wordle_virtual_assistant.get_candidate_word()
             if word is None:
-                print(">>>>No candidate words left")
+                log_event(logger, logging.WARNING, "no_candidates", "No candidate words left")
                 break
     
-    print(f"global_state: {wordle_virtual_assistant.global_state}")
+    wordle_virtual_assistant.print_state()
     if experiment_fp:
         experiment_recorder.record("random", initial_word, word, attemp_count)
         experiment_recorder.close()
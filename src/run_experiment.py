@@ -1,20 +1,29 @@
+import argparse
+import logging
 import os
-import sys
 
 import numpy as np
 import pandas as pd 
 
-# Import the main functions from the random and llm solvers
-from random_solver import main as random_solver
-from llm_solver import main as llm_solver
+# Import the in-process batch runner and the solver factories
+from experiment_runner import run_games, solver_factory_for
+from experiment_recorder import BufferedExperimentRecorder
+from solver_logging import add_logging_arguments, configure_logging_from_args, get_logger, log_event
 
 # Define constants for the number of words and trials, and the file path for the experiment data
 NUM_WORDS = 10
 NUM_TRIALS = 10
 EXPERIMENT_FP = 'data/experiment.csv'
 
+logger = get_logger(__name__)
+
 if __name__ == '__main__':
 
+    parser = argparse.ArgumentParser(description='Run the random and llm solvers for a sample of past answers.')
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging_from_args(args)
+
     # Check if the experiment data file exists
     if os.path.exists(EXPERIMENT_FP):
         # If the file exists, delete it to start a new experiment
@@ -28,52 +37,29 @@ if __name__ == '__main__':
     # Select a random sample of words to test
     test_words_list = df_words.sample(NUM_WORDS)[0].str.lower().to_list()
 
-    # Print the command line arguments
-    print(sys.argv)
-
-    # Print the experiment parameters
-    print(f"Running experiment for {NUM_WORDS} words and {NUM_TRIALS} trials")
-
-    # Prepare the command line arguments for the random solver
-    sys.argv =  ['/workspaces/wordle_solver/src/random_solver.py']
-
-    # Run the random solver for each word in the test list
-    for i_word, word in enumerate(test_words_list):
-        # Add the word and experiment file path to the command line arguments
-        sys.argv.append(word)
-        sys.argv.append('--exp_fp')
-        sys.argv.append('data/experiment.csv')
-        # Run the solver for the specified number of trials
-        for i in range(NUM_TRIALS):
-            print(f"\nRandom Solver trial {i + 1} for word {word} {i_word + 1} out of {len(test_words_list)} words")
-            random_solver()
-        # Remove the word and experiment file path from the command line arguments
-        sys.argv.pop()
-        sys.argv.pop()
-        sys.argv.pop()
+    # Log the experiment parameters
+    log_event(logger, logging.INFO, "run", "Running experiment for %d words and %d trials", NUM_WORDS, NUM_TRIALS,
+              num_words=NUM_WORDS, trials=NUM_TRIALS)
 
-    # Print the command line arguments
-    print(sys.argv)
+    # One recorder for the whole experiment, it writes the rows in batches
+    experiment_recorder = BufferedExperimentRecorder(EXPERIMENT_FP)
 
-    # Prepare the command line arguments for the llm solver
-    sys.argv =  ['/workspaces/wordle_solver/src/llm_solver.py']
+    # Run the random solver for each word in the test list, the word list is loaded once
+    run_games(
+        solver_factory_for("random"),
+        test_words_list,
+        trials=NUM_TRIALS,
+        recorder=experiment_recorder,
+        solver_type="random",
+    )
 
     # Run the llm solver for each word in the test list
-    for i_word, word in enumerate(test_words_list):
-        # Add the word, API flag, and experiment file path to the command line arguments
-        sys.argv.append(word)
-        sys.argv.append('--api')
-        sys.argv.append('--exp_fp')
-        sys.argv.append('data/experiment.csv')
-        # Run the solver for the specified number of trials
-        for i in range(NUM_TRIALS):
-            print(f"\nLLM Solver trial {i + 1} for word {word} {i_word + 1} out of {len(test_words_list)} words")
-            llm_solver()
-        # Remove the word, API flag, and experiment file path from the command line arguments
-        sys.argv.pop()
-        sys.argv.pop()
-        sys.argv.pop()
-        sys.argv.pop()
+    run_games(
+        solver_factory_for("llm"),
+        test_words_list,
+        trials=NUM_TRIALS,
+        recorder=experiment_recorder,
+        solver_type="llm",
+    )
 
-    # Print the command line arguments
-    print(sys.argv)
\ No newline at end of file
+    experiment_recorder.close()
@@ -0,0 +1,136 @@
+import json
+import logging
+import sys
+
+LOGGER_NAME = "wsva"
+LOG_LEVELS = ("debug", "info", "warning", "error")
+
+
+def get_logger(name):
+    """
+    Returns the logger of a module, a child of the LOGGER_NAME logger configured by configure_logging.
+
+    Args:
+        name (str): The module name.
+
+    Returns:
+        logging.Logger: The logger.
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def log_event(logger, level, event, message, *args, **fields):
+    """
+    Logs an event for the console and the JSON lines event stream.
+
+    The message is formatted with args only when a handler takes the level, and the check is done before the
+    log record is created, so an event below the configured level costs one method call.
+
+    Args:
+        logger (logging.Logger): The logger of the module.
+        level (int): The logging level, e.g. logging.INFO.
+        event (str): The event name of the JSON lines record, e.g. "attempt".
+        message (str): The %-style console message.
+        *args: The arguments of the message.
+        **fields: The fields of the JSON lines record.
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, message, *args, extra={"event": event, "fields": fields})
+
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats log records as one JSON object per line with the time, level, logger, event, message and the fields
+    of the event.  Records not logged through log_event have the event "log".
+    """
+
+    def format(self, record):
+        line = {
+            "time": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": getattr(record, "event", "log"),
+            "message": record.getMessage(),
+        }
+        line.update(getattr(record, "fields", {}))
+        return json.dumps(line, default=_json_default)
+
+
+def configure_logging(level="info", quiet=False, events_fp=None):
+    """
+    Sends the log records of the solvers to the console and optionally to a JSON lines event stream.
+
+    Without this call the solvers log nothing below warnings, as for any library logger.  Calling it again
+    replaces the handlers of the previous call.
+
+    Args:
+        level (str, optional): The lowest level logged, one of LOG_LEVELS. Defaults to "info".
+        quiet (bool, optional): Only write warnings and errors to the console. Defaults to False.
+        events_fp (str, optional): The file the JSON lines events are appended to, "-" for stdout. Defaults to
+            no event stream.
+
+    Returns:
+        logging.Logger: The LOGGER_NAME logger.
+
+    Raises:
+        ValueError: If the level is unknown.
+    """
+    if level not in LOG_LEVELS:
+        raise ValueError(f"Unknown log level '{level}', expected one of {LOG_LEVELS}")
+    level = getattr(logging, level.upper())
+
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.propagate = False
+
+    handlers = []
+    if events_fp is not None:
+        handler = logging.StreamHandler(sys.stdout) if events_fp == "-" else logging.FileHandler(events_fp)
+        handler.setFormatter(JsonLinesFormatter())
+        handler.setLevel(level)
+        handlers.append(handler)
+    if events_fp != "-":
+        # the event stream replaces the console messages when it is written to stdout
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.setLevel(max(level, logging.WARNING) if quiet else level)
+        handlers.append(handler)
+
+    for handler in handlers:
+        logger.addHandler(handler)
+    logger.setLevel(min(handler.level for handler in handlers))
+    return logger
+
+
+def add_logging_arguments(parser):
+    """
+    Adds the --log_level, --quiet and --events_fp options of configure_logging to a command line parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser.
+    """
+    parser.add_argument('--log_level', type=str, default='info', choices=LOG_LEVELS, help='The lowest level logged')
+    parser.add_argument('--quiet', action='store_true', help='Only write warnings and errors to the console')
+    parser.add_argument('--events_fp', type=str, default=None,
+                        help='File path to append the log as JSON lines events, - for stdout')
+
+
+def configure_logging_from_args(args):
+    """
+    Configures logging from the options added by add_logging_arguments.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        logging.Logger: The LOGGER_NAME logger.
+    """
+    return configure_logging(args.log_level, args.quiet, args.events_fp)
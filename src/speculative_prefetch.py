@@ -0,0 +1,218 @@
+import asyncio
+import json
+import threading
+
+import numpy as np
+
+from feedback_patterns import ABSENT, CORRECT, NUM_PATTERNS, PRESENT, compute_patterns
+from instrumentation import NULL_TIMER
+from trace_sink import NULL_TRACE_SINK
+from word_matrix import WORD_LENGTH, encode_words
+
+DEFAULT_MAX_PREFETCHES = 4
+DEFAULT_MIN_PROBABILITY = 0.02
+# the letters of a Wordle response as entered in llm_solver_nyt.py
+RESPONSE_LETTERS = {ABSENT: ".", PRESENT: "y", CORRECT: "g"}
+ALL_CORRECT_RESPONSE = RESPONSE_LETTERS[CORRECT] * WORD_LENGTH
+
+
+def response_to_result(wordle_virtual_assistant, word, wordle_response):
+    """
+    Converts a Wordle response entered by the user to the result of judging the guessed word.
+
+    "g" marks a correct letter, "y" a present letter and "." an absent letter.  A letter marked "." is only
+    absent if it is neither correct nor present elsewhere in the word or in the game state of the generator.
+
+    Args:
+        wordle_virtual_assistant (WordListGeneratorBase): The generator of the game.
+        word (str): The guessed word.
+        wordle_response (str): The response, e.g. "g.y..".
+
+    Returns:
+        dict: The "correct", "present" and "absent" lists.
+
+    Raises:
+        ValueError: If the response holds another letter.
+    """
+    result = {"correct": [], "present": [], "absent": []}
+    for i, (letter, feedback) in enumerate(zip(word, wordle_response)):
+        if feedback == "g":
+            result["correct"].append((i, letter))
+        elif feedback == "y":
+            result["present"].append((i, letter))
+        elif feedback == ".":
+            if (letter not in [x[1] for x in result["correct"]] and
+                letter not in [x[1] for x in result["present"]] and
+                not wordle_virtual_assistant.is_letter_in_correct(letter) and
+                not wordle_virtual_assistant.is_letter_in_present(letter)):
+                result["absent"].append(letter)
+        else:
+            raise ValueError(f"Unknown feedback: {feedback}")
+    return result
+
+
+def pattern_to_response(pattern):
+    """
+    Converts a feedback pattern code to the response the user enters for it.
+
+    Args:
+        pattern (int): The pattern code, see feedback_patterns.py.
+
+    Returns:
+        str: The response, e.g. "g.y..".
+    """
+    return "".join(RESPONSE_LETTERS[pattern // 3 ** i % 3] for i in range(WORD_LENGTH))
+
+
+def feedback_distribution(candidate_words, word):
+    """
+    Returns the probability of every response to a guess, assuming every candidate word is equally likely.
+
+    Args:
+        candidate_words (list): The candidate words of the game.
+        word (str): The guessed word.
+
+    Returns:
+        list: A (response, probability) tuple for every response with a candidate, the most probable first.
+    """
+    if len(candidate_words) == 0:
+        return []
+    patterns = compute_patterns(encode_words([word]), encode_words(candidate_words))[0]
+    counts = np.bincount(patterns, minlength=NUM_PATTERNS)
+    order = np.argsort(-counts, kind="stable")
+    return [
+        (pattern_to_response(pattern), counts[pattern] / len(candidate_words))
+        for pattern in order.tolist() if counts[pattern] > 0
+    ]
+
+
+def local_suggestion(candidate_words):
+    """
+    Returns an instant guess from the candidate words, the one whose distinct letters are the most common.
+
+    Args:
+        candidate_words (list): The candidate words of the game.
+
+    Returns:
+        str or None: The suggestion, or None if there are no candidate words.
+    """
+    if len(candidate_words) == 0:
+        return None
+    matrix = encode_words(candidate_words)
+    presence = np.zeros((len(matrix), 26), dtype=bool)
+    presence[np.arange(len(matrix))[:, None], matrix] = True
+    return candidate_words[int(np.argmax(presence @ presence.sum(axis=0)))]
+
+
+class SpeculativePrefetcher:
+    """
+    Asks the LLM for its recommendation after the most probable responses to a guess while the user types the
+    actual response.
+
+    start() forks the generator for each of the max_prefetches most probable responses, at least min_probability
+    each, and builds the prompt of the fork and sends it to the LLM on an event loop in a background thread.  take()
+    returns the prefetch of the response the user entered and cancels the others, which also cancels their HTTP
+    requests.
+
+    Attributes:
+        llm_interface (AsyncOpenAIInterface): Sends the prompts.
+        max_prefetches (int): The most prompts sent per guess.
+        min_probability (float): The lowest probability of a response that is prefetched.
+        stats (dict): The number of prefetches started and cancelled and of hits and misses of take().
+    """
+
+    def __init__(self, llm_interface, max_prefetches=DEFAULT_MAX_PREFETCHES, min_probability=DEFAULT_MIN_PROBABILITY):
+        """
+        Initializes the SpeculativePrefetcher and starts its event loop.
+
+        Args:
+            llm_interface (AsyncOpenAIInterface): Sends the prompts.
+            max_prefetches (int, optional): The most prompts sent per guess. Defaults to DEFAULT_MAX_PREFETCHES.
+            min_probability (float, optional): The lowest probability of a response that is prefetched. Defaults
+                to DEFAULT_MIN_PROBABILITY.
+        """
+        self.llm_interface = llm_interface
+        self.max_prefetches = max_prefetches
+        self.min_probability = min_probability
+        self.stats = {"started": 0, "cancelled": 0, "hits": 0, "misses": 0}
+        self._prefetches = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def start(self, wordle_virtual_assistant, word):
+        """
+        Starts the prefetches of the most probable responses to a guess, cancelling those of the previous guess.
+
+        Args:
+            wordle_virtual_assistant (WordListGeneratorLLM): The generator of the game, before the response.
+            word (str): The guessed word.
+
+        Returns:
+            list: The prefetched responses.
+        """
+        self.cancel()
+        for response, probability in feedback_distribution(wordle_virtual_assistant.candidate_words, word):
+            if len(self._prefetches) >= self.max_prefetches or probability < self.min_probability:
+                break
+            if response == ALL_CORRECT_RESPONSE:
+                continue
+
+            fork = wordle_virtual_assistant.fork()
+            # speculative turns write no dump files and are not timed
+            fork.trace_sink = NULL_TRACE_SINK
+            fork.timer = NULL_TIMER
+            fork.update_state(response_to_result(fork, word, response), word)
+            self._prefetches[response] = asyncio.run_coroutine_threadsafe(self._prefetch(fork), self._loop)
+            self.stats["started"] += 1
+        return list(self._prefetches)
+
+    async def _prefetch(self, fork):
+        # filtering is CPU bound, so it runs in a worker thread rather than blocking the other prefetches
+        prompt = await asyncio.get_running_loop().run_in_executor(None, fork.generate_llm_prompt)
+        if prompt is None:
+            return fork, None, None
+        return fork, prompt, json.loads(await self.llm_interface.chat(prompt))
+
+    def take(self, wordle_response):
+        """
+        Returns the prefetch of the response the user entered and cancels the other prefetches.
+
+        Args:
+            wordle_response (str): The response, e.g. "g.y..".
+
+        Returns:
+            concurrent.futures.Future or None: Resolves to the fork of the generator after the response, the
+                prompt of the fork and the parsed LLM response, both None if no candidate words are left.  None
+                if the response was not prefetched.
+        """
+        future = self._prefetches.pop(wordle_response, None)
+        self.cancel()
+        self.stats["misses" if future is None else "hits"] += 1
+        return future
+
+    def cancel(self):
+        """
+        Cancels the unused prefetches.
+        """
+        for future in self._prefetches.values():
+            if future.cancel():
+                self.stats["cancelled"] += 1
+        self._prefetches = {}
+
+    def close(self):
+        """
+        Cancels the unused prefetches and stops the event loop.
+        """
+        self.cancel()
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _shutdown(self):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.get_running_loop().shutdown_default_executor()
@@ -0,0 +1,244 @@
+import json
+import logging
+import threading
+import time
+
+from solver_logging import get_logger, log_event
+
+RECOMMENDATION_KEY = "recommendation"
+
+logger = get_logger(__name__)
+
+
+class RecommendationScanner:
+    """
+    Finds the value of one key of a JSON object while the object is still being streamed.
+
+    The scanner follows the strings and nesting of the text fed to it and decodes the string value of the key
+    in the outermost object as soon as its closing quote arrives, without waiting for the rest of the object.
+    Text before the object, such as a markdown code fence, is skipped.
+
+    Attributes:
+        key (str): The key to find.
+        value (str or None): The decoded value of the key, or None until its closing quote is fed.
+    """
+
+    def __init__(self, key=RECOMMENDATION_KEY):
+        """
+        Initializes the scanner.
+
+        Args:
+            key (str, optional): The key to find. Defaults to RECOMMENDATION_KEY.
+        """
+        self.key = key
+        self.value = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # the raw characters of the string being read in the outermost object
+        self._string = None
+        # the last key read in the outermost object, and the key whose value is being read
+        self._last_key = None
+        self._value_of = None
+
+    def feed(self, text):
+        """
+        Scans the next piece of the streamed text.
+
+        Args:
+            text (str): The piece.
+
+        Returns:
+            str or None: The value of the key once it is complete, None before.
+        """
+        if self.value is not None:
+            return self.value
+
+        for char in text:
+            if self._in_string:
+                if self._string is not None:
+                    self._string.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._string is not None:
+                        self._end_string(json.loads('"' + ''.join(self._string)))
+                        if self.value is not None:
+                            return self.value
+            elif char == '"':
+                self._in_string = True
+                self._string = [] if self._depth == 1 else None
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+            elif self._depth == 1 and char == ':':
+                self._value_of = self._last_key
+            elif self._depth == 1 and char == ',':
+                self._last_key = self._value_of = None
+        return None
+
+    def _end_string(self, string):
+        self._string = None
+        if self._value_of is None:
+            self._last_key = string
+        elif self._value_of == self.key:
+            self.value = string
+
+
+class StreamedChat:
+    """
+    A chat completion read from a stream in a background thread.
+
+    recommendation() returns as soon as the recommendation of the JSON response has streamed in, so the game
+    can go on while the rest of the response, the explanation, still streams.  content() waits for the whole
+    response.  Callbacks added with add_done_callback run in the background thread once the stream ends, e.g.
+    to write the response to the trace.
+
+    Attributes:
+        error (Exception or None): The error that ended the stream early, if any.
+        seconds_to_recommendation (float or None): Seconds from the start of the stream to the recommendation.
+        seconds_to_content (float or None): Seconds from the start of the stream to its end.
+    """
+
+    def __init__(self, pieces, key=RECOMMENDATION_KEY):
+        """
+        Initializes the StreamedChat and starts reading the stream.
+
+        Args:
+            pieces (iterable): The text pieces of the response, in order, e.g. the content deltas of the chunks.
+            key (str, optional): The key of the recommendation. Defaults to RECOMMENDATION_KEY.
+        """
+        self.key = key
+        self.error = None
+        self.seconds_to_recommendation = None
+        self.seconds_to_content = None
+        self._pieces = []
+        self._scanner = RecommendationScanner(key)
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._recommended = threading.Event()
+        self._done = threading.Event()
+        self._settled = threading.Event()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._read, args=(pieces,), daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_content(cls, content, key=RECOMMENDATION_KEY):
+        """
+        Returns a finished StreamedChat of a whole response, e.g. one answered from the cache.
+
+        Args:
+            content (str): The response.
+            key (str, optional): The key of the recommendation. Defaults to RECOMMENDATION_KEY.
+
+        Returns:
+            StreamedChat: The finished chat.
+        """
+        streamed = cls([content], key=key)
+        streamed.wait()
+        return streamed
+
+    def _read(self, pieces):
+        try:
+            for piece in pieces:
+                self._pieces.append(piece)
+                if not self._recommended.is_set() and self._scanner.feed(piece) is not None:
+                    self.seconds_to_recommendation = time.perf_counter() - self._start
+                    self._recommended.set()
+        except Exception as e:
+            log_event(logger, logging.ERROR, "llm_error", "An error occurred while streaming: %s", e, error=repr(e))
+            self.error = e
+        self.seconds_to_content = time.perf_counter() - self._start
+        self._recommended.set()
+        self._done.set()
+
+        with self._lock:
+            callbacks, self._callbacks = self._callbacks, None
+        for callback in callbacks:
+            self._run_callback(callback)
+        self._settled.set()
+
+    def _run_callback(self, callback):
+        try:
+            callback(self)
+        except Exception as e:
+            log_event(logger, logging.ERROR, "callback_error", "A streamed chat callback failed: %s", e, error=repr(e))
+
+    def recommendation(self, timeout=None):
+        """
+        Waits for the recommendation of the response.
+
+        If the stream ends without a complete string value of the key, the whole response is parsed instead, so
+        the errors are those of json.loads(content)[key].
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to waiting until the recommendation arrives.
+
+        Returns:
+            str: The recommended word.
+
+        Raises:
+            TimeoutError: If the recommendation did not arrive in time.
+        """
+        if not self._recommended.wait(timeout):
+            raise TimeoutError("The recommendation did not arrive in time")
+        if self._scanner.value is not None:
+            return self._scanner.value
+        return json.loads(self.content())[self.key]
+
+    def content(self, timeout=None):
+        """
+        Waits for the whole response.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to waiting until the stream ends.
+
+        Returns:
+            str: The response.
+
+        Raises:
+            TimeoutError: If the stream did not end in time.
+            Exception: The error that ended the stream early.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError("The response did not arrive in time")
+        if self.error is not None:
+            raise self.error
+        return ''.join(self._pieces)
+
+    def done(self):
+        """
+        Returns:
+            bool: True once the stream has ended.
+        """
+        return self._done.is_set()
+
+    def add_done_callback(self, callback):
+        """
+        Calls a function with this StreamedChat once the stream ends, right away if it has ended.
+
+        Args:
+            callback (callable): Takes the StreamedChat.
+        """
+        with self._lock:
+            if self._callbacks is not None:
+                self._callbacks.append(callback)
+                return
+        self._run_callback(callback)
+
+    def wait(self, timeout=None):
+        """
+        Waits for the stream to end and its callbacks to run.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to waiting until the callbacks have run.
+
+        Returns:
+            bool: True if the callbacks have run.
+        """
+        return self._settled.wait(timeout)
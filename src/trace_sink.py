@@ -0,0 +1,229 @@
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+
+from solver_logging import get_logger, log_event
+
+TRACE_MODES = ("off", "sampled", "full")
+DEFAULT_SAMPLE_RATE = 0.1
+DEFAULT_QUEUE_SIZE = 10000
+
+# tells the writer thread to stop
+_STOP = object()
+
+logger = get_logger(__name__)
+
+
+def candidate_delta(previous_words, candidate_words):
+    """
+    Describes a filter pass by the smaller of the removed and the kept words.
+
+    Args:
+        previous_words (list): The candidate words before the pass.
+        candidate_words (list): The candidate words after the pass, a subset of previous_words.
+
+    Returns:
+        dict: {"removed": [...]} or {"kept": [...]}, plus "count", the number of candidate words after the pass.
+    """
+    if len(candidate_words) * 2 <= len(previous_words):
+        delta = {"kept": list(candidate_words)}
+    else:
+        kept = set(candidate_words)
+        delta = {"removed": [word for word in previous_words if word not in kept]}
+    delta["count"] = len(candidate_words)
+    return delta
+
+
+def apply_candidate_delta(previous_words, delta):
+    """
+    Rebuilds the candidate words after a filter pass from the words before it and its delta.
+
+    Args:
+        previous_words (list): The candidate words before the pass.
+        delta (dict): The delta returned by candidate_delta.
+
+    Returns:
+        list: The candidate words after the pass.
+    """
+    if "kept" in delta:
+        return list(delta["kept"])
+    removed = set(delta["removed"])
+    return [word for word in previous_words if word not in removed]
+
+
+def state_to_json(state):
+    """
+    Converts a game state of sets to sorted lists, so it can be written as JSON.
+    """
+    return {key: sorted(list(item) if isinstance(item, tuple) else item for item in value)
+            for key, value in state.items()}
+
+
+class TraceSink:
+    """
+    Writes trace records of games as gzip-compressed JSON lines from a background thread.
+
+    Every record is a JSON object with the game ID, the event name, a timestamp and the event fields.  In
+    "off" mode nothing is written and no thread or file is opened.  In "sampled" mode only the games whose
+    ID hashes below sample_rate are written, so a sampled game is traced from start to end.  In "full" mode
+    every game is written.  Emitting a record only puts it on a queue; the file is written by the writer
+    thread, so tracing keeps file I/O off the game loop.
+
+    A record that cannot be serialized is logged as a "trace_error" event and dropped.  If the trace file 
+    cannot be written, the error is logged, the sink is marked failed and stops tracing, and the writer 
+    thread keeps draining the queue so emit and close never block on it.
+
+    Attributes:
+        fp (str): The file path to the trace file, appended to across runs.
+        mode (str): "off", "sampled" or "full".
+        sample_rate (float): The fraction of games traced in "sampled" mode.
+        records_written (int): The number of records written.
+        records_dropped (int): The number of records that could not be serialized.
+        failed (bool): True once writing the trace file failed.
+    """
+
+    def __init__(self, fp=None, mode="full", sample_rate=DEFAULT_SAMPLE_RATE, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        Initializes the sink and starts its writer thread unless the mode is "off".
+
+        Args:
+            fp (str, optional): The file path to the trace file. Required unless the mode is "off".
+            mode (str, optional): "off", "sampled" or "full". Defaults to "full".
+            sample_rate (float, optional): The fraction of games traced in "sampled" mode. Defaults to DEFAULT_SAMPLE_RATE.
+            queue_size (int, optional): The number of records buffered before emit blocks. Defaults to DEFAULT_QUEUE_SIZE.
+
+        Raises:
+            ValueError: If the mode is unknown, or no file path is given for a mode other than "off".
+        """
+        if mode not in TRACE_MODES:
+            raise ValueError(f"Unknown trace mode '{mode}', expected one of {TRACE_MODES}")
+        if mode != "off" and not fp:
+            raise ValueError(f"Trace mode '{mode}' needs a trace file path")
+
+        self.fp = fp
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.records_written = 0
+        self.records_dropped = 0
+        self.failed = False
+        self._queue = None
+        self._thread = None
+        self._closed = False
+
+        if self.mode != "off":
+            directory = os.path.dirname(self.fp)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._thread = threading.Thread(target=self._write_records, name="trace-sink", daemon=True)
+            self._thread.start()
+
+    def enabled_for(self, game_id):
+        """
+        Tells whether the records of a game are written, so callers can skip building them.
+
+        Args:
+            game_id (str): The game ID.
+
+        Returns:
+            bool: True if the game is traced.
+        """
+        if self._closed or self.failed:
+            return False
+        if self.mode == "full":
+            return True
+        if self.mode == "sampled":
+            return zlib.crc32(str(game_id).encode()) < self.sample_rate * 2**32
+        return False
+
+    def emit(self, game_id, event, **fields):
+        """
+        Queues a record of a game for the writer thread.
+
+        Args:
+            game_id (str): The game ID.
+            event (str): The event name.
+            **fields: The JSON-serializable fields of the record.
+        """
+        if not self.enabled_for(game_id):
+            return
+        record = {"game": game_id, "event": event, "time": time.time()}
+        record.update(fields)
+        self._queue.put(record)
+
+    def _write_records(self):
+        stop = False
+        try:
+            with gzip.open(self.fp, 'at') as file:
+                while not stop:
+                    records = [self._queue.get()]
+                    # drain whatever else is queued so the file is written in batches
+                    while True:
+                        try:
+                            records.append(self._queue.get_nowait())
+                        except queue.Empty:
+                            break
+
+                    stop = any(record is _STOP for record in records)
+                    lines = [line for line in map(self._serialize, records) if line is not None]
+                    file.write("".join(lines))
+                    self.records_written += len(lines)
+        except Exception as e:
+            self.failed = True
+            log_event(logger, logging.ERROR, "trace_error", "Writing the trace file %s failed, tracing stopped: %s",
+                      self.fp, e, fp=self.fp, error=repr(e))
+            # consume what was queued before the failure, so emit and close do not wait on a full queue
+            while not stop:
+                stop = self._queue.get() is _STOP
+
+    def _serialize(self, record):
+        if record is _STOP:
+            return None
+        try:
+            return json.dumps(record) + "\n"
+        except (TypeError, ValueError) as e:
+            self.records_dropped += 1
+            log_event(logger, logging.ERROR, "trace_error", "Dropped a trace record of %s: %s", record["event"], e,
+                      game=record["game"], trace_event=record["event"], error=repr(e))
+            return None
+
+    def close(self):
+        """
+        Writes the queued records and closes the trace file.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# the sink of generators run by the experiment runners without tracing
+NULL_TRACE_SINK = TraceSink(mode="off")
+
+
+def read_trace(fp):
+    """
+    Reads the records of a trace file.
+
+    Args:
+        fp (str): The file path to the trace file.
+
+    Yields:
+        dict: The records in the order they were written.
+    """
+    with gzip.open(fp, 'rt') as file:
+        for line in file:
+            yield json.loads(line)
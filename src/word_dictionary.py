@@ -0,0 +1,131 @@
+import os
+import threading
+
+import numpy as np
+
+from bitset_index import WordBitsetIndex
+from word_list_artifact import load_word_list_artifact
+from word_matrix import encode_words
+
+# dictionaries shared by every generator in the process, keyed by word list file and its modification time
+_DICTIONARY_CACHE = {}
+_DICTIONARY_CACHE_LOCK = threading.Lock()
+
+
+class WordDictionary:
+    """
+    The words of a word list file, loaded once per process and shared read-only by every generator.
+
+    Generators loading the same file reference the same word strings and letter matrix, so a game only
+    pays for the list of its surviving candidates, which points into this table.  Nothing here may be
+    modified; the filters of WordListGeneratorBase always build new lists.
+
+    Attributes:
+        words_fp (str): The file path to the word list.
+        words (list): The words as WordListGeneratorBase.load reads them.
+        word_index (dict): Maps a word to its position in words.
+    """
+
+    def __init__(self, words_fp, words, matrix=None):
+        """
+        Initializes the dictionary with its words.
+
+        Args:
+            words_fp (str): The file path to the word list.
+            words (list): The words of the file.
+            matrix (numpy.ndarray, optional): The letter matrix of the words, e.g. memory-mapped from an artifact. Defaults to None.
+        """
+        self.words_fp = words_fp
+        self.words = words
+        self.word_index = {word: i for i, word in enumerate(words)}
+        self._matrix = matrix
+        self._bitset_index = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_file(cls, words_fp, matrix=None):
+        """
+        Returns the dictionary of a word list file, loading it on first use.
+
+        The dictionary is cached for the process and keyed by the file path, modification time and size, so
+        an edited file is loaded again.  An up to date compiled artifact of the file is used when present.
+
+        Args:
+            words_fp (str): The file path to the word list.
+            matrix (numpy.ndarray, optional): The letter matrix of the words, used instead of encoding them when
+                this call loads the file without an artifact, e.g. one memory-mapped by every worker process.
+                Defaults to None.
+
+        Returns:
+            WordDictionary: The shared dictionary.
+        """
+        stat = os.stat(words_fp)
+        key = (os.path.abspath(words_fp), stat.st_mtime_ns, stat.st_size)
+        with _DICTIONARY_CACHE_LOCK:
+            dictionary = _DICTIONARY_CACHE.get(key)
+            if dictionary is None:
+                artifact = load_word_list_artifact(words_fp)
+                if artifact is not None:
+                    dictionary = cls(words_fp, *artifact)
+                else:
+                    with open(words_fp, 'r') as file:
+                        dictionary = cls(words_fp, [line.strip() for line in file], matrix)
+                _DICTIONARY_CACHE[key] = dictionary
+        return dictionary
+
+    @property
+    def matrix(self):
+        """
+        numpy.ndarray or None: The read-only (N, 5) uint8 letter matrix of the words, encoded on first use, or
+        None if the words are not all five lowercase letters.
+        """
+        with self._lock:
+            if self._matrix is None:
+                try:
+                    matrix = encode_words(self.words)
+                except ValueError:
+                    return None
+                matrix.flags.writeable = False
+                self._matrix = matrix
+            return self._matrix
+
+    @property
+    def bitset_index(self):
+        """
+        WordBitsetIndex: The bitset index of the words, built from the letter matrix on first use.
+        """
+        matrix = self.matrix
+        with self._lock:
+            if self._bitset_index is None:
+                self._bitset_index = WordBitsetIndex(self.words, matrix)
+            return self._bitset_index
+
+    def __len__(self):
+        return len(self.words)
+
+    def indices_for(self, words):
+        """
+        Returns the positions of words in the dictionary.
+
+        Args:
+            words (list): Words of the dictionary.
+
+        Returns:
+            numpy.ndarray: The int32 position of every word.
+
+        Raises:
+            KeyError: If a word is not in the dictionary.
+        """
+        return np.fromiter((self.word_index[word] for word in words), dtype=np.int32, count=len(words))
+
+    def words_for(self, indices):
+        """
+        Returns the words at positions of the dictionary.
+
+        Args:
+            indices (numpy.ndarray): Positions in the dictionary.
+
+        Returns:
+            list: The shared word strings at the positions.
+        """
+        return [self.words[i] for i in np.asarray(indices).tolist()]
@@ -0,0 +1,131 @@
+import argparse
+import hashlib
+import os
+import struct
+
+import numpy as np
+
+from word_matrix import WORD_LENGTH, encode_words
+
+ARTIFACT_SUFFIX = ".wordlist"
+ARTIFACT_MAGIC = b"WORDLST1"
+# magic, word count, word width, flags, source size, source mtime in ns, source SHA-256
+ARTIFACT_HEADER = struct.Struct("<8sIII4xqq32s")
+FLAG_LOWERCASE = 1
+
+
+def artifact_path(words_fp):
+    """
+    Returns the path of the compiled artifact of a word list file, next to the file.
+
+    Args:
+        words_fp (str): The file path to the word list.
+
+    Returns:
+        str: The artifact file path, e.g. data/five-letter-words.wordlist for data/five-letter-words.txt.
+    """
+    return os.path.splitext(words_fp)[0] + ARTIFACT_SUFFIX
+
+
+def _source_digest(words_fp):
+    with open(words_fp, 'rb') as file:
+        return hashlib.sha256(file.read()).digest()
+
+
+def compile_word_list(words_fp, artifact_fp=None):
+    """
+    Compiles a word list file into a binary artifact that WordListGeneratorBase.load memory-maps.
+
+    The artifact holds a fixed header with the size, modification time and SHA-256 checksum of the source,
+    the words as a fixed-width byte buffer of five bytes per word, exactly as load reads them from the text
+    file, and the (N, 5) uint8 letter matrix of the lowercased words.
+
+    Args:
+        words_fp (str): The file path to the word list.
+        artifact_fp (str, optional): The artifact file path. Defaults to artifact_path(words_fp).
+
+    Returns:
+        str: The artifact file path.
+
+    Raises:
+        ValueError: If a line of the file is not a five-letter ascii word.
+    """
+    artifact_fp = artifact_fp or artifact_path(words_fp)
+
+    with open(words_fp, 'r') as file:
+        words = [line.strip() for line in file]
+    matrix = encode_words([word.lower() for word in words])
+    flags = FLAG_LOWERCASE if all(word.islower() for word in words) else 0
+
+    stat = os.stat(words_fp)
+    header = ARTIFACT_HEADER.pack(
+        ARTIFACT_MAGIC, len(words), WORD_LENGTH, flags, stat.st_size, stat.st_mtime_ns, _source_digest(words_fp)
+    )
+
+    tmp_fp = f"{artifact_fp}.{os.getpid()}.tmp"
+    with open(tmp_fp, 'wb') as file:
+        file.write(header)
+        file.write("".join(words).encode('ascii'))
+        file.write(matrix.tobytes())
+    os.replace(tmp_fp, artifact_fp)
+    return artifact_fp
+
+
+def load_word_list_artifact(words_fp, artifact_fp=None):
+    """
+    Loads the compiled artifact of a word list file if it is present and up to date.
+
+    The artifact is up to date if the source has the recorded size and either the recorded modification
+    time or, when the time changed, the recorded checksum.  The letter matrix is memory-mapped.
+
+    Args:
+        words_fp (str): The file path to the word list.
+        artifact_fp (str, optional): The artifact file path. Defaults to artifact_path(words_fp).
+
+    Returns:
+        tuple or None: The words as load reads them and the read-only letter matrix of the lowercased words,
+            or None if there is no valid, up to date artifact.  The matrix is None if the words are not all lowercase.
+    """
+    artifact_fp = artifact_fp or artifact_path(words_fp)
+    try:
+        with open(artifact_fp, 'rb') as file:
+            header = file.read(ARTIFACT_HEADER.size)
+        stat = os.stat(words_fp)
+    except OSError:
+        return None
+    if len(header) != ARTIFACT_HEADER.size:
+        return None
+
+    magic, count, width, flags, source_size, source_mtime_ns, digest = ARTIFACT_HEADER.unpack(header)
+    if magic != ARTIFACT_MAGIC or width != WORD_LENGTH or source_size != stat.st_size:
+        return None
+    if source_mtime_ns != stat.st_mtime_ns and digest != _source_digest(words_fp):
+        return None
+    if os.path.getsize(artifact_fp) != ARTIFACT_HEADER.size + 2 * count * width:
+        return None
+
+    if count == 0:
+        return [], np.zeros((0, WORD_LENGTH), dtype=np.uint8)
+
+    data = np.memmap(artifact_fp, dtype=np.uint8, mode='r', offset=ARTIFACT_HEADER.size, shape=(2, count, width))
+    text = data[0].tobytes().decode('ascii')
+    words = [text[i:i + width] for i in range(0, len(text), width)]
+    matrix = data[1] if flags & FLAG_LOWERCASE else None
+    return words, matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile word list files into binary artifacts for fast loading.')
+    parser.add_argument('words_fps', type=str, nargs='*',
+                        default=['data/five-letter-words.txt', 'data/f-past-wordle-answers.txt'],
+                        help='Word list files to compile')
+
+    args = parser.parse_args()
+
+    for words_fp in args.words_fps:
+        artifact_fp = compile_word_list(words_fp)
+        print(f"Compiled {words_fp} to {artifact_fp}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import numpy as np
+
+WORD_LENGTH = 5
+ALPHABET_SIZE = 26
+
+
+def letter_index(letter):
+    """
+    Converts a lowercase letter to its index in the alphabet.
+
+    Args:
+        letter (str): A single lowercase letter.
+
+    Returns:
+        int: The index of the letter, 0 for 'a' through 25 for 'z'.
+    """
+    return ord(letter) - ord("a")
+
+
+def read_word_file(fp):
+    """
+    Reads a word list file with one word per line.
+
+    Words are stripped of surrounding whitespace and lowercased, so the uppercase answer list in 
+    data/f-past-wordle-answers.txt can be used alongside data/five-letter-words.txt.  Blank lines are skipped.
+
+    Args:
+        fp (str): The file path to the word list.
+
+    Returns:
+        list: The words in file order.
+    """
+    with open(fp, 'r') as file:
+        return [word for word in (line.strip().lower() for line in file) if word]
+
+
+def encode_words(words):
+    """
+    Encodes a list of five-letter words as an (N, 5) uint8 letter matrix.
+
+    Each cell holds the alphabet index of the letter (0 for 'a' through 25 for 'z').
+
+    Args:
+        words (list): A list of lowercase five-letter words.
+
+    Returns:
+        numpy.ndarray: An (N, 5) uint8 matrix with one row per word.
+
+    Raises:
+        ValueError: If a word is not made of exactly five lowercase ascii letters.
+    """
+    if len(words) == 0:
+        return np.empty((0, WORD_LENGTH), dtype=np.uint8)
+
+    joined = "".join(words)
+    if len(joined) != WORD_LENGTH * len(words) or not (joined.isascii() and joined.isalpha() and joined.islower()):
+        raise ValueError("All words must be five lowercase ascii letters")
+
+    buffer = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+    return (buffer - ord("a")).reshape(-1, WORD_LENGTH)
+
+
+def constraint_mask(matrix, state):
+    """
+    Computes a boolean mask of the rows in a letter matrix that satisfy the game state.
+
+    The constraints are applied with the same semantics as the regex filters in WordListGeneratorBase:
+    - "absent": rows containing any of the absent letters are rejected.
+    - "present": rows with a present letter at the recorded position are rejected.
+    - "correct": rows without a correct letter at the recorded position are rejected.
+
+    Args:
+        matrix (numpy.ndarray): An (N, 5) uint8 letter matrix produced by encode_words.
+        state (dict): A dictionary with "absent", "present" and "correct" constraints. Missing keys are ignored.
+
+    Returns:
+        numpy.ndarray: A boolean array of length N, True for rows that satisfy every constraint.
+    """
+    mask = np.ones(len(matrix), dtype=bool)
+
+    absent = state.get("absent", ())
+    if len(absent) > 0:
+        absent_table = np.zeros(ALPHABET_SIZE, dtype=bool)
+        absent_table[[letter_index(letter) for letter in absent]] = True
+        mask &= ~absent_table[matrix].any(axis=1)
+
+    for position, letter in state.get("present", ()):
+        mask &= matrix[:, position] != letter_index(letter)
+
+    for position, letter in state.get("correct", ()):
+        mask &= matrix[:, position] == letter_index(letter)
+
+    return mask
@@ -1,3 +1,16 @@
+import numpy as np
+
+from feedback_patterns import (
+    JUDGE_RULES,
+    WORDLE_RULES,
+    build_pattern_matrix,
+    compute_paired_patterns,
+    judge_feedback_pattern,
+    pattern_to_result,
+)
+from word_matrix import encode_words
+
+
 class WordleJudge:
     """
     A class used to judge the guesses in the Wordle game.
@@ -7,16 +20,48 @@ class WordleJudge:
 
     Attributes:
         correct_word (str): The correct word in the Wordle game.
+        pattern_table (PatternTable): An optional precomputed matrix of judge codes used by judge_pattern.
     """
 
-    def __init__(self, correct_word):
+    def __init__(self, correct_word, pattern_table=None):
         """
         Initializes the WordleJudge with the correct word.
 
         Args:
             correct_word (str): The correct word in the Wordle game.
+            pattern_table (PatternTable, optional): A precomputed pattern matrix built with JUDGE_RULES. Defaults 
+                to None.
+
+        Raises:
+            ValueError: If the pattern table holds the codes of other rules.
         """
+        if pattern_table is not None and pattern_table.rules != JUDGE_RULES:
+            raise ValueError(f"judge_pattern needs a pattern table of {JUDGE_RULES} codes, not {pattern_table.rules}")
         self.correct_word = correct_word.lower()
+        self.pattern_table = pattern_table
+
+    def judge_pattern(self, guess):
+        """
+        Judges a guess and returns the feedback of judge_guess as a base-3 pattern code.
+
+        The pattern is looked up in the pattern_table when both words are in it, otherwise it is computed.
+        See feedback_patterns for the encoding; the code is result_to_pattern(guess, judge_guess(guess)), so
+        repeated letters are judged like judge_guess rather than by the Wordle rules of BatchWordleJudge.
+
+        Args:
+            guess (str): The guess to be judged.
+
+        Returns:
+            int: The pattern code, 242 if the guess is correct.
+        """
+        guess = guess.lower()
+        if self.pattern_table is not None:
+            try:
+                return self.pattern_table.pattern(guess, self.correct_word)
+            except KeyError:
+                pass
+
+        return judge_feedback_pattern(guess, self.correct_word)
 
     def judge_guess(self, guess):
         """
@@ -53,6 +98,105 @@ class WordleJudge:
 
             return result
 
+class BatchWordleJudge:
+    """
+    A class used to judge many guesses against many answers in one vectorized call.
+
+    The feedback is returned as compact base-3 pattern codes (see feedback_patterns) instead of result 
+    dictionaries.  Unlike WordleJudge.judge_guess, repeated letters follow the Wordle rules: a letter is only 
+    marked present as many times as it occurs in the answer outside the correct positions.
+
+    Attributes:
+        pattern_table (PatternTable): An optional precomputed matrix of Wordle rule codes to look patterns up in.
+    """
+
+    MODES = ("cross", "zip")
+
+    def __init__(self, pattern_table=None):
+        """
+        Initializes the BatchWordleJudge.
+
+        Args:
+            pattern_table (PatternTable, optional): A precomputed pattern matrix. When every guess and answer 
+                of a call is in the table, the patterns are looked up instead of computed. Defaults to None.
+        """
+        self.pattern_table = pattern_table
+
+    @staticmethod
+    def _letter_matrix(words):
+        if isinstance(words, np.ndarray):
+            return words
+        return encode_words([word.lower() for word in words])
+
+    def _table_indices(self, guesses, answers):
+        """
+        Returns the table rows of the guesses and columns of the answers, or None if any word is missing.
+        """
+        if self.pattern_table is None or isinstance(guesses, np.ndarray) or isinstance(answers, np.ndarray):
+            return None
+        if self.pattern_table.rules != WORDLE_RULES:
+            return None
+        try:
+            rows = [self.pattern_table.guess_index[guess.lower()] for guess in guesses]
+            columns = [self.pattern_table.answer_index[answer.lower()] for answer in answers]
+        except KeyError:
+            return None
+        return rows, columns
+
+    def judge(self, guesses, answers, mode="cross"):
+        """
+        Judges guesses against answers.
+
+        Args:
+            guesses (list or numpy.ndarray): The guessed words, or their (G, 5) uint8 letter matrix.
+            answers (list or numpy.ndarray): The correct words, or their (A, 5) uint8 letter matrix.
+            mode (str, optional): "cross" judges every guess against every answer, "zip" judges guess i 
+                against answer i. Defaults to "cross".
+
+        Returns:
+            numpy.ndarray: The uint8 pattern codes, a (G, A) matrix in "cross" mode and a (G,) array in "zip" mode.
+
+        Raises:
+            ValueError: If the mode is unknown, or in "zip" mode the number of guesses and answers differ.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode '{mode}', expected one of {self.MODES}")
+        if mode == "zip" and len(guesses) != len(answers):
+            raise ValueError(f"Cannot zip {len(guesses)} guesses with {len(answers)} answers")
+
+        indices = self._table_indices(guesses, answers)
+        if indices is not None:
+            rows, columns = indices
+            if mode == "cross":
+                return np.asarray(self.pattern_table.patterns[np.ix_(rows, columns)])
+            return np.asarray(self.pattern_table.patterns[rows, columns])
+
+        guess_matrix = self._letter_matrix(guesses)
+        answer_matrix = self._letter_matrix(answers)
+        if mode == "cross":
+            return build_pattern_matrix(guess_matrix, answer_matrix)
+        return compute_paired_patterns(guess_matrix, answer_matrix)
+
+    @staticmethod
+    def to_results(guesses, patterns):
+        """
+        Converts the pattern codes of a "zip" call to the results WordleJudge.judge_guess returns for the guesses.
+
+        The codes follow the Wordle rules, but the results follow judge_guess, which the generators filter by: a
+        repeated letter that the Wordle rules mark absent while it is correct or present elsewhere in the guess
+        is present, see pattern_to_result.  So the results can be passed to update_state without removing the
+        answer from the candidates.
+
+        Args:
+            guesses (list): The guessed words.
+            patterns (numpy.ndarray): The (G,) pattern codes returned by judge in "zip" mode.
+
+        Returns:
+            list: True for each correct guess, otherwise a result dictionary.
+        """
+        return [pattern_to_result(guess.lower(), pattern) for guess, pattern in zip(guesses, patterns.tolist())]
+
+
 if __name__ == "__main__":
     # Example Usage
     wordle_game = WordleJudge("apple")
@@ -1,13 +1,31 @@
 
+import copy
+import itertools
 import json
+import logging
 import os
 import random
 import re
 import pprint
-
-from openai import OpenAI
+import sys
+import uuid
+
+import numpy as np
+
+from bitset_index import WordBitsetIndex
+from decision_tree import ROOT, DecisionTree
+from feedback_patterns import JUDGE_RULES, PatternTable, build_pattern_matrix, pattern_entropy, result_to_pattern
+from instrumentation import NULL_TIMER
+from opening_book import OpeningBook
+from prompt_builder import DEFAULT_RANKING, estimate_tokens, fill_word_list, rank_candidates
+from solver_logging import get_logger, log_event
+from streaming_chat import StreamedChat
+from trace_sink import candidate_delta, state_to_json
+from word_matrix import encode_words, constraint_mask
+from word_dictionary import WordDictionary
 
 pp = pprint.PrettyPrinter(indent=4)
+logger = get_logger(__name__)
 
 class WordListGeneratorBase:
     """
@@ -19,16 +37,39 @@ class WordListGeneratorBase:
         global_state (dict): The global state of the game.
         dump_file_count (int): The count of dump files.
         dump_file_dir (str): The directory for dump files.
+        engine (str): The filtering engine, "regex", "numpy" or "bitset".
+        applied_state (dict): The constraints of global_state already applied to candidate_words.
+        candidate_history (list): The candidate words and applied constraints before each filter pass, used by rollback.
+        dictionary (WordDictionary): The words of the word list file, shared by every generator loading the file.
+        loaded_words (list): The words loaded from the word list file, reused by reset.
+        loaded_word_matrix (numpy.ndarray): The letter matrix of loaded_words, or None if the words are not all 
+            five lowercase letters.
+        guessed_word (str): The last guessed word.
+        trace_sink (TraceSink): Receives the trace records of the games, or None to write the legacy dump files.
+        game_id (str): The ID tagging the trace records of the current game, renewed by reset.
+        opening_book (OpeningBook): The opening book of the words file, or None if none was built for it.
+        opening_guess (str): The next guess the opening book recommended in the last filter pass, or None.
+        timer (PhaseTimer): Times the phases of the games, see instrumentation.py.  Defaults to NULL_TIMER, 
+            which times nothing; reset starts a new game on the timer.
     """
 
-    def __init__(self, words_fp, dump_file_dir="llm_trace_data"):
+    ENGINES = ("regex", "numpy", "bitset")
+
+    def __init__(self, words_fp, dump_file_dir="llm_trace_data", engine="regex"):
         """
         Initialize a new instance of the WordListGeneratorBase class.
 
         Args:
             words_fp (str): The file path to the word list.
             dump_file_dir (str, optional): The directory for dump files. Defaults to "llm_trace_data".
+            engine (str, optional): The filtering engine. "regex" filters the candidate_words list with regular 
+                expressions, "numpy" applies the constraints as boolean masks over a uint8 letter matrix and 
+                "bitset" resolves them with bitwise operations on the shared WordBitsetIndex of the word list. 
+                All engines return the same candidates. Defaults to "regex".
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {self.ENGINES}")
+
         self.words_fp = words_fp
         self.candidate_words = []
         self.global_state = {
@@ -38,6 +79,31 @@ class WordListGeneratorBase:
         }
         self.dump_file_count = 0
         self.dump_file_dir = dump_file_dir
+        self.engine = engine
+        self.dictionary = None
+        self.loaded_words = []
+        self.loaded_word_matrix = None
+        self.guessed_word = None
+        self.applied_state = self._empty_state()
+        self.candidate_history = []
+        self.trace_sink = None
+        self.game_id = uuid.uuid4().hex
+        self.opening_book = None
+        self.opening_guess = None
+        self.timer = NULL_TIMER
+        # the candidate_words list produced by the last filter pass, its letter matrix for the numpy engine 
+        # and its (index, bitset) pair for the bitset engine
+        self._filtered_words = None
+        self._word_matrix = None
+        self._candidate_bits = None
+
+    @staticmethod
+    def _empty_state():
+        return {
+            "present": set(),
+            "correct": set(),
+            "absent": set()
+        }
 
     def is_letter_in_present(self, letter):
         """
@@ -70,42 +136,159 @@ class WordListGeneratorBase:
         The file should contain one word per line. The path to the file is stored in the `words_fp` 
         attribute of the class instance. 
         The words are stripped of leading and trailing whitespace before being added to the list.
+
+        The file is read once per process into a shared WordDictionary, from its compiled artifact when the 
+        artifact is up to date, and every generator loading the file references the same words and letter 
+        matrix.  The opening book of the file is loaded when one was built for it.
+        """
+        with self.timer.phase("load"):
+            self.dictionary = WordDictionary.for_file(self.words_fp)
+            self.opening_book = OpeningBook.for_file(self.words_fp)
+        self.candidate_words = self.dictionary.words
+        self.loaded_words = self.candidate_words
+        self.loaded_word_matrix = self.dictionary.matrix
+        self.applied_state = self._empty_state()
+        self.candidate_history = []
+
+    def reset(self):
+        """
+        Resets the generator for a new game without reading the word list file again.
+
+        The candidate_words list is restored to the loaded words and the game state is cleared.  The filters 
+        never modify a list in place, so the loaded list is shared rather than copied.  The game gets a new 
+        game_id, its dump file count restarts and its phases are timed as a new game of the timer.
+        """
+        self.candidate_words = self.loaded_words
+        self.global_state = self._empty_state()
+        self.applied_state = self._empty_state()
+        self.candidate_history = []
+        self.guessed_word = None
+        self.opening_guess = None
+        self.game_id = uuid.uuid4().hex
+        self.timer = self.timer.game(self.game_id)
+        self.dump_file_count = 0
+
+    def is_traced(self):
+        """
+        Tells whether the trace sink writes the records of the current game.
+
+        Returns:
+            bool: True if there is a trace sink and it traces this game.
+        """
+        return self.trace_sink is not None and self.trace_sink.enabled_for(self.game_id)
+
+    def trace(self, event, **fields):
+        """
+        Sends a trace record of the current game, tagged with its game_id and turn, to the trace sink.
+
+        Args:
+            event (str): The event name.
+            **fields: The JSON-serializable fields of the record.
+        """
+        if self.trace_sink is not None:
+            self.trace_sink.emit(self.game_id, event, turn=self.dump_file_count, **fields)
+
+    def clone(self):
+        """
+        Returns a new generator for a separate game that shares this generator's loaded word list.
+
+        The clone is a shallow copy that is reset, so it has its own game state and candidate list while the 
+        loaded words, letter matrix and any other read-only resources are shared.  Use it to play many games 
+        concurrently after loading the word list once.
+
+        Returns:
+            WordListGeneratorBase: The new generator.
+        """
+        clone = copy.copy(self)
+        clone.reset()
+        return clone
+
+    def fork(self):
+        """
+        Returns a copy of the generator in the current state of its game.
+
+        The game state and filter history are copied, so the fork can play a different continuation of the game, 
+        e.g. a speculative feedback, without changing this generator.  Like clone, the loaded word list and the 
+        candidate lists, which are never modified in place, are shared.
+
+        Returns:
+            WordListGeneratorBase: The fork.
+        """
+        fork = copy.copy(self)
+        fork.global_state = {key: set(value) for key, value in self.global_state.items()}
+        fork.applied_state = {key: set(value) for key, value in self.applied_state.items()}
+        fork.candidate_history = list(self.candidate_history)
+        return fork
+
+    def adopt(self, fork):
+        """
+        Continues the game from a fork of this generator, e.g. the speculative turn of the feedback that was given.
+
+        The game state, candidate list, filter history and turn count of the fork replace those of this 
+        generator, so the turn the fork already played is not filtered again.  The generator keeps its own 
+        trace sink and timer.
+
+        Args:
+            fork (WordListGeneratorBase): A fork of this generator, see fork().
+        """
+        trace_sink, timer = self.trace_sink, self.timer
+        self.__dict__.update(fork.__dict__)
+        self.trace_sink, self.timer = trace_sink, timer
+
+    def wait_for_responses(self, timeout=None):
+        """
+        Waits until the responses a game left streaming in the background are recorded, see 
+        WordListGeneratorLLM.  The other generators leave none.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each response. Defaults to waiting until they are recorded.
         """
-        with open(self.words_fp, 'r') as file:
-            self.candidate_words = [line.strip() for line in file]
     
-    def _eliminate_words_with_absent_letters(self):
+    def _eliminate_words_with_absent_letters(self, state=None):
         """
         Eliminate words from the candidate_words list that contain any of the absent letters.
 
         This method constructs a regular expression from the absent letters stored in the global_state dictionary and uses it to filter out any words in the candidate_words list that contain any of these letters.
+
+        Args:
+            state (dict, optional): The constraints to apply. Defaults to the global_state.
         """
-        letter_regex = '[' + ''.join(self.global_state["absent"]) + ']'
-        self.candidate_words = [word for word in self.candidate_words if not re.search(letter_regex, word)]
+        state = self.global_state if state is None else state
+        if len(state["absent"]) > 0:
+            letter_regex = '[' + ''.join(state["absent"]) + ']'
+            self.candidate_words = [word for word in self.candidate_words if not re.search(letter_regex, word)]
 
-    def _keep_words_with_correct_letters(self):
+    def _keep_words_with_correct_letters(self, state=None):
         """
         Retains only those words in the candidate_words list that have correct letters in the correct positions.
 
         This method constructs a regular expression pattern from the correct letters and their positions stored in the global_state dictionary. The pattern is then used to filter the candidate_words list, keeping only 
         those words that match the pattern.
+
+        Args:
+            state (dict, optional): The constraints to apply. Defaults to the global_state.
         """
+        state = self.global_state if state is None else state
         word_pattern = ["." for _ in range(5)]
-        for position, letter in self.global_state["correct"]:
+        for position, letter in state["correct"]:
             word_pattern[position] = letter
         regex = "^" + ''.join(word_pattern) + "$"
         correct_regex = re.compile(regex)
         self.candidate_words = [word for word in self.candidate_words if correct_regex.match(word)]
         
-    def _eliminate_words_with_present_letters(self):
+    def _eliminate_words_with_present_letters(self, state=None):
         """
         Eliminates words from the candidate_words list that have any of the present letters in the correct positions.
 
         This method constructs a regular expression pattern from the present letters and their positions stored in the global_state dictionary. The pattern is then used to filter the candidate_words list, eliminating any 
         words that match the pattern.
+
+        Args:
+            state (dict, optional): The constraints to apply. Defaults to the global_state.
         """
-        if len(self.global_state["present"]) > 0:
-            for position, letter in self.global_state["present"]:
+        state = self.global_state if state is None else state
+        if len(state["present"]) > 0:
+            for position, letter in state["present"]:
                 word_pattern = ["." for _ in range(5)]
                 word_pattern[position] = letter
                 regex = "^" + ''.join(word_pattern) + "$"
@@ -116,7 +299,161 @@ class WordListGeneratorBase:
 
                 self.candidate_words = new_list    
 
-    def update_state(self, result):
+    def _filter_words_with_letter_matrix(self, state=None):
+        """
+        Filters the candidate_words list with boolean mask operations over a uint8 letter matrix.
+
+        The letter matrix is encoded from the candidate_words list the first time it is needed and is then 
+        narrowed together with the list, so later turns only touch the surviving rows.
+
+        Args:
+            state (dict, optional): The constraints to apply. Defaults to the global_state.
+        """
+        state = self.global_state if state is None else state
+        if self._word_matrix is None or len(self._word_matrix) != len(self.candidate_words):
+            if self.candidate_words is self.loaded_words and self.loaded_word_matrix is not None:
+                self._word_matrix = self.loaded_word_matrix
+            else:
+                self._word_matrix = encode_words(self.candidate_words)
+                if self.candidate_words is self.loaded_words:
+                    self.loaded_word_matrix = self._word_matrix
+
+        mask = constraint_mask(self._word_matrix, state)
+        if not mask.all():
+            self._word_matrix = self._word_matrix[mask]
+            self.candidate_words = list(itertools.compress(self.candidate_words, mask.tolist()))
+
+    def _filter_words_with_bitset_index(self, state=None):
+        """
+        Filters the candidate_words list with AND/ANDNOT operations over the bitsets of a WordBitsetIndex.
+
+        The shared index of the words file is used when it holds every candidate word, otherwise a private 
+        index of the candidate_words list is built.
+
+        Args:
+            state (dict, optional): The constraints to apply. Defaults to the global_state.
+        """
+        state = self.global_state if state is None else state
+        if self._candidate_bits is None:
+            index = self.bitset_index
+            try:
+                bits = index.bits_for_words(self.candidate_words)
+            except KeyError:
+                index = WordBitsetIndex(self.candidate_words)
+                bits = index.all_bits
+            self._candidate_bits = (index, bits)
+
+        index, bits = self._candidate_bits
+        new_bits = index.candidate_bits(state, within=bits)
+        if new_bits != bits:
+            self._candidate_bits = (index, new_bits)
+            self.candidate_words = index.words_for(new_bits)
+
+    def _apply_opening_book(self, state):
+        """
+        Replaces the loaded words with the candidates the opening book holds for the feedback to the guessed word.
+
+        The book is only used when nothing has been filtered yet and the state is exactly the feedback to 
+        guessed_word, so the result is the same as filtering.
+
+        Args:
+            state (dict): The constraints to apply.
+
+        Returns:
+            bool: True if the candidate_words list was taken from the opening book.
+        """
+        if self.opening_book is None or self.guessed_word is None or self.candidate_words is not self.loaded_words:
+            return False
+        if any(self.applied_state.values()):
+            return False
+
+        entry = self.opening_book.lookup(self.guessed_word, state)
+        if entry is None:
+            return False
+
+        indices, self.opening_guess = entry
+        self.candidate_words = self.dictionary.words_for(indices)
+        self._word_matrix = None if self.loaded_word_matrix is None else self.loaded_word_matrix[indices]
+        self._candidate_bits = None
+        return True
+
+    def candidate_indices(self):
+        """
+        Returns the positions of the candidate words in the shared dictionary of the words file.
+
+        Returns:
+            numpy.ndarray: The int32 position of every candidate word, a compact handle on the candidates of a game.
+
+        Raises:
+            KeyError: If a candidate word is not in the dictionary.
+        """
+        return self.dictionary.indices_for(self.candidate_words)
+
+    @property
+    def bitset_index(self):
+        """
+        WordBitsetIndex: The bitset index of the words file, shared by every generator loading the same file.
+        """
+        return WordDictionary.for_file(self.words_fp).bitset_index
+
+    def count_candidates(self, state=None):
+        """
+        Counts the words of the words file that satisfy a game state, without building the list of words.
+
+        Args:
+            state (dict, optional): The game state to resolve. Defaults to the global_state.
+
+        Returns:
+            int: The number of candidate words.
+        """
+        return self.bitset_index.count(self.global_state if state is None else state)
+
+    def _new_constraints(self):
+        """
+        Returns the constraints of the global_state that have not been applied to candidate_words yet.
+
+        If candidate_words was replaced since the last filter pass, e.g. by load(), every constraint is new.
+
+        Returns:
+            dict: The "present", "correct" and "absent" constraints still to apply.
+        """
+        if self.candidate_words is not self._filtered_words:
+            self.applied_state = self._empty_state()
+            self._word_matrix = None
+            self._candidate_bits = None
+
+        return {
+            key: {constraint for constraint in self.global_state[key] if constraint not in self.applied_state[key]}
+            for key in self.applied_state
+        }
+
+    def rollback(self, turns=1):
+        """
+        Restores the candidate_words list from before the last filter passes.
+
+        Every call to update_candidate_words records the candidate words it started from and the constraints 
+        they satisfy, so rolling back only swaps references and never re-filters.  The global_state is reset to 
+        those constraints.  This supports what-if analysis and lookahead search: update the state with a 
+        hypothetical result, filter, inspect and roll back.
+
+        Args:
+            turns (int, optional): The number of filter passes to undo. Defaults to 1.
+
+        Raises:
+            ValueError: If fewer than turns filter passes have been recorded.
+        """
+        if turns < 1 or turns > len(self.candidate_history):
+            raise ValueError(f"Cannot roll back {turns} turns, {len(self.candidate_history)} recorded")
+
+        snapshot = self.candidate_history[-turns]
+        del self.candidate_history[-turns:]
+
+        self.candidate_words, self._word_matrix, self._candidate_bits, applied_state = snapshot
+        self._filtered_words = self.candidate_words
+        self.applied_state = {key: set(value) for key, value in applied_state.items()}
+        self.global_state = {key: set(value) for key, value in applied_state.items()}
+
+    def update_state(self, result, guess=None):
         """
         Updates the global_state dictionary with the new result.
 
@@ -125,20 +462,31 @@ class WordListGeneratorBase:
         - "correct": A set of tuples containing the letters that are in the word and in the correct position
         - "absent": A set of letters that are not present in the word
 
+        The guess that received the result is recorded as guessed_word, which the opening book and the decision 
+        tree need to look the feedback up.
+
         Args:
             result (dict): A dictionary containing the new state to be updated. The keys should match the keys in the global_state dictionary.
+            guess (str, optional): The guessed word. Defaults to None, which keeps the guessed_word set by the caller.
         """
+        if guess is not None:
+            self.guessed_word = guess
         for key in result:
             self.global_state[key].update(result[key])
 
     def print_state(self):
-        print(f"global_state: {self.global_state}")
+        """
+        Logs the global_state as a "state" event.
+        """
+        log_event(logger, logging.INFO, "state", "global_state: %s", self.global_state, global_state=self.global_state)
 
     def update_candidate_words(self):
         """
         Updates the candidate_words list based on the current global_state.
 
-        This method first eliminates words with absent letters, then eliminates words with present letters in the correct positions, and finally keeps words with correct letters in the correct positions. The size of the candidate_words list before and after the update is printed.
+        This method first eliminates words with absent letters, then eliminates words with present letters in the correct positions, and finally keeps words with correct letters in the correct positions. The size of the candidate_words list before and after the update is logged as a debug "filter" event.
+
+        Only the constraints added to the global_state since the last call are applied, since the candidate_words list already satisfies the earlier ones.  The candidate words and state before the update are recorded so the update can be undone with rollback.
 
         If dump_candidates is True, the updated candidate_words list is written to a file.
 
@@ -149,20 +497,53 @@ class WordListGeneratorBase:
         # Get the size of the candidate_words list before filtering
         before_size = len(self.candidate_words)
 
-        # Filter the candidate_words list to eliminate words with absent letters
-        self._eliminate_words_with_absent_letters()
+        # Only the constraints added since the last filter pass need to be applied
+        new_constraints = self._new_constraints()
+        self.candidate_history.append((
+            self.candidate_words,
+            self._word_matrix,
+            self._candidate_bits,
+            {key: set(value) for key, value in self.applied_state.items()},
+        ))
+
+        self.opening_guess = None
+        with self.timer.phase("filter.book"):
+            from_book = self._apply_opening_book(new_constraints)
+        if from_book:
+            # The candidates after the first guess were looked up in the opening book
+            pass
+        elif self.engine == "numpy":
+            # Apply all three constraints at once as boolean masks over the letter matrix
+            with self.timer.phase("filter.numpy"):
+                self._filter_words_with_letter_matrix(new_constraints)
+        elif self.engine == "bitset":
+            # Resolve all three constraints with bitwise operations on the shared index
+            with self.timer.phase("filter.bitset"):
+                self._filter_words_with_bitset_index(new_constraints)
+        else:
+            # Filter the candidate_words list to eliminate words with absent letters
+            with self.timer.phase("filter.absent"):
+                self._eliminate_words_with_absent_letters(new_constraints)
 
-        # Further filter the list to eliminate words with present letters in the incorrect positions
-        self._eliminate_words_with_present_letters()
+            # Further filter the list to eliminate words with present letters in the incorrect positions
+            with self.timer.phase("filter.present"):
+                self._eliminate_words_with_present_letters(new_constraints)
 
-        # Finally, keep only those words that have correct letters in the correct positions
-        self._keep_words_with_correct_letters()
+            # Finally, keep only those words that have correct letters in the correct positions
+            if len(new_constraints["correct"]) > 0 or self.applied_state == self._empty_state():
+                with self.timer.phase("filter.correct"):
+                    self._keep_words_with_correct_letters(new_constraints)
+
+        for key in new_constraints:
+            self.applied_state[key].update(new_constraints[key])
+        self._filtered_words = self.candidate_words
 
         # Get the size of the candidate_words list after filtering
         after_size = len(self.candidate_words)
 
-        # Print the size of the candidate_words list before and after filtering
-        print(f"before_size: {before_size}, after_size: {after_size}")
+        # Log the size of the candidate_words list before and after filtering
+        log_event(logger, logging.DEBUG, "filter", "before_size: %d, after_size: %d", before_size, after_size,
+                  before_size=before_size, after_size=after_size)
 
 
 class WordListGeneratorRandom(WordListGeneratorBase):
@@ -186,7 +567,8 @@ class WordListGeneratorRandom(WordListGeneratorBase):
         This method first updates the candidate_words list based on the current global_state. If the 
         list is empty after the update, it returns None. Otherwise, it returns a random word from the list.
 
-        If dump_candidates is True, the updated candidate_words list is written to a file.
+        Without a trace sink the updated candidate_words list is written to a file.  With a trace sink a 
+        "candidates" record with the words removed or kept by the update is sent to the sink instead.
 
         Args:
             dump_candidates (bool, optional): Whether to write the updated candidate_words list to a file. Defaults to False.
@@ -195,20 +577,28 @@ class WordListGeneratorRandom(WordListGeneratorBase):
             str or None: A random word from the candidate_words list, or None if the list is empty.
         """
 
+        previous_words = self.candidate_words
         self.update_candidate_words()
 
         # Increment the dump_file_count
         self.dump_file_count += 1
-        # Open a new file for writing
-        with open(
-            os.path.join(
-                self.dump_file_dir,
-                f"candidates_{self.dump_file_count:03}.txt",
-            ), 
-            'w'
-        ) as file:
-            # Write the candidate_words list to the file, one word per line
-            file.write('\n'.join(self.candidate_words))
+        if self.trace_sink is None:
+            # Open a new file for writing
+            with open(
+                os.path.join(
+                    self.dump_file_dir,
+                    f"candidates_{self.dump_file_count:03}.txt",
+                ), 
+                'w'
+            ) as file:
+                # Write the candidate_words list to the file, one word per line
+                file.write('\n'.join(self.candidate_words))
+        elif self.is_traced():
+            self.trace(
+                "candidates",
+                guessed_word=self.guessed_word,
+                **candidate_delta(previous_words, self.candidate_words)
+            )
 
         # Return a random word from the list of candidate words
         if len(self.candidate_words) == 0:
@@ -217,6 +607,222 @@ class WordListGeneratorRandom(WordListGeneratorBase):
             return random.choice(self.candidate_words)
 
 
+class WordListGeneratorEntropy(WordListGeneratorBase):
+    """
+    A class used to generate the guess that maximizes the expected information of the Wordle feedback.
+
+    This class inherits from the WordListGeneratorBase class and overrides the get_candidate_word method to 
+    score every word of the loaded dictionary by the entropy of the feedback partition it induces over the 
+    remaining candidate words, and return the best one.
+
+    Attributes:
+        candidate_words (list): A list of candidate words for the Wordle game.
+        global_state (dict): A dictionary that stores the current state of the Wordle game.
+        words_fp (str): The file path to the file containing the words.
+        guess_words (list): All words of the loaded dictionary, the pool of guesses to score.
+        pattern_table (PatternTable): The precomputed judge-rule pattern matrix, or None to compute patterns 
+            per turn.
+        build_table (bool): Whether load() builds and caches the pattern matrix when it is not cached yet.
+    """
+
+    def __init__(self, words_fp, dump_file_dir="llm_trace_data", engine="numpy", pattern_table=None,
+                 build_table=False):
+        """
+        Initializes the WordListGeneratorEntropy with the file path to the words file.
+
+        Guesses are scored with the pattern codes of WordleJudge.judge_guess, the feedback the candidate 
+        filters understand, so a pattern table must be built with JUDGE_RULES.
+
+        Args:
+            words_fp (str): The file path to the file containing the words.
+            dump_file_dir (str, optional): The directory for dump files. Defaults to "llm_trace_data".
+            engine (str, optional): The filtering engine, "regex" or "numpy". Defaults to "numpy".
+            pattern_table (PatternTable, optional): A precomputed judge-rule pattern matrix for the words file. 
+                If None, load() uses the cached matrix when it has been built and otherwise the patterns are 
+                computed for the remaining candidates on every turn. Defaults to None.
+            build_table (bool, optional): Whether load() builds and caches the matrix when it is not cached. 
+                Building it for the full word list takes several seconds once, but saves about as much on the 
+                first scored turn of every game. Defaults to False.
+
+        Raises:
+            ValueError: If the pattern table was not built with JUDGE_RULES.
+        """
+        super().__init__(words_fp, dump_file_dir, engine)
+        if pattern_table is not None and pattern_table.rules != JUDGE_RULES:
+            raise ValueError(f"The pattern table must use {JUDGE_RULES!r} rules, not {pattern_table.rules!r}")
+        self.pattern_table = pattern_table
+        self.build_table = build_table
+        self.guess_words = []
+
+    def load(self):
+        """
+        Loads the words file and keeps the full dictionary as the pool of guesses.
+        """
+        super().load()
+        self.guess_words = self.loaded_words
+        if self.loaded_word_matrix is None:
+            self.loaded_word_matrix = encode_words(self.loaded_words)
+
+        if self.pattern_table is None:
+            try:
+                self.pattern_table = PatternTable.load(self.words_fp, build=self.build_table, rules=JUDGE_RULES)
+            except FileNotFoundError:
+                log_event(logger, logging.WARNING, "no_pattern_table",
+                          "No judge-rule pattern table for %s, patterns are computed on every turn", self.words_fp,
+                          words_fp=self.words_fp)
+
+    def _candidate_patterns(self):
+        """
+        Returns the judge-rule pattern code of every guess against every remaining candidate word.
+
+        Returns:
+            numpy.ndarray: A (G, M) uint8 matrix with one row per guess word and one column per candidate word.
+        """
+        if self.pattern_table is not None and self.pattern_table.guess_words == self.guess_words:
+            answer_index = self.pattern_table.answer_index
+            if all(word in answer_index for word in self.candidate_words):
+                columns = [answer_index[word] for word in self.candidate_words]
+                return self.pattern_table.patterns[:, columns]
+
+        return build_pattern_matrix(self.loaded_word_matrix, encode_words(self.candidate_words), rules=JUDGE_RULES)
+
+    def score_guesses(self):
+        """
+        Scores every guess word by the entropy of the feedback partition over the candidate words.
+
+        Returns:
+            numpy.ndarray: The entropy in bits of each word in guess_words.
+        """
+        return pattern_entropy(self._candidate_patterns())
+
+    def get_candidate_word(self):
+        """
+        Updates the candidate_words list and returns the guess with the highest expected information.
+
+        Ties are broken in favour of words that are still candidates, since those can also win the game.  When 
+        only one or two candidates are left, the first candidate is returned directly.  After a booked opener 
+        the guess is taken from the opening book instead of scored.
+
+        Returns:
+            str or None: The recommended guess, or None if the candidate_words list is empty.
+        """
+        self.update_candidate_words()
+        if self.opening_guess is not None:
+            return self.opening_guess
+        with self.timer.phase("select"):
+            return self.best_guess()
+
+    def best_guess(self):
+        """
+        Returns the guess with the highest expected information over the candidate_words list.
+
+        Returns:
+            str or None: The recommended guess, or None if the candidate_words list is empty.
+        """
+        if len(self.candidate_words) == 0:
+            return None
+        elif len(self.candidate_words) <= 2:
+            return self.candidate_words[0]
+
+        scores = self.score_guesses()
+        candidate_set = set(self.candidate_words)
+        is_candidate = np.fromiter((word in candidate_set for word in self.guess_words), dtype=bool, count=len(self.guess_words))
+
+        # lexsort sorts by the last key first, so the best guess is the last index
+        best = np.lexsort((is_candidate, np.round(scores, 9)))[-1]
+        return self.guess_words[best]
+
+
+
+class WordListGeneratorTree(WordListGeneratorBase):
+    """
+    A class used to play the guesses of a precomputed decision tree, see decision_tree.build_decision_tree.
+
+    Every turn follows the feedback to the next node of the tree with one dictionary lookup, without filtering
+    or scoring the candidate words.  When a game leaves the tree, e.g. because the first guess is not the opener
+    of the tree or the answer is not in the answer list the tree was built for, the generator falls back to
+    filtering the candidate words and guessing the first one.
+
+    Attributes:
+        tree (DecisionTree): The decision tree.
+        tree_fp (str): The file path to the decision tree, loaded by load() when tree is None.
+        tree_node (int): The node of the tree of the current game, or None once the game has left the tree.
+    """
+
+    def __init__(self, words_fp, tree_fp=None, dump_file_dir="llm_trace_data", engine="regex", tree=None):
+        """
+        Initializes the WordListGeneratorTree with the file paths to the words file and the decision tree.
+
+        Args:
+            words_fp (str): The file path to the file containing the words, used when a game leaves the tree.
+            tree_fp (str, optional): The file path to a tree written by DecisionTree.save. Defaults to None.
+            dump_file_dir (str, optional): The directory for dump files. Defaults to "llm_trace_data".
+            engine (str, optional): The filtering engine used when a game leaves the tree. Defaults to "regex".
+            tree (DecisionTree, optional): A loaded tree, used instead of tree_fp. Defaults to None.
+        """
+        super().__init__(words_fp, dump_file_dir, engine)
+        self.tree_fp = tree_fp
+        self.tree = tree
+        self.tree_node = ROOT
+
+    @property
+    def first_word(self):
+        """
+        str: The opener of the tree, the first guess of every game that stays in the tree.
+        """
+        return self.tree.opener
+
+    def load(self):
+        """
+        Loads the words file and, unless a tree was given, the decision tree.
+
+        Raises:
+            ValueError: If neither a tree nor a tree file path was given.
+        """
+        super().load()
+        if self.tree is None:
+            if self.tree_fp is None:
+                raise ValueError("WordListGeneratorTree needs a tree or a tree_fp")
+            self.tree = DecisionTree.load(self.tree_fp)
+
+    def reset(self):
+        """
+        Resets the generator for a new game, starting at the root of the tree.
+        """
+        super().reset()
+        self.tree_node = ROOT
+
+    def update_state(self, result, guess=None):
+        """
+        Updates the global_state dictionary and follows the feedback to the guessed_word in the tree.
+
+        Args:
+            result (dict): The result of judging guessed_word.
+            guess (str, optional): The guessed word. Defaults to None, which keeps the guessed_word set by the caller.
+        """
+        super().update_state(result, guess)
+        if self.tree_node is None:
+            return
+        if self.guessed_word != self.tree.guesses[self.tree_node]:
+            self.tree_node = None
+        else:
+            self.tree_node = self.tree.child(self.tree_node, result_to_pattern(self.guessed_word, result))
+
+    def get_candidate_word(self):
+        """
+        Returns the guess of the current node of the tree, or the first candidate word once the game left the tree.
+
+        Returns:
+            str or None: The next guess, or None if the game left the tree and no candidate words are left.
+        """
+        if self.tree_node is not None:
+            return self.tree.guesses[self.tree_node]
+
+        self.update_candidate_words()
+        if len(self.candidate_words) == 0:
+            return None
+        return self.candidate_words[0]
+
 class WordListGeneratorLLM(WordListGeneratorBase):
     """
     A class used to generate a list of candidate words for the Wordle game using a Language Model (LLM).
@@ -231,11 +837,20 @@ class WordListGeneratorLLM(WordListGeneratorBase):
         global_state (dict): A dictionary that stores the current state of the Wordle game.
         words_fp (str): The file path to the file containing the words.
         dump_file_count (int): The number of times the candidate_words list has been dumped to a file.
+        llm_interface (OpenAIInterface): The interface used by get_candidate_word to ask the LLM for a recommendation.
+        token_budget (int or None): The most tokens of a prompt, or None to sample MAX_SIZE candidate words.
+        rank_by (str): How candidate words are ranked to fill the token budget, see prompt_builder.py.
+        answers_fp (str or None): The file path to the answer list used by the "answers" ranking.
+        answer_words (set or None): The words of the answer list, read by load().
+        prompt_tokens (int or None): The number of tokens of the last prompt.
+        stream (bool): Whether get_candidate_word streams the LLM response and returns at its recommendation.
+        pending_responses (list): The StreamedChat of the streamed responses that may still be streaming.
     """
 
     MAX_SIZE = 25
 
-    def __init__(self, words_fp):
+    def __init__(self, words_fp, engine="regex", llm_interface=None, token_budget=None, rank_by=DEFAULT_RANKING,
+                 answers_fp=None, stream=False):
         """
         Initializes the WordListGeneratorLLM with the file path to the words file.
 
@@ -243,10 +858,34 @@ class WordListGeneratorLLM(WordListGeneratorBase):
 
         Args:
             words_fp (str): The file path to the file containing the words.
+            engine (str, optional): The filtering engine, "regex", "numpy" or "bitset". Defaults to "regex".
+            llm_interface (OpenAIInterface, optional): The interface used by get_candidate_word. Defaults to None.
+            token_budget (int, optional): The most tokens of a prompt. Defaults to None, which samples MAX_SIZE 
+                candidate words.
+            rank_by (str, optional): "coverage", "answers" or "partition". Defaults to DEFAULT_RANKING.
+            answers_fp (str, optional): The file path to the answer list used by the "answers" ranking. Defaults 
+                to None.
+            stream (bool, optional): Streams the LLM responses with OpenAIInterface.chat_stream. Defaults to False.
         """
 
-        super().__init__(words_fp)
+        super().__init__(words_fp, engine=engine)
         self.guessed_word = None
+        self.llm_interface = llm_interface
+        self.token_budget = token_budget
+        self.rank_by = rank_by
+        self.answers_fp = answers_fp
+        self.answer_words = None
+        self.prompt_tokens = None
+        self.stream = stream
+        self.pending_responses = []
+
+    def load(self):
+        """
+        Loads the words file and the answer list of the "answers" ranking, if any.
+        """
+        super().load()
+        if self.answers_fp is not None:
+            self.answer_words = {word.lower() for word in WordDictionary.for_file(self.answers_fp).words}
 
     @staticmethod
     def _generate_position_text(position):
@@ -294,30 +933,25 @@ class WordListGeneratorLLM(WordListGeneratorBase):
 
         This method first updates the candidate_words list. If the list is empty, it returns None. 
         Otherwise, it generates prompts for correct, absent, and present letters. It then constructs 
-        a list of candidate words. If the list is too long, it randomly samples a subset of 
-        the words. The prompts and the list of candidate words are written to a file.
+        a list of candidate words. Without a token budget, if the list is too long, it randomly samples 
+        a subset of the words.  With a token budget, the words are ranked and the best ones that fit the 
+        budget are listed, best first.  The prompts and the list of candidate words are written to a file, 
+        or sent to the trace sink as a "prompt" record if there is one, with the token count of the prompt.
 
         Returns:
             str or None: A string that contains the generated prompt, or None if the candidate_words list is empty.
         """
 
+        previous_words = self.candidate_words
         self.update_candidate_words()
 
         if len(self.candidate_words) == 0:
             return None
         else:
             # generate prompt for LLM
-
-            if len(self.candidate_words) > self.MAX_SIZE:
-                # hueristic: if the candidate word list is too long and will exceed the LLM token limit
-                 self.prompt_word_list = '\n'.join(sorted(random.sample(self.candidate_words, self.MAX_SIZE)))
-            else:
-                # otherwise, just the whole list for the prompt
-                self.prompt_word_list = '\n'.join(sorted(self.candidate_words))
-
             present_word_prompt = self.generate_present_letter_prompt()
 
-            generated_prompt = (
+            prompt_header = (
                 "Solve the puzzle by guessing a five-letter word using these clues.\n"
                 + present_word_prompt 
                 + "\nIf there is only one word that meets the above criteria, "
@@ -329,10 +963,45 @@ class WordListGeneratorLLM(WordListGeneratorBase):
                 + "Return only a json structure with the key 'recommendation' for "
                 + "the recommended word and 'explanation' for your explantion.\n"
                 + "List of candidate words:\n"
-                + self.prompt_word_list
             )
 
+            if self.token_budget is not None:
+                # fill the token budget with the highest ranked candidate words
+                ranked_words = rank_candidates(self.candidate_words, self.rank_by, self.answer_words)
+                prompt_words, self.prompt_tokens = fill_word_list(prompt_header, ranked_words, self.token_budget)
+                self.prompt_word_list = '\n'.join(prompt_words)
+            elif len(self.candidate_words) > self.MAX_SIZE:
+                # hueristic: if the candidate word list is too long and will exceed the LLM token limit
+                 self.prompt_word_list = '\n'.join(sorted(random.sample(self.candidate_words, self.MAX_SIZE)))
+            else:
+                # otherwise, just the whole list for the prompt
+                self.prompt_word_list = '\n'.join(sorted(self.candidate_words))
+
+            generated_prompt = prompt_header + self.prompt_word_list
+            if self.token_budget is None:
+                # without a budget the count is only reported, so the estimate avoids loading tiktoken
+                self.prompt_tokens = estimate_tokens(generated_prompt)
+            prompt_words = self.prompt_word_list.count('\n') + 1
+            log_event(logger, logging.DEBUG, "prompt", "prompt_tokens: %d, prompt_words: %d", self.prompt_tokens,
+                      prompt_words, prompt_tokens=self.prompt_tokens, prompt_words=prompt_words)
+
             self.dump_file_count += 1
+            self.dump_prompt(generated_prompt, previous_words)
+
+            return generated_prompt
+
+    def dump_prompt(self, generated_prompt, previous_words):
+        """
+        Writes the prompt of the current turn to the prompts file of the turn, or sends it to the trace sink as a 
+        "prompt" record if there is one.
+
+        The prompts file has a "prompt tokens: N" line and a blank line between the global state and the prompt.
+
+        Args:
+            generated_prompt (str): The prompt.
+            previous_words (list): The candidate_words list before the turn, to record the words it removed.
+        """
+        if self.trace_sink is None:
             with open(
                 os.path.join(
                     self.dump_file_dir, 
@@ -342,10 +1011,121 @@ class WordListGeneratorLLM(WordListGeneratorBase):
             ) as file:
                 file.write(f"guessed word: {self.guessed_word}\n")
                 pretty_global_state = pp.pformat(self.global_state)
-                file.write(f"global_state:\n{pretty_global_state}\n\n")
+                file.write(f"global_state:\n{pretty_global_state}\n")
+                file.write(f"prompt tokens: {self.prompt_tokens}\n\n")
                 file.write(generated_prompt)
+        elif self.is_traced():
+            self.trace(
+                "prompt",
+                guessed_word=self.guessed_word,
+                global_state=state_to_json(self.global_state),
+                prompt=generated_prompt,
+                prompt_tokens=self.prompt_tokens,
+                **candidate_delta(previous_words, self.candidate_words)
+            )
 
-            return generated_prompt
+    def get_candidate_word(self):
+        """
+        Generates the prompt for the current state, sends it to the LLM and returns the recommended word.
+
+        The LLM response is written to a file next to the prompt file.  When streaming, the recommended word
+        is returned as soon as it has streamed in, and the whole response is written once the explanation 
+        has streamed in the background.
+
+        Returns:
+            str or None: The recommended word, or None if the candidate_words list is empty.
+        """
+        with self.timer.phase("prompt"):
+            generated_prompt = self.generate_llm_prompt()
+        if generated_prompt is None:
+            return None
+
+        if self.stream:
+            with self.timer.phase("llm"):
+                streamed = self.llm_interface.chat_stream(generated_prompt)
+                recommendation = streamed.recommendation()
+            self._record_when_streamed(streamed)
+            return recommendation
+
+        with self.timer.phase("llm"):
+            llm_response = json.loads(self.llm_interface.chat(generated_prompt))
+        self.record_llm_response(llm_response)
+
+        return llm_response["recommendation"]
+
+    def _record_when_streamed(self, streamed):
+        """
+        Records a streamed LLM response under the game and turn of its prompt once it has streamed in.
+        """
+        game_id, turn = self.game_id, self.dump_file_count
+
+        def record(streamed):
+            if streamed.error is not None:
+                # logged by the StreamedChat
+                return
+            try:
+                llm_response = json.loads(streamed.content())
+            except json.JSONDecodeError as e:
+                log_event(logger, logging.WARNING, "llm_parse_error", "Could not parse the LLM response: %s", e,
+                          error=repr(e))
+                return
+            self.record_llm_response(llm_response, game_id=game_id, turn=turn)
+
+        self.pending_responses = [pending for pending in self.pending_responses if not pending.wait(0)]
+        self.pending_responses.append(streamed)
+        streamed.add_done_callback(record)
+
+    def wait_for_responses(self, timeout=None):
+        """
+        Waits until the streamed LLM responses have streamed in and been recorded.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each response. Defaults to waiting until they are recorded.
+        """
+        for streamed in self.pending_responses:
+            streamed.wait(timeout)
+        self.pending_responses = [pending for pending in self.pending_responses if not pending.wait(0)]
+
+    def record_llm_response(self, llm_response, game_id=None, turn=None):
+        """
+        Writes the LLM response to the prompt to a file next to the prompt file, or sends it to the trace 
+        sink as an "llm_response" record if there is one.
+
+        Args:
+            llm_response (dict): The parsed LLM response.
+            game_id (str, optional): The game of the prompt. Defaults to the current game.
+            turn (int, optional): The turn of the prompt. Defaults to the current turn.
+        """
+        game_id = self.game_id if game_id is None else game_id
+        turn = self.dump_file_count if turn is None else turn
+        if self.trace_sink is not None:
+            self.trace_sink.emit(game_id, "llm_response", turn=turn, response=llm_response)
+            return
+
+        with open(
+            os.path.join(
+                self.dump_file_dir,
+                f"llm_response_{turn:03}.txt"
+            ),
+            'w'
+        ) as file:
+            file.write(json.dumps(llm_response, indent=4))
+
+
+# the OpenAI SDK takes longer to import than the rest of the solver, so it is imported on first use
+_OPENAI_CLIENT_CLASSES = ("OpenAI", "AsyncOpenAI")
+
+
+def __getattr__(name):
+    if name in _OPENAI_CLIENT_CLASSES:
+        import openai
+        return getattr(openai, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _openai_client_class(name):
+    # looked up on the module, so a patched wordle_solver.OpenAI is used
+    return getattr(sys.modules[__name__], name)
 
 
 class OpenAIInterface:
@@ -357,9 +1137,10 @@ class OpenAIInterface:
     Attributes:
         api_key_file (str): The location of a JSON file with the API key.
         model (str): The specific model to use.
+        cache (PromptCache): The prompt to response cache, or None to always call the API.
     """
 
-    def __init__(self, api_key, model="gpt-4"):
+    def __init__(self, api_key, model="gpt-4", base_url=None, cache=None, client=None):
         """
         Initializes the OpenAIInterface with the API key and the model.
 
@@ -369,45 +1150,191 @@ class OpenAIInterface:
         Args:
             api_key (str): API key string
             model (str, optional): The specific model to use. Defaults to "gpt-4".
+            base_url (str, optional): The base URL of an OpenAI-compatible API, e.g. a local FakeOpenAIServer. 
+                Defaults to the OpenAI API.
+            cache (PromptCache, optional): Answers repeated requests without calling the API. Defaults to None.
+            client (OpenAI, optional): A client to share, e.g. from openai_clients.shared_client. Defaults to a new client.
         """
 
-        self.openai_client = OpenAI(api_key=api_key)
+        self.openai_client = client if client is not None else _openai_client_class("OpenAI")(api_key=api_key, base_url=base_url)
         self.model = model
+        self.cache = cache
 
-    def chat(self, prompt):
+    def _completion_kwargs(self, prompt):
+        """
+        Returns the arguments of the chat completions request for a prompt.
+
+        Args:
+            prompt (str): The prompt to use.
+
+        Returns:
+            dict: The keyword arguments for chat.completions.create.
+        """
+        return dict(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant to solve the Wordle puzzle."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.1,
+            max_tokens=4096,
+            top_p=1,
+            frequency_penalty=0,
+            presence_penalty=0
+        )
+
+    def _cache_key(self, completion_kwargs, bypass_cache):
+        """
+        Returns the cache key of a request, or None if the request must not use the cache.
+        """
+        if self.cache is None or bypass_cache:
+            return None
+        return self.cache.key(
+            completion_kwargs["model"],
+            completion_kwargs["temperature"],
+            completion_kwargs["messages"],
+        )
+
+    def chat(self, prompt, bypass_cache=False):
         """
         Invokes the chat API with a given prompt and returns the contents to the caller.
 
+        With a cache, a request seen before is answered from the cache and a new response is stored in it.
+
         Args:
             prompt (str): The prompt to use.
+            bypass_cache (bool, optional): Neither reads nor writes the cache for this request. Defaults to False.
 
         Returns:
             dict: The contents returned by the chat API.
         """
+        completion_kwargs = self._completion_kwargs(prompt)
+        cache_key = self._cache_key(completion_kwargs, bypass_cache)
+        if cache_key is not None:
+            content = self.cache.get(cache_key)
+            if content is not None:
+                return content
+
         try:
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant to solve the Wordle puzzle."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=4096,
-                top_p=1,
-                frequency_penalty=0,
-                presence_penalty=0
-            )
-            return response.choices[0].message.content
+            response = self.openai_client.chat.completions.create(**completion_kwargs)
+            content = response.choices[0].message.content
         except Exception as e:
-            print(f"An error occurred: {e}")
+            log_event(logger, logging.ERROR, "llm_error", "An error occurred: %s", e, error=repr(e))
             raise    
 
+        if cache_key is not None and content is not None:
+            self.cache.put(cache_key, content)
+        return content
+
+    def chat_stream(self, prompt, bypass_cache=False):
+        """
+        Invokes the chat API with a given prompt and streams the contents in a background thread.
+
+        The recommendation of the JSON contents can be read from the returned StreamedChat before the rest 
+        of the contents has streamed in.  With a cache, a request seen before is answered from the cache and 
+        a new response is stored in it once it has streamed in.
+
+        Args:
+            prompt (str): The prompt to use.
+            bypass_cache (bool, optional): Neither reads nor writes the cache for this request. Defaults to False.
+
+        Returns:
+            StreamedChat: The streaming contents.
+        """
+        completion_kwargs = self._completion_kwargs(prompt)
+        cache_key = self._cache_key(completion_kwargs, bypass_cache)
+        if cache_key is not None:
+            content = self.cache.get(cache_key)
+            if content is not None:
+                return StreamedChat.from_content(content)
+
+        try:
+            response = self.openai_client.chat.completions.create(stream=True, **completion_kwargs)
+        except Exception as e:
+            log_event(logger, logging.ERROR, "llm_error", "An error occurred: %s", e, error=repr(e))
+            raise
+
+        streamed = StreamedChat(
+            chunk.choices[0].delta.content
+            for chunk in response if chunk.choices and chunk.choices[0].delta.content
+        )
+        if cache_key is not None:
+            def store(streamed):
+                if streamed.error is None:
+                    self.cache.put(cache_key, streamed.content())
+
+            streamed.add_done_callback(store)
+        return streamed
+
+
+class AsyncOpenAIInterface(OpenAIInterface):
+    """
+    An asyncio variant of OpenAIInterface.
+
+    The chat method is a coroutine, so one event loop can keep many chat requests in flight at once.
+
+    Attributes:
+        model (str): The specific model to use.
+        cache (PromptCache): The prompt to response cache, or None to always call the API.
+    """
+
+    def __init__(self, api_key, model="gpt-4", base_url=None, cache=None, client=None):
+        """
+        Initializes the AsyncOpenAIInterface with the API key and the model.
+
+        Args:
+            api_key (str): API key string
+            model (str, optional): The specific model to use. Defaults to "gpt-4".
+            base_url (str, optional): The base URL of an OpenAI-compatible API. Defaults to the OpenAI API.
+            cache (PromptCache, optional): Answers repeated requests without calling the API. Defaults to None.
+            client (AsyncOpenAI, optional): A client to share, e.g. from openai_clients.shared_client. Defaults to a new client.
+        """
+
+        self.openai_client = client if client is not None else _openai_client_class("AsyncOpenAI")(api_key=api_key, base_url=base_url)
+        self.model = model
+        self.cache = cache
+
+    async def chat(self, prompt, bypass_cache=False):
+        """
+        Invokes the chat API with a given prompt and returns the contents to the caller.
+
+        The cache is read and written in a worker thread, so its blocking SQLite calls do not hold up the other 
+        coroutines of the event loop.
+
+        Args:
+            prompt (str): The prompt to use.
+            bypass_cache (bool, optional): Neither reads nor writes the cache for this request. Defaults to False.
+
+        Returns:
+            str: The contents returned by the chat API.
+        """
+        # asyncio is loaded by the running event loop, it is not imported with this module for the sync solvers
+        import asyncio
+
+        completion_kwargs = self._completion_kwargs(prompt)
+        cache_key = self._cache_key(completion_kwargs, bypass_cache)
+        if cache_key is not None:
+            content = await asyncio.to_thread(self.cache.get, cache_key)
+            if content is not None:
+                return content
+
+        try:
+            response = await self.openai_client.chat.completions.create(**completion_kwargs)
+            content = response.choices[0].message.content
+        except Exception as e:
+            log_event(logger, logging.ERROR, "llm_error", "An error occurred: %s", e, error=repr(e))
+            raise
+
+        if cache_key is not None and content is not None:
+            await asyncio.to_thread(self.cache.put, cache_key, content)
+        return content
+
 class ExperimentRecorder:
     """
     A class used to record the results of an experiment.
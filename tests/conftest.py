@@ -0,0 +1,31 @@
+import sys
+sys.path.append('./src')
+
+import pytest
+
+from fake_openai_server import FakeOpenAIServer
+
+WORDS = ["apple", "water", "zebra", "trace", "crate", "grace", "brace", "place"]
+
+
+@pytest.fixture
+def words():
+    """The word list written by word_file; a test module overrides it to test another list."""
+    return list(WORDS)
+
+@pytest.fixture
+def word_file(tmp_path, words):
+    file_path = tmp_path / "words.txt"
+    file_path.write_text("\n".join(words) + "\n")
+    return str(file_path)
+
+@pytest.fixture
+def fake_server_options():
+    """The FakeOpenAIServer arguments of fake_server; a test module overrides it to add latency or chunk delays."""
+    return {}
+
+@pytest.fixture
+def fake_server(fake_server_options):
+    server = FakeOpenAIServer(**fake_server_options).start()
+    yield server
+    server.stop()
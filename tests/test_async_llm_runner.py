@@ -0,0 +1,67 @@
+import sys
+sys.path.append('./src')
+
+import asyncio
+
+import pytest
+
+from async_llm_runner import play_llm_game_async, run_llm_games_async
+from fake_openai_server import FakeOpenAIServer, recommend_from_prompt
+from wordle_solver import AsyncOpenAIInterface, OpenAIInterface, WordListGeneratorLLM
+
+
+@pytest.fixture
+def fake_server_options():
+    return {"latency": 0.05}
+
+
+def test_recommend_from_prompt():
+    assert recommend_from_prompt("Solve it.\nList of candidate words:\nbrace\ngrace") == "brace"
+    assert recommend_from_prompt("no list") == ""
+
+def test_sync_interface_against_fake_server(fake_server):
+    openai_interface = OpenAIInterface("local", base_url=fake_server.base_url)
+    content = openai_interface.chat("List of candidate words:\nwater\nzebra")
+    assert '"recommendation": "water"' in content
+    assert fake_server.request_count == 1
+
+def test_play_llm_game_async(fake_server, word_file, tmp_path):
+    wordle_virtual_assistant = WordListGeneratorLLM(word_file)
+    wordle_virtual_assistant.dump_file_dir = str(tmp_path)
+    wordle_virtual_assistant.load()
+    llm_interface = AsyncOpenAIInterface("local", base_url=fake_server.base_url)
+
+    word, num_attempts = asyncio.run(play_llm_game_async(wordle_virtual_assistant, llm_interface, "zebra", "trace"))
+    assert word == "zebra"
+    assert num_attempts > 1
+
+def test_run_llm_games_async_respects_concurrency(fake_server, word_file, tmp_path):
+    llm_interface = AsyncOpenAIInterface("local", base_url=fake_server.base_url)
+    answers = ["apple", "water", "zebra", "crate", "brace", "place"]
+
+    results = asyncio.run(run_llm_games_async(
+        llm_interface, answers, first_word="trace", concurrency=3,
+        words_fp=word_file, dump_file_dir=str(tmp_path),
+    ))
+
+    assert [result.answer for result in results] == answers
+    assert all(result.word == result.answer for result in results)
+    assert fake_server.max_in_flight <= 3
+    assert fake_server.max_in_flight > 1
+
+def test_malformed_answer_only_fails_its_game(word_file, tmp_path):
+    # the game of zebra is the only one whose candidate list starts with zebra after trace
+    server = FakeOpenAIServer(replier=lambda prompt: "not json" if recommend_from_prompt(prompt) == "zebra" else None)
+    server.start()
+    try:
+        llm_interface = AsyncOpenAIInterface("local", base_url=server.base_url)
+        results = asyncio.run(run_llm_games_async(
+            llm_interface, ["apple", "zebra", "water"], first_word="trace", words_fp=word_file,
+            dump_file_dir=str(tmp_path),
+        ))
+    finally:
+        server.stop()
+
+    assert [result.answer for result in results] == ["apple", "zebra", "water"]
+    assert [result.word for result in results] == ["apple", None, "water"]
+    assert results[1].num_attempts == 1
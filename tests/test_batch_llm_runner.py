@@ -0,0 +1,110 @@
+import sys
+sys.path.append('./src')
+
+import json
+import logging
+
+import openai
+import pytest
+
+from batch_llm_runner import BatchChat, build_batch_prompt, parse_batch_response, run_llm_games_batched
+from fake_openai_server import recommend_from_prompt
+from solver_logging import LOGGER_NAME
+from wordle_solver import OpenAIInterface
+
+
+class StubInterface:
+    """
+    Answers batched prompts with a fixed reply and individual prompts like the fake server.
+    """
+
+    def __init__(self, batch_reply, batch_error=None):
+        self.batch_reply = batch_reply
+        self.batch_error = batch_error
+        self.prompts = []
+
+    def chat(self, prompt):
+        self.prompts.append(prompt)
+        if prompt.startswith("Solve each of the following"):
+            if self.batch_error is not None:
+                raise self.batch_error
+            return self.batch_reply
+        return json.dumps({"recommendation": recommend_from_prompt(prompt), "explanation": ""})
+
+
+def test_build_batch_prompt_numbers_puzzles():
+    prompt = build_batch_prompt(["first prompt", "second prompt"])
+    assert "### Puzzle 1\nfirst prompt" in prompt
+    assert "### Puzzle 2\nsecond prompt" in prompt
+    assert "json array" in prompt
+
+def test_parse_batch_response_demultiplexes_by_game():
+    content = json.dumps([
+        {"game": 2, "recommendation": "Grace", "explanation": "b"},
+        {"game": 1, "recommendation": "trace", "explanation": "a"},
+    ])
+    assert parse_batch_response(content, 2) == [
+        {"recommendation": "trace", "explanation": "a"},
+        {"recommendation": "grace", "explanation": "b"},
+    ]
+
+def test_parse_batch_response_accepts_code_fence_and_position():
+    content = '```json\n[{"recommendation": "trace"}, {"recommendation": "grace"}]\n```'
+    assert [response["recommendation"] for response in parse_batch_response(content, 2)] == ["trace", "grace"]
+
+@pytest.mark.parametrize("content", [
+    None,
+    "not json",
+    json.dumps({"recommendation": "trace"}),
+    json.dumps([{"game": 1, "recommendation": "toolong"}, {"game": 5, "recommendation": "grace"}]),
+    json.dumps([{"game": True, "recommendation": "trace"}, "grace"]),
+])
+def test_parse_batch_response_rejects_malformed_answers(content):
+    assert parse_batch_response(content, 2) == [None, None]
+
+def test_batch_chat_falls_back_for_missing_games():
+    stub = StubInterface(json.dumps([{"game": 2, "recommendation": "grace", "explanation": ""}]))
+    batch_chat = BatchChat(stub, batch_size=4)
+    prompts = ["List of candidate words:\ntrace", "List of candidate words:\nbrace", "List of candidate words:\ncrate"]
+
+    responses = batch_chat.chat(prompts)
+    assert [response["recommendation"] for response in responses] == ["trace", "grace", "crate"]
+    assert batch_chat.batch_requests == 1
+    assert batch_chat.fallback_requests == 2
+    assert stub.prompts[1:] == [prompts[0], prompts[2]]
+
+def test_batch_chat_splits_into_batches():
+    stub = StubInterface("[]")
+    batch_chat = BatchChat(stub, batch_size=2)
+    responses = batch_chat.chat(["List of candidate words:\ntrace"] * 5)
+    assert len(responses) == 5
+    assert batch_chat.batch_requests == 2
+    assert batch_chat.fallback_requests == 4
+
+def test_batch_chat_falls_back_after_api_errors(caplog):
+    batch_chat = BatchChat(StubInterface("[]", batch_error=openai.APIConnectionError(request=None)), batch_size=2)
+    with caplog.at_level(logging.WARNING, logger=LOGGER_NAME):
+        responses = batch_chat.chat(["List of candidate words:\ntrace", "List of candidate words:\ngrace"])
+    assert [response["recommendation"] for response in responses] == ["trace", "grace"]
+    assert batch_chat.fallback_requests == 2
+    assert [record.event for record in caplog.records] == ["batch_error"]
+    assert caplog.records[0].fields["games"] == 2
+
+def test_batch_chat_raises_other_errors():
+    batch_chat = BatchChat(StubInterface("[]", batch_error=TypeError("bug")), batch_size=2)
+    with pytest.raises(TypeError):
+        batch_chat.chat(["List of candidate words:\ntrace"] * 2)
+
+def test_run_llm_games_batched_against_fake_server(fake_server, word_file, tmp_path):
+    llm_interface = OpenAIInterface("local", base_url=fake_server.base_url)
+    answers = ["zebra", "place", "water"]
+
+    results, batch_chat = run_llm_games_batched(
+        llm_interface, answers, trials=2, first_word="trace", batch_size=4, seed=3,
+        words_fp=word_file, dump_file_dir=str(tmp_path),
+    )
+
+    assert [result.answer for result in results] == ["zebra", "zebra", "place", "place", "water", "water"]
+    assert all(result.word == result.answer for result in results)
+    assert batch_chat.fallback_requests == 0
+    assert fake_server.request_count < sum(result.num_attempts - 1 for result in results)
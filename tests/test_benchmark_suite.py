@@ -0,0 +1,43 @@
+import sys
+sys.path.append('./src')
+
+from benchmark_suite import Benchmark, GAME_STATES, build_benchmarks, compare, game_state, run_benchmarks, time_benchmark
+
+
+def run_of(**medians):
+    return {"results": {name: {"median_us": median, "min_us": median} for name, median in medians.items()}}
+
+
+def test_game_state():
+    state = game_state("cigar", ["trace"])
+    assert state["correct"] == set()
+    assert state["present"] == {(1, 'r'), (2, 'a'), (3, 'c')}
+    assert state["absent"] == {'t', 'e'}
+
+def test_time_benchmark_runs_setup_before_every_call():
+    calls = []
+    benchmark = Benchmark("count", lambda: calls.append("setup"), lambda: calls.append("run"))
+    timing = time_benchmark(benchmark, rounds=2, min_time=0)
+    assert timing["rounds"] == 2
+    assert calls == ["setup", "run"] * (timing["calls"] * 3)
+    assert 0 <= timing["min_us"] <= timing["median_us"]
+
+def test_compare_flags_regressions():
+    baseline = run_of(fast=10.0, slow=10.0, removed=5.0)
+    comparisons = compare(run_of(fast=11.0, slow=20.0, added=1.0), baseline, threshold=0.25)
+    assert comparisons == [("fast", 10.0, 11.0, 1.1, False), ("slow", 10.0, 20.0, 2.0, True)]
+
+def test_benchmarks_cover_the_hot_paths():
+    names = [benchmark.name for benchmark in build_benchmarks()]
+    assert "load[cold]" in names
+    assert "_eliminate_words_with_present_letters[turn2]" in names
+    for engine in ("regex", "numpy", "bitset"):
+        for state_name in GAME_STATES:
+            assert f"update_candidate_words[{engine},{state_name}]" in names
+    assert any(name.startswith("judge_guess") for name in names)
+    assert "generate_llm_prompt[turn3]" in names
+
+def test_run_benchmarks_filters_by_name():
+    results = run_benchmarks(build_benchmarks(), rounds=1, min_time=0, name_filter="numpy,turn4")
+    assert list(results["results"]) == ["update_candidate_words[numpy,turn4]"]
+    assert "python" in results["metadata"]
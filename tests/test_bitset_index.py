@@ -0,0 +1,70 @@
+import sys
+sys.path.append('./src')
+
+import pytest
+
+from bitset_index import WordBitsetIndex
+from word_dictionary import WordDictionary
+from wordle_solver import WordListGeneratorBase, WordListGeneratorRandom, WordListGeneratorLLM
+from wordle_judge import WordleJudge
+
+WORDS_FP = "data/five-letter-words.txt"
+
+
+def test_candidate_bits():
+    index = WordBitsetIndex(["apple", "water", "zebra"])
+    assert index.all_bits == 0b111
+    assert index.candidate_bits({"absent": {'z'}}) == 0b011
+    assert index.candidate_bits({"present": {(0, 'a')}}) == 0b110
+    assert index.candidate_bits({"correct": {(1, 'a')}}) == 0b010
+    assert index.candidate_bits({"absent": {'w'}}, within=0b011) == 0b001
+
+def test_count_and_words_for():
+    index = WordBitsetIndex(["apple", "water", "zebra"])
+    state = {"present": set(), "correct": set(), "absent": {'p'}}
+    assert index.count(state) == 2
+    assert index.words_for(index.candidate_bits(state)) == ["water", "zebra"]
+    assert index.words_for(0) == []
+    assert index.bits_for_words(["zebra", "apple"]) == 0b101
+
+def test_index_is_shared_through_the_dictionary():
+    dictionary = WordDictionary.for_file(WORDS_FP)
+    assert dictionary.bitset_index is dictionary.bitset_index
+    assert dictionary.bitset_index.words == dictionary.words
+    assert WordListGeneratorRandom(WORDS_FP).bitset_index is WordListGeneratorLLM(WORDS_FP).bitset_index
+    assert WordListGeneratorRandom(WORDS_FP).bitset_index is dictionary.bitset_index
+
+def test_modified_file_is_reindexed(tmp_path):
+    file_path = tmp_path / "words.txt"
+    file_path.write_text("apple\nwater\n")
+    index = WordDictionary.for_file(str(file_path)).bitset_index
+    file_path.write_text("apple\nwater\nzebra\n")
+    assert WordDictionary.for_file(str(file_path)).bitset_index is not index
+    assert WordDictionary.for_file(str(file_path)).bitset_index.words == ["apple", "water", "zebra"]
+
+@pytest.mark.parametrize("answer, guesses", [
+    ("apple", ["adieu", "alloy"]),
+    ("gusty", ["crate", "lusts", "bunty"]),
+])
+def test_bitset_engine_matches_regex_engine(answer, guesses):
+    regex_generator = WordListGeneratorBase(WORDS_FP)
+    bitset_generator = WordListGeneratorBase(WORDS_FP, engine="bitset")
+    regex_generator.load()
+    bitset_generator.load()
+
+    judge = WordleJudge(answer)
+    for guess in guesses:
+        result = judge.judge_guess(guess)
+        regex_generator.update_state(result)
+        bitset_generator.update_state(result)
+        regex_generator.update_candidate_words()
+        bitset_generator.update_candidate_words()
+        assert bitset_generator.candidate_words == regex_generator.candidate_words
+        assert bitset_generator.count_candidates() == len(regex_generator.candidate_words)
+
+def test_bitset_engine_with_words_outside_index():
+    generator = WordListGeneratorBase(WORDS_FP, engine="bitset")
+    generator.candidate_words = ["apple", "water", "zzzzz"]
+    generator.update_state({"present": set(), "correct": set(), "absent": {'p'}})
+    generator.update_candidate_words()
+    assert generator.candidate_words == ["water", "zzzzz"]
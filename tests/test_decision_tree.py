@@ -0,0 +1,125 @@
+import sys
+sys.path.append('./src')
+
+import numpy as np
+import pytest
+
+from decision_tree import (
+    ROOT,
+    DecisionTree,
+    build_decision_tree,
+    decision_tree_path,
+    judge_patterns,
+    score_guesses,
+)
+from experiment_runner import play_game, run_games, solver_factory_for
+from feedback_patterns import pattern_entropy, result_to_pattern
+from word_matrix import encode_words, read_word_file
+from wordle_judge import WordleJudge
+from wordle_solver import WordListGeneratorTree
+
+WORDS = ["apple", "water", "zebra", "trace", "crate", "grace", "brace", "place", "alloy", "crane", "slate", "greet"]
+ANSWERS = ["water", "trace", "crate", "grace", "brace", "place", "crane", "slate", "greet"]
+
+
+@pytest.fixture
+def words():
+    return list(WORDS)
+
+@pytest.fixture
+def tree():
+    return build_decision_tree(ANSWERS, WORDS, opener="trace")
+
+
+def attempts_to_solve(tree, answer):
+    node = ROOT
+    for attempt in range(1, 20):
+        guess = tree.guesses[node]
+        result = WordleJudge(answer).judge_guess(guess)
+        if result is True:
+            return attempt
+        node = tree.child(node, result_to_pattern(guess, result))
+        assert node is not None
+
+
+def test_decision_tree_path():
+    assert decision_tree_path("data/f-past-wordle-answers.txt", "trace") == "data/f-past-wordle-answers.trace.tree.npz"
+
+def test_judge_patterns_match_judge_guess():
+    patterns = judge_patterns(encode_words(WORDS), encode_words(ANSWERS))
+    for i, guess in enumerate(WORDS):
+        for j, answer in enumerate(ANSWERS):
+            assert patterns[i, j] == result_to_pattern(guess, WordleJudge(answer).judge_guess(guess))
+
+def test_score_guesses():
+    rng = np.random.default_rng(0)
+    patterns = rng.integers(0, 6, size=(20, 30), dtype=np.uint8)
+    assert np.allclose(score_guesses(patterns), pattern_entropy(patterns))
+    expected = [-np.bincount(row).max() for row in patterns]
+    assert score_guesses(patterns, "minimax").tolist() == expected
+    with pytest.raises(ValueError):
+        score_guesses(patterns, "random")
+
+@pytest.mark.parametrize("heuristic", ["entropy", "minimax"])
+def test_tree_solves_every_answer(heuristic):
+    tree = build_decision_tree(ANSWERS, WORDS, opener="trace", heuristic=heuristic)
+    attempts = [attempts_to_solve(tree, answer) for answer in ANSWERS]
+    assert tree.opener == "trace"
+    assert tree.num_answers == len(ANSWERS)
+    assert tree.expected_attempts == pytest.approx(np.mean(attempts))
+    assert tree.worst_case_attempts == max(attempts)
+
+def test_deeper_search_is_never_worse():
+    greedy = build_decision_tree(ANSWERS, WORDS, opener="slate")
+    searched = build_decision_tree(ANSWERS, WORDS, opener="slate", beam=4, search_depth=2)
+    assert searched.expected_attempts <= greedy.expected_attempts
+    assert all(attempts_to_solve(searched, answer) for answer in ANSWERS)
+
+def test_searched_opener():
+    tree = build_decision_tree(ANSWERS, WORDS)
+    assert tree.opener in WORDS
+    assert all(attempts_to_solve(tree, answer) for answer in ANSWERS)
+
+def test_build_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        build_decision_tree([], WORDS)
+    with pytest.raises(ValueError):
+        build_decision_tree(ANSWERS, WORDS, heuristic="random")
+
+def test_save_and_load(tree, tmp_path):
+    tree_fp = str(tmp_path / "answers.trace.tree.npz")
+    tree.save(tree_fp)
+    loaded = DecisionTree.load(tree_fp)
+    assert loaded.guesses == tree.guesses
+    assert loaded.transitions == tree.transitions
+    assert loaded.attempts.tolist() == tree.attempts.tolist()
+
+def test_generator_follows_tree(tree, word_file):
+    wordle_virtual_assistant = WordListGeneratorTree(word_file, tree=tree)
+    wordle_virtual_assistant.load()
+    assert wordle_virtual_assistant.first_word == "trace"
+    for answer in ANSWERS:
+        word, num_attempts = play_game(wordle_virtual_assistant, answer, "trace")
+        assert word == answer
+        assert num_attempts == attempts_to_solve(tree, answer)
+        assert wordle_virtual_assistant.candidate_words is wordle_virtual_assistant.loaded_words
+
+def test_generator_leaves_tree_for_other_opener(tree, word_file):
+    wordle_virtual_assistant = WordListGeneratorTree(word_file, tree=tree)
+    wordle_virtual_assistant.load()
+    word, _ = play_game(wordle_virtual_assistant, "greet", "apple")
+    assert word == "greet"
+    assert wordle_virtual_assistant.tree_node is None
+
+    play_game(wordle_virtual_assistant, "greet", "trace")
+    assert wordle_virtual_assistant.tree_node is not None
+
+def test_generator_requires_tree(word_file):
+    with pytest.raises(ValueError):
+        WordListGeneratorTree(word_file).load()
+
+def test_run_games_with_tree_file(tree, word_file, tmp_path):
+    tree_fp = str(tmp_path / "answers.trace.tree.npz")
+    tree.save(tree_fp)
+    results = run_games(solver_factory_for("tree", word_file, tree_fp=tree_fp), ANSWERS, first_word=tree.opener)
+    assert [result.word for result in results] == ANSWERS
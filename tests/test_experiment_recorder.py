@@ -0,0 +1,101 @@
+import sys
+sys.path.append('./src')
+
+import multiprocessing
+import threading
+
+import pytest
+
+from experiment_recorder import BufferedExperimentRecorder, CSV_HEADER
+
+
+def record_rows(fp, solver_type, num_rows):
+    recorder = BufferedExperimentRecorder(fp, flush_rows=7)
+    for i in range(num_rows):
+        recorder.record(solver_type, "trace", "grace", i)
+    recorder.close()
+
+
+def read_lines(fp):
+    with open(fp) as f:
+        return f.read().splitlines()
+
+
+def test_buffers_until_flush_rows(tmp_path):
+    fp = str(tmp_path / "results.csv")
+    recorder = BufferedExperimentRecorder(fp, flush_rows=3, flush_interval=60)
+    recorder.record("random", "trace", "grace", 3)
+    recorder.record("random", "trace", "brace", 4)
+    assert read_lines(fp) == [CSV_HEADER.strip()]
+
+    recorder.record("random", "crate", "grace", 5)
+    assert read_lines(fp)[1:] == ["random,trace,grace,3", "random,trace,brace,4", "random,crate,grace,5"]
+    assert recorder.rows_written == 3
+    recorder.close()
+
+def test_flushes_after_interval(tmp_path):
+    fp = str(tmp_path / "results.csv")
+    recorder = BufferedExperimentRecorder(fp, flush_rows=100, flush_interval=0)
+    recorder.record("llm", "adieu", "grace", 2)
+    assert read_lines(fp)[1:] == ["llm,adieu,grace,2"]
+    recorder.close()
+
+def test_close_flushes_and_appends_without_second_header(tmp_path):
+    fp = str(tmp_path / "results.csv")
+    with BufferedExperimentRecorder(fp) as recorder:
+        recorder.record("random", "trace", "grace", 3)
+    with BufferedExperimentRecorder(fp) as recorder:
+        recorder.record("random", "trace", "None", 21)
+
+    assert read_lines(fp) == [CSV_HEADER.strip(), "random,trace,grace,3", "random,trace,None,21"]
+
+def test_threads_share_one_recorder(tmp_path):
+    fp = str(tmp_path / "results.csv")
+    recorder = BufferedExperimentRecorder(fp, flush_rows=5)
+
+    def record(solver_type):
+        for i in range(200):
+            recorder.record(solver_type, "trace", "grace", i)
+
+    threads = [threading.Thread(target=record, args=(f"solver{t}",)) for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.close()
+
+    lines = read_lines(fp)
+    assert lines[0] == CSV_HEADER.strip()
+    assert len(lines) == 801
+    assert len(set(lines[1:])) == 800
+
+def test_processes_append_to_one_file(tmp_path):
+    fp = str(tmp_path / "results.csv")
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=record_rows, args=(fp, f"solver{p}", 50)) for p in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    lines = read_lines(fp)
+    assert lines.count(CSV_HEADER.strip()) == 1
+    assert len(lines) == 151
+    assert all(len(line.split(",")) == 4 for line in lines)
+
+def test_rejects_unknown_columnar_format(tmp_path):
+    with pytest.raises(ValueError):
+        BufferedExperimentRecorder(columnar_dir=str(tmp_path), columnar_format="orc")
+
+@pytest.mark.parametrize("columnar_format", ["parquet", "arrow"])
+def test_columnar_part_files(tmp_path, columnar_format):
+    pyarrow_dataset = pytest.importorskip("pyarrow.dataset")
+    columnar_dir = str(tmp_path / "results")
+    recorder = BufferedExperimentRecorder(flush_rows=2, columnar_dir=columnar_dir, columnar_format=columnar_format)
+    for i in range(5):
+        recorder.record("entropy", "trace", "grace", i)
+    recorder.close()
+
+    table = pyarrow_dataset.dataset(columnar_dir, format="feather" if columnar_format == "arrow" else "parquet").to_table()
+    assert table.num_rows == 5
+    assert sorted(table.column("num_attempts").to_pylist()) == [0, 1, 2, 3, 4]
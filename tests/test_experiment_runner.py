@@ -0,0 +1,95 @@
+import sys
+sys.path.append('./src')
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+import experiment_runner
+from experiment_runner import GameResult, play_game, run_games, run_games_parallel, solver_factory_for
+from word_matrix import encode_words
+from wordle_solver import WordListGeneratorEntropy, WordListGeneratorRandom
+
+WORDS = ["apple", "water", "zebra", "trace", "crate", "grace"]
+
+
+@pytest.fixture
+def words():
+    return list(WORDS)
+
+@pytest.fixture
+def random_factory(word_file, tmp_path):
+    def factory():
+        wordle_virtual_assistant = WordListGeneratorRandom(word_file, dump_file_dir=str(tmp_path))
+        wordle_virtual_assistant.load()
+        return wordle_virtual_assistant
+    return factory
+
+
+def test_play_game_solves(word_file):
+    wordle_virtual_assistant = WordListGeneratorEntropy(word_file)
+    wordle_virtual_assistant.load()
+    word, num_attempts = play_game(wordle_virtual_assistant, "zebra", "trace")
+    assert word == "zebra"
+    assert 1 < num_attempts <= len(WORDS)
+
+def test_play_game_first_word_correct(word_file):
+    wordle_virtual_assistant = WordListGeneratorEntropy(word_file)
+    wordle_virtual_assistant.load()
+    assert play_game(wordle_virtual_assistant, "trace", "trace") == ("trace", 1)
+
+def test_play_game_resets_generator(word_file):
+    wordle_virtual_assistant = WordListGeneratorEntropy(word_file)
+    wordle_virtual_assistant.load()
+    play_game(wordle_virtual_assistant, "zebra", "trace")
+    assert len(wordle_virtual_assistant.candidate_words) < len(WORDS)
+
+    play_game(wordle_virtual_assistant, "trace", "trace")
+    assert wordle_virtual_assistant.global_state == {"present": set(), "correct": set(), "absent": set()}
+    assert wordle_virtual_assistant.candidate_words is wordle_virtual_assistant.loaded_words
+
+def test_run_games_loads_once(random_factory):
+    factory = Mock(side_effect=random_factory)
+    results = run_games(factory, ["apple", "ZEBRA"], trials=3, first_word="trace", seed=0)
+    factory.assert_called_once()
+    assert len(results) == 6
+    assert [result.answer for result in results] == ["apple"] * 3 + ["zebra"] * 3
+    assert all(result.word == result.answer for result in results)
+
+def test_run_games_seed_is_reproducible(random_factory):
+    first = run_games(random_factory, ["apple", "water", "zebra"], trials=2, seed=7)
+    second = run_games(random_factory, ["apple", "water", "zebra"], trials=2, seed=7)
+    assert first == second
+
+def test_run_games_records(random_factory):
+    recorder = Mock()
+    results = run_games(random_factory, ["apple"], first_word="trace", seed=0, recorder=recorder, solver_type="random")
+    assert results == [GameResult("random", "trace", "apple", "apple", results[0].num_attempts)]
+    recorder.record.assert_called_once_with("random", "trace", "apple", results[0].num_attempts)
+
+def test_run_games_parallel_is_stable(word_file):
+    answers = ["apple", "water", "zebra", "grace"]
+    one_worker = run_games_parallel("entropy", answers, trials=2, seed=3, max_workers=1, words_fp=word_file)
+    two_workers = run_games_parallel("entropy", answers, trials=2, seed=3, max_workers=2, words_fp=word_file)
+    assert one_worker == two_workers
+    assert [result.answer for result in two_workers] == [answer for answer in answers for _ in range(2)]
+    assert all(result.word == result.answer for result in two_workers)
+
+def test_run_games_parallel_records_in_order(word_file):
+    recorder = Mock()
+    results = run_games_parallel("entropy", ["zebra", "apple"], first_word="trace", max_workers=2, words_fp=word_file, recorder=recorder)
+    assert [c.args[2] for c in recorder.record.call_args_list] == ["zebra", "apple"]
+    assert [result.initial_word for result in results] == ["trace", "trace"]
+
+def test_worker_loads_the_shared_matrix(word_file, tmp_path):
+    word_matrix_fp = str(tmp_path / "word_matrix.npy")
+    np.save(word_matrix_fp, encode_words(WORDS))
+    with patch("word_dictionary.encode_words", side_effect=AssertionError("the worker encoded the words")):
+        experiment_runner._init_worker("entropy", word_file, None, word_matrix_fp)
+    assert isinstance(experiment_runner._worker_assistant.loaded_word_matrix, np.memmap)
+    assert experiment_runner._worker_assistant.loaded_words == WORDS
+
+def test_solver_factory_for_unknown():
+    with pytest.raises(ValueError):
+        solver_factory_for("bogus")
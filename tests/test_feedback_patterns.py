@@ -0,0 +1,120 @@
+import os
+import sys
+sys.path.append('./src')
+
+import random
+
+import numpy as np
+import pytest
+
+from feedback_patterns import (
+    ALL_CORRECT_PATTERN,
+    JUDGE_RULES,
+    PatternTable,
+    build_pattern_matrix,
+    compute_patterns,
+    feedback_pattern,
+    judge_feedback_pattern,
+    judge_patterns,
+    pattern_cache_path,
+    pattern_to_result,
+    result_to_pattern,
+)
+from word_matrix import encode_words, read_word_file
+from wordle_judge import WordleJudge
+
+WORDS = ["apple", "alloy", "llama", "speed", "erase", "eerie", "trace", "crate", "geese", "sheep"]
+
+
+@pytest.fixture
+def words():
+    return list(WORDS)
+
+
+def test_feedback_pattern():
+    assert feedback_pattern("apple", "apple") == ALL_CORRECT_PATTERN
+    # a correct, first l present, second l absent
+    assert feedback_pattern("alloy", "apple") == 2 + 1 * 3
+    # two e's are correct, the answer has one e left for the third e in the guess
+    assert feedback_pattern("geese", "eerie") == 2 * 3 + 1 * 9 + 2 * 81
+    # the answer has two e's, so the third e in the guess is absent
+    assert feedback_pattern("eerie", "speed") == 1 + 1 * 3
+    assert feedback_pattern("trace", "crate") == 1 + 2 * 3 + 2 * 9 + 1 * 27 + 2 * 81
+
+def test_compute_patterns_matches_reference():
+    words = WORDS + random.Random(0).sample(read_word_file("data/five-letter-words.txt"), 200)
+    matrix = encode_words(words)
+    patterns = compute_patterns(matrix, matrix)
+    expected = np.array([[feedback_pattern(g, a) for a in words] for g in words], dtype=np.uint8)
+    assert patterns.dtype == np.uint8
+    np.testing.assert_array_equal(patterns, expected)
+
+def test_build_pattern_matrix_chunked():
+    matrix = encode_words(WORDS)
+    patterns = build_pattern_matrix(matrix, matrix, chunk_size=3, max_workers=2)
+    np.testing.assert_array_equal(patterns, compute_patterns(matrix, matrix))
+
+def test_build_pattern_matrix_judge_rules():
+    matrix = encode_words(WORDS)
+    patterns = build_pattern_matrix(matrix, matrix, chunk_size=3, max_workers=2, rules=JUDGE_RULES)
+    np.testing.assert_array_equal(patterns, judge_patterns(matrix, matrix))
+    with pytest.raises(ValueError):
+        build_pattern_matrix(matrix, matrix, rules="nyt")
+
+def test_judge_feedback_pattern_matches_judge_guess():
+    for guess in WORDS:
+        for answer in WORDS:
+            if guess != answer:
+                assert judge_feedback_pattern(guess, answer) == result_to_pattern(guess, WordleJudge(answer).judge_guess(guess))
+
+def test_pattern_result_round_trip():
+    # the Wordle rules mark the second 'l' absent, judge_guess marks both present
+    result = pattern_to_result("alloy", feedback_pattern("alloy", "apple"))
+    assert result == {"present": [(1, 'l'), (2, 'l')], "correct": [(0, 'a')], "absent": ['o', 'y']}
+    assert result_to_pattern("alloy", result) == judge_feedback_pattern("alloy", "apple")
+    assert pattern_to_result("alloy", judge_feedback_pattern("alloy", "apple")) == result
+    assert pattern_to_result("apple", ALL_CORRECT_PATTERN) is True
+    assert result_to_pattern("apple", True) == ALL_CORRECT_PATTERN
+
+@pytest.mark.parametrize("guess, answer", [("eerie", "apple"), ("geese", "eerie"), ("speed", "erase"), ("llama", "alloy")])
+def test_pattern_to_result_gives_judge_guess(guess, answer):
+    expected = WordleJudge(answer).judge_guess(guess)
+    assert pattern_to_result(guess, feedback_pattern(guess, answer)) == expected
+    assert pattern_to_result(guess, judge_feedback_pattern(guess, answer)) == expected
+
+def test_pattern_table_cache(word_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    with pytest.raises(FileNotFoundError):
+        PatternTable.load(word_file, cache_dir=cache_dir, build=False)
+
+    table = PatternTable.load(word_file, cache_dir=cache_dir)
+    assert os.path.exists(pattern_cache_path(word_file, cache_dir=cache_dir))
+    assert table.pattern("alloy", "apple") == feedback_pattern("alloy", "apple")
+
+    cached = PatternTable.load(word_file, cache_dir=cache_dir, build=False)
+    assert isinstance(cached.patterns, np.memmap)
+    np.testing.assert_array_equal(cached.patterns, table.patterns)
+
+def test_pattern_cache_path_follows_checksum(word_file, tmp_path):
+    before = pattern_cache_path(word_file, cache_dir=str(tmp_path))
+    with open(word_file, "a") as f:
+        f.write("water\n")
+    assert pattern_cache_path(word_file, cache_dir=str(tmp_path)) != before
+
+def test_judge_pattern(word_file, tmp_path):
+    table = PatternTable.load(word_file, cache_dir=str(tmp_path / "cache"), rules=JUDGE_RULES)
+    assert os.path.basename(pattern_cache_path(word_file, rules=JUDGE_RULES)).startswith("judge_patterns_")
+    judge = WordleJudge("Apple", pattern_table=table)
+    # judge_pattern encodes judge_guess, also for repeated letters
+    for guess in ["eerie", "alloy", "llama"]:
+        assert judge.judge_pattern(guess) == result_to_pattern(guess, judge.judge_guess(guess))
+    assert judge.judge_pattern("eerie") != feedback_pattern("eerie", "apple")
+    # words outside the table fall back to computing the pattern
+    assert judge.judge_pattern("ample") == result_to_pattern("ample", judge.judge_guess("ample"))
+    assert WordleJudge("apple").judge_pattern("APPLE") == ALL_CORRECT_PATTERN
+    assert WordleJudge("apple").judge_pattern("eerie") == judge.judge_pattern("eerie")
+
+def test_judge_pattern_rejects_wordle_rule_table(word_file, tmp_path):
+    table = PatternTable.load(word_file, cache_dir=str(tmp_path / "cache"))
+    with pytest.raises(ValueError):
+        WordleJudge("apple", pattern_table=table)
@@ -0,0 +1,40 @@
+import sys
+sys.path.append('./src')
+
+import subprocess
+
+import pytest
+
+from import_time_benchmark import measure_import, parse_importtime, summarize
+
+REPORT = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   _io
+import time:       200 |        300 | site
+import time:       500 |        500 |     numpy._core
+import time:       700 |       1200 |   numpy
+import time:        50 |         50 |   json
+import time:       300 |       1550 | wordle_solver
+"""
+
+
+def test_parse_importtime():
+    import_times = parse_importtime(REPORT)
+    assert [import_time.module for import_time in import_times] == ["_io", "site", "numpy._core", "numpy", "json", "wordle_solver"]
+    assert [import_time.depth for import_time in import_times] == [1, 0, 2, 1, 1, 0]
+    assert import_times[-1].cumulative_us == 1550
+
+def test_summarize_lists_only_the_module_imports():
+    summary = summarize("wordle_solver", parse_importtime(REPORT), top=5)
+    assert summary["total_ms"] == 1.55
+    assert [dependency["module"] for dependency in summary["slowest"]] == ["numpy", "json"]
+    assert summary["deferred_imported"] == []
+
+@pytest.mark.parametrize("module", ["wordle_solver", "random_solver", "experiment_runner"])
+def test_solver_core_does_not_import_openai(module):
+    summary = summarize(module, measure_import(module, runs=1))
+    assert summary["deferred_imported"] == []
+
+def test_openai_client_classes_resolve_on_first_use():
+    code = ("import sys, wordle_solver; assert 'openai' not in sys.modules; "
+            "import openai; assert wordle_solver.OpenAI is openai.OpenAI")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd="./src")
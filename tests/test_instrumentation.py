@@ -0,0 +1,95 @@
+import sys
+sys.path.append('./src')
+
+import json
+import os
+import pstats
+import time
+
+import pytest
+
+from experiment_runner import run_games, solver_factory_for
+from instrumentation import NULL_TIMER, GameProfiler, PhaseTimer
+from wordle_solver import WordListGeneratorRandom
+
+
+def test_null_timer_records_nothing():
+    assert NULL_TIMER.game("game") is NULL_TIMER
+    with NULL_TIMER.phase("filter") as phase:
+        pass
+    assert NULL_TIMER.phase("select") is phase
+
+def test_nested_phases_record_their_own_time():
+    timer = PhaseTimer()
+    game_timer = timer.game("game")
+    with game_timer.phase("guess"):
+        with game_timer.phase("filter"):
+            time.sleep(0.02)
+
+    summary = timer.summary()
+    assert list(summary) == ["filter", "guess"]
+    assert summary["filter"]["total_s"] >= 0.02
+    assert summary["guess"]["total_s"] < 0.01
+    assert summary["guess"]["count"] == 1
+
+def test_game_timer_keeps_turns():
+    timer = PhaseTimer()
+    game_timer = timer.game("game")
+    game_timer.next_turn()
+    with game_timer.phase("judge"):
+        pass
+    game_timer.next_turn()
+    with game_timer.phase("judge"):
+        pass
+    with game_timer.phase("guess"):
+        pass
+
+    assert timer.games == [game_timer.record]
+    assert game_timer.record["game"] == "game"
+    assert [sorted(turn) for turn in game_timer.record["turns"]] == [["judge"], ["guess", "judge"]]
+    assert timer.totals["judge"][0] == 2
+
+def test_unplayed_games_are_left_out():
+    timer = PhaseTimer()
+    timer.game("reset only")
+    assert timer.games == []
+
+def test_run_games_times_every_game(word_file, tmp_path):
+    timer = PhaseTimer()
+    results = run_games(solver_factory_for("random", word_file, timer=timer), ["grace", "water"], trials=2,
+                        first_word="trace", seed=7)
+
+    summary = timer.summary()
+    assert summary["load"]["count"] == 1
+    assert summary["judge"]["count"] == sum(result.num_attempts for result in results)
+    assert {"guess", "filter.absent"} <= set(summary)
+    assert len(timer.games) == len(results)
+    for game, result in zip(timer.games, results):
+        assert len(game["turns"]) == result.num_attempts
+
+    timing_fp = str(tmp_path / "timing.json")
+    timer.write_json(timing_fp)
+    with open(timing_fp) as file:
+        assert json.load(file)["summary"].keys() == summary.keys()
+
+def test_generators_default_to_the_null_timer(word_file):
+    wordle_virtual_assistant = WordListGeneratorRandom(word_file)
+    wordle_virtual_assistant.load()
+    wordle_virtual_assistant.reset()
+    assert wordle_virtual_assistant.timer is NULL_TIMER
+
+@pytest.mark.parametrize("mode, extension", [("cprofile", ".prof"), ("sample", ".folded")])
+def test_profiler_writes_a_profile_per_game(word_file, tmp_path, mode, extension):
+    profile_dir = str(tmp_path / "profiles")
+    profiler = GameProfiler(profile_dir, mode, interval=0.0001)
+    run_games(solver_factory_for("random", word_file), ["grace", "water"], first_word="trace", seed=7,
+              profiler=profiler)
+
+    assert sorted(os.listdir(profile_dir)) == [f"00000_grace{extension}", f"00001_water{extension}"]
+    if mode == "cprofile":
+        stats = pstats.Stats(os.path.join(profile_dir, f"00000_grace{extension}"))
+        assert any(function == "play_game" for _, _, function in stats.stats)
+
+def test_profiler_rejects_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        GameProfiler(str(tmp_path), "perf")
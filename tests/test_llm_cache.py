@@ -0,0 +1,103 @@
+import sys
+sys.path.append('./src')
+
+import asyncio
+import threading
+
+import pytest
+
+from llm_cache import PromptCache
+from wordle_solver import AsyncOpenAIInterface, OpenAIInterface
+
+MESSAGES = [{"role": "user", "content": "List of candidate words:\nwater\nzebra"}]
+
+
+def test_key_depends_on_model_temperature_and_messages():
+    key = PromptCache.key("gpt-4", 0.1, MESSAGES)
+    assert key == PromptCache.key("gpt-4", 0.1, [dict(message) for message in MESSAGES])
+    assert key != PromptCache.key("gpt-3.5-turbo", 0.1, MESSAGES)
+    assert key != PromptCache.key("gpt-4", 0.2, MESSAGES)
+    assert key != PromptCache.key("gpt-4", 0.1, [{"role": "user", "content": "other"}])
+
+def test_get_and_put_count_hits_and_misses():
+    cache = PromptCache(":memory:")
+    assert cache.get("a") is None
+    cache.put("a", "response")
+    assert cache.get("a") == "response"
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": len("response")}
+
+def test_persists_across_instances(tmp_path):
+    cache_fp = str(tmp_path / "cache.sqlite")
+    cache = PromptCache(cache_fp)
+    cache.put("a", "response")
+    cache.close()
+
+    cache = PromptCache(cache_fp)
+    assert cache.get("a") == "response"
+
+def test_evicts_least_recently_used_entries():
+    cache = PromptCache(":memory:", max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+def test_evicts_by_size():
+    cache = PromptCache(":memory:", max_bytes=10)
+    cache.put("a", "x" * 4)
+    cache.put("b", "y" * 4)
+    cache.put("c", "z" * 4)
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 8
+
+def test_interface_answers_repeated_prompt_from_cache(fake_server):
+    cache = PromptCache(":memory:")
+    openai_interface = OpenAIInterface("local", base_url=fake_server.base_url, cache=cache)
+
+    first = openai_interface.chat("List of candidate words:\nwater\nzebra")
+    second = openai_interface.chat("List of candidate words:\nwater\nzebra")
+    assert first == second
+    assert fake_server.request_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    openai_interface.chat("List of candidate words:\nwater\nzebra", bypass_cache=True)
+    assert fake_server.request_count == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_async_interface_uses_cache(fake_server):
+    cache = PromptCache(":memory:")
+    openai_interface = AsyncOpenAIInterface("local", base_url=fake_server.base_url, cache=cache)
+
+    async def chat_twice():
+        first = await openai_interface.chat("List of candidate words:\nzebra")
+        second = await openai_interface.chat("List of candidate words:\nzebra")
+        return first, second
+
+    first, second = asyncio.run(chat_twice())
+    assert first == second
+    assert fake_server.request_count == 1
+
+def test_async_interface_keeps_cache_calls_off_the_event_loop(fake_server):
+    threads = []
+
+    class RecordingCache(PromptCache):
+        def get(self, key):
+            threads.append(threading.get_ident())
+            return super().get(key)
+
+        def put(self, key, response):
+            threads.append(threading.get_ident())
+            super().put(key, response)
+
+    openai_interface = AsyncOpenAIInterface("local", base_url=fake_server.base_url, cache=RecordingCache(":memory:"))
+
+    async def chat():
+        await openai_interface.chat("List of candidate words:\nzebra")
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(chat())
+    assert len(threads) == 2
+    assert loop_thread not in threads
@@ -0,0 +1,78 @@
+import sys
+sys.path.append('./src')
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openai_clients import ClientRegistry, read_api_key
+from wordle_solver import AsyncOpenAIInterface, OpenAIInterface
+
+PROMPT = "List of candidate words:\nwater\nzebra"
+
+
+@pytest.fixture
+def fake_server_options():
+    return {"latency": 0.02}
+
+@pytest.fixture
+def registry():
+    registry = ClientRegistry()
+    yield registry
+    registry.close()
+
+
+def test_registry_shares_client_per_configuration(registry):
+    client = registry.client("key", "http://127.0.0.1:1/v1")
+    assert registry.client("key", "http://127.0.0.1:1/v1") is client
+    assert registry.client("key", "http://127.0.0.1:1/v1", max_connections=4) is not client
+    assert registry.client("other", "http://127.0.0.1:1/v1") is not client
+    assert registry.client("key", "http://127.0.0.1:1/v1", asynchronous=True) is not client
+
+def test_pooled_client_reuses_connections(registry, fake_server):
+    client = registry.client("local", fake_server.base_url)
+    for _ in range(3):
+        content = OpenAIInterface("local", client=client).chat(PROMPT)
+        assert json.loads(content)["recommendation"] == "water"
+
+    metrics = registry.metrics(client).snapshot()
+    assert metrics["requests"] == 3
+    assert metrics["connections_opened"] == 1
+    assert metrics["connections_reused"] == 2
+    assert metrics["in_flight"] == 0
+
+def test_pool_size_caps_connections(registry, fake_server):
+    client = registry.client("local", fake_server.base_url, max_connections=2)
+    openai_interface = OpenAIInterface("local", client=client)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(openai_interface.chat, [PROMPT] * 12))
+
+    metrics = registry.metrics(client).snapshot()
+    assert metrics["requests"] == 12
+    assert metrics["connections_opened"] <= 2
+    assert fake_server.max_in_flight <= 2
+    assert metrics["wait_time"] > 0
+
+def test_async_pooled_client(registry, fake_server):
+    client = registry.client("local", fake_server.base_url, asynchronous=True, max_connections=4)
+    llm_interface = AsyncOpenAIInterface("local", client=client)
+
+    async def chat_many():
+        return await asyncio.gather(*(llm_interface.chat(PROMPT) for _ in range(8)))
+
+    contents = asyncio.run(chat_many())
+    assert len(contents) == 8
+    metrics = registry.metrics(client).snapshot()
+    assert metrics["requests"] == 8
+    assert metrics["connections_opened"] <= 4
+    assert fake_server.max_in_flight <= 4
+
+def test_read_api_key_reads_file_once(tmp_path):
+    api_key_fp = tmp_path / "api_key.json"
+    api_key_fp.write_text(json.dumps({"key": "secret"}))
+    assert read_api_key(str(api_key_fp)) == "secret"
+
+    api_key_fp.write_text(json.dumps({"key": "changed"}))
+    assert read_api_key(str(api_key_fp)) == "secret"
@@ -0,0 +1,133 @@
+import sys
+sys.path.append('./src')
+
+import os
+import random
+
+import pytest
+
+from experiment_runner import play_game
+from opening_book import OpeningBook, build_opening_book, opening_book_path
+from wordle_judge import WordleJudge
+from wordle_solver import WordListGeneratorEntropy, WordListGeneratorLLM, WordListGeneratorRandom
+
+WORDS = ["apple", "water", "zebra", "trace", "crate", "grace", "brace", "place", "alloy", "crane", "slate",
+         "greet", "adieu", "audio", "tread", "cater"]
+
+
+@pytest.fixture
+def words():
+    return list(WORDS)
+
+@pytest.fixture
+def booked_word_file(word_file):
+    build_opening_book(word_file, ["trace", "adieu"]).save(opening_book_path(word_file))
+    return word_file
+
+
+def test_opening_book_path():
+    assert opening_book_path("data/five-letter-words.txt") == "data/five-letter-words.openings.npz"
+
+def test_every_word_is_in_the_entry_of_its_feedback(word_file):
+    book = build_opening_book(word_file, ["trace", "adieu"])
+    assert book.openers == ["adieu", "trace"]
+    for opener in book.openers:
+        for answer in WORDS:
+            result = WordleJudge(answer).judge_guess(opener)
+            if result is not True:
+                indices, _ = book.lookup(opener, result)
+                assert WORDS.index(answer) in indices.tolist()
+
+def test_lookup_matches_filtering(word_file):
+    book = build_opening_book(word_file, ["trace"])
+    for answer in WORDS:
+        result = WordleJudge(answer).judge_guess("trace")
+        if result is True:
+            continue
+        wordle_virtual_assistant = WordListGeneratorRandom(word_file)
+        wordle_virtual_assistant.load()
+        wordle_virtual_assistant.update_state(result)
+        wordle_virtual_assistant.update_candidate_words()
+
+        indices, next_guess = book.lookup("trace", wordle_virtual_assistant.global_state)
+        assert [WORDS[i] for i in indices] == wordle_virtual_assistant.candidate_words
+        assert answer in wordle_virtual_assistant.candidate_words
+
+def test_lookup_rejects_other_states(word_file):
+    book = build_opening_book(word_file, ["trace"])
+    result = WordleJudge("grace").judge_guess("trace")
+    assert book.lookup("trace", result) is not None
+    assert book.lookup("crate", result) is None
+
+    extra = {key: set(value) for key, value in result.items()}
+    extra["absent"].add("z")
+    assert book.lookup("trace", extra) is None
+
+def test_save_load_and_staleness(booked_word_file):
+    book = OpeningBook.for_file(booked_word_file)
+    assert book is not None
+    assert OpeningBook.for_file(booked_word_file) is book
+    assert book.entries == build_opening_book(booked_word_file, ["trace", "adieu"]).entries
+
+    with open(booked_word_file, 'a') as file:
+        file.write("place\n")
+    assert OpeningBook.for_file(booked_word_file) is None
+
+def test_missing_book(word_file):
+    assert OpeningBook.for_file(word_file) is None
+    wordle_virtual_assistant = WordListGeneratorRandom(word_file)
+    wordle_virtual_assistant.load()
+    assert wordle_virtual_assistant.opening_book is None
+
+@pytest.mark.parametrize("engine", ["regex", "numpy", "bitset"])
+def test_generators_play_the_same_with_the_book(word_file, tmp_path, engine):
+    def play(generator_class, **kwargs):
+        wordle_virtual_assistant = generator_class(word_file, engine=engine, **kwargs)
+        wordle_virtual_assistant.load()
+        games = []
+        for opener in ["trace", "adieu", "crate"]:
+            for answer in WORDS:
+                random.seed(answer + opener)
+                games.append(play_game(wordle_virtual_assistant, answer, opener))
+        return games, wordle_virtual_assistant
+
+    dump_dir = str(tmp_path)
+    expected = {generator_class: play(generator_class, dump_file_dir=dump_dir)[0]
+                for generator_class in (WordListGeneratorRandom, WordListGeneratorEntropy)}
+
+    build_opening_book(word_file, ["trace", "adieu"]).save(opening_book_path(word_file))
+    for generator_class, games in expected.items():
+        booked_games, wordle_virtual_assistant = play(generator_class, dump_file_dir=dump_dir)
+        assert wordle_virtual_assistant.opening_book is not None
+        assert booked_games == games
+
+def test_entropy_takes_second_guess_from_book(booked_word_file):
+    wordle_virtual_assistant = WordListGeneratorEntropy(booked_word_file)
+    wordle_virtual_assistant.load()
+    wordle_virtual_assistant.update_state(WordleJudge("zebra").judge_guess("trace"), "trace")
+    assert wordle_virtual_assistant.guessed_word == "trace"
+    guess = wordle_virtual_assistant.get_candidate_word()
+    assert wordle_virtual_assistant.opening_guess == guess
+    assert guess == wordle_virtual_assistant.best_guess()
+
+def test_llm_generator_uses_book_candidates(booked_word_file, tmp_path):
+    wordle_virtual_assistant = WordListGeneratorLLM(booked_word_file)
+    wordle_virtual_assistant.dump_file_dir = str(tmp_path)
+    wordle_virtual_assistant.load()
+    wordle_virtual_assistant.update_state(WordleJudge("grace").judge_guess("adieu"), "adieu")
+    wordle_virtual_assistant.generate_llm_prompt()
+    assert wordle_virtual_assistant.candidate_history[0][0] is wordle_virtual_assistant.loaded_words
+    assert "grace" in wordle_virtual_assistant.candidate_words
+    assert "adieu" not in wordle_virtual_assistant.candidate_words
+
+def test_book_is_skipped_after_filtering(booked_word_file):
+    wordle_virtual_assistant = WordListGeneratorRandom(booked_word_file)
+    wordle_virtual_assistant.load()
+    wordle_virtual_assistant.guessed_word = "slate"
+    wordle_virtual_assistant.update_state(WordleJudge("grace").judge_guess("slate"))
+    wordle_virtual_assistant.update_candidate_words()
+    wordle_virtual_assistant.guessed_word = "trace"
+    wordle_virtual_assistant.update_state(WordleJudge("grace").judge_guess("trace"))
+    wordle_virtual_assistant.update_candidate_words()
+    assert wordle_virtual_assistant.candidate_words == ["grace", "brace"]
+    assert wordle_virtual_assistant.opening_guess is None
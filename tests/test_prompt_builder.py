@@ -0,0 +1,87 @@
+import sys
+sys.path.append('./src')
+
+import pytest
+
+from prompt_builder import estimate_tokens, fill_word_list, rank_candidates, token_counter
+from trace_sink import NULL_TRACE_SINK
+from wordle_solver import WordListGeneratorLLM
+
+
+def count_words(text):
+    return len(text.split())
+
+
+@pytest.fixture
+def answers_file(tmp_path):
+    file_path = tmp_path / "answers.txt"
+    file_path.write_text("ZEBRA\nwater\n")
+    return str(file_path)
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("trace") == 2
+    # "candidate" counts three tokens, the estimate errs high
+    assert estimate_tokens("List of candidate words:\n") == 9
+    assert estimate_tokens("trace\ncrate") > estimate_tokens("trace")
+
+def test_token_counter_is_cached():
+    assert token_counter() is token_counter()
+    assert token_counter()("trace") > 0
+
+def test_rank_by_coverage():
+    ranked = rank_candidates(["fuzzy", "trace", "crate", "grace"])
+    assert sorted(ranked) == ["crate", "fuzzy", "grace", "trace"]
+    # ties keep alphabetical order
+    assert ranked == ["crate", "trace", "grace", "fuzzy"]
+
+def test_rank_by_answers(words):
+    ranked = rank_candidates(words, "answers", answer_words={"zebra", "apple"})
+    assert ranked[:2] == ["zebra", "apple"]
+    assert rank_candidates(words, "answers") == rank_candidates(words, "coverage")
+
+def test_rank_by_partition(words):
+    ranked = rank_candidates(words, "partition")
+    assert sorted(ranked) == sorted(words)
+    # every other word leaves trace and crate apart, but grace, brace and place share .gggg or ..ggg
+    assert ranked[0] in ("trace", "crate", "water")
+
+def test_rank_rejects_unknown_ranking(words):
+    with pytest.raises(ValueError):
+        rank_candidates(words, "random")
+    assert rank_candidates([], "partition") == []
+
+def test_fill_word_list_fits_the_budget(words):
+    assert fill_word_list("two words\n", words, 5, count_tokens=count_words) == (words[:3], 5)
+    assert fill_word_list("two words\n", words, 100, count_tokens=count_words) == (words, 2 + len(words))
+    # the best word is kept even if the header alone is over the budget
+    assert fill_word_list("two words\n", words, 1, count_tokens=count_words) == (words[:1], 3)
+    assert fill_word_list("two words\n", [], 5, count_tokens=count_words) == ([], 2)
+
+def test_generator_fills_the_token_budget(word_file, answers_file, words):
+    wordle_virtual_assistant = WordListGeneratorLLM(word_file, token_budget=0, rank_by="answers",
+                                                    answers_fp=answers_file)
+    wordle_virtual_assistant.load()
+    wordle_virtual_assistant.trace_sink = NULL_TRACE_SINK
+    assert wordle_virtual_assistant.answer_words == {"zebra", "water"}
+
+    # a budget below the instructions still lists the best word
+    wordle_virtual_assistant.generate_llm_prompt()
+    assert wordle_virtual_assistant.prompt_word_list == "water"
+
+    token_budget = wordle_virtual_assistant.prompt_tokens + 10
+    wordle_virtual_assistant.token_budget = token_budget
+    prompt = wordle_virtual_assistant.generate_llm_prompt()
+    prompt_words = wordle_virtual_assistant.prompt_word_list.split('\n')
+    assert 1 < len(prompt_words) < len(words)
+    assert prompt_words == rank_candidates(words, "answers", {"zebra", "water"})[:len(prompt_words)]
+    assert wordle_virtual_assistant.prompt_tokens == token_counter()(prompt) <= token_budget
+
+def test_generator_counts_tokens_without_budget(word_file, words):
+    wordle_virtual_assistant = WordListGeneratorLLM(word_file)
+    wordle_virtual_assistant.load()
+    wordle_virtual_assistant.trace_sink = NULL_TRACE_SINK
+    prompt = wordle_virtual_assistant.generate_llm_prompt()
+    assert wordle_virtual_assistant.prompt_word_list == '\n'.join(sorted(words))
+    assert wordle_virtual_assistant.prompt_tokens == estimate_tokens(prompt)
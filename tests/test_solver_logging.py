@@ -0,0 +1,90 @@
+import sys
+sys.path.append('./src')
+
+import json
+import logging
+
+import pytest
+
+from experiment_runner import run_games, solver_factory_for
+from solver_logging import LOGGER_NAME, configure_logging, get_logger, log_event
+from wordle_solver import WordListGeneratorBase
+
+
+class CountingStr:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "counted"
+
+
+@pytest.fixture(autouse=True)
+def reset_logging():
+    yield
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+
+def test_solvers_are_silent_by_default(word_file, capsys):
+    run_games(solver_factory_for("random", word_file), ["grace"], first_word="trace", seed=7)
+    assert capsys.readouterr().out == ""
+
+def test_messages_are_formatted_only_when_logged(capsys):
+    configure_logging("info")
+    logger = get_logger("test")
+    value = CountingStr()
+    log_event(logger, logging.DEBUG, "filter", "value %s", value)
+    assert value.calls == 0
+
+    log_event(logger, logging.INFO, "filter", "value %s", value)
+    assert value.calls == 1
+    assert capsys.readouterr().out == "value counted\n"
+
+def test_quiet_only_writes_warnings(capsys):
+    configure_logging("info", quiet=True)
+    logger = get_logger("test")
+    log_event(logger, logging.INFO, "attempt", "attempt %d", 1)
+    log_event(logger, logging.WARNING, "no_candidates", "no candidates")
+    assert capsys.readouterr().out == "no candidates\n"
+
+def test_events_are_json_lines(word_file, words, tmp_path, capsys):
+    events_fp = str(tmp_path / "events.jsonl")
+    configure_logging("debug", quiet=True, events_fp=events_fp)
+    wordle_virtual_assistant = WordListGeneratorBase(word_file)
+    wordle_virtual_assistant.load()
+    wordle_virtual_assistant.update_state({"present": [(1, 'r')], "correct": [], "absent": ['p', 'l']})
+    wordle_virtual_assistant.update_candidate_words()
+    wordle_virtual_assistant.print_state()
+    logging.getLogger(LOGGER_NAME).handlers[0].flush()
+
+    with open(events_fp) as file:
+        events = [json.loads(line) for line in file]
+    assert capsys.readouterr().out == ""
+    assert [event["event"] for event in events] == ["filter", "state"]
+    assert events[0]["before_size"] == len(words)
+    assert events[0]["after_size"] == len(wordle_virtual_assistant.candidate_words)
+    assert events[1]["level"] == "info"
+    assert events[1]["global_state"] == {"present": [[1, "r"]], "correct": [], "absent": ["l", "p"]}
+
+def test_events_replace_the_console_on_stdout(capsys):
+    configure_logging("info", events_fp="-")
+    log_event(get_logger("test"), logging.INFO, "solved", "Solved %d", 3, solved=3)
+    event = json.loads(capsys.readouterr().out)
+    assert (event["event"], event["message"], event["solved"]) == ("solved", "Solved 3", 3)
+
+def test_configure_replaces_handlers():
+    configure_logging("info")
+    configure_logging("debug", events_fp="-")
+    logger = logging.getLogger(LOGGER_NAME)
+    assert len(logger.handlers) == 1
+    assert logger.level == logging.DEBUG
+
+def test_configure_rejects_unknown_level():
+    with pytest.raises(ValueError):
+        configure_logging("verbose")
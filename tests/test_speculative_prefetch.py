@@ -0,0 +1,138 @@
+import sys
+sys.path.append('./src')
+
+import asyncio
+import concurrent.futures
+
+import pytest
+
+from feedback_patterns import ALL_CORRECT_PATTERN, feedback_pattern
+from speculative_prefetch import (
+    SpeculativePrefetcher,
+    feedback_distribution,
+    local_suggestion,
+    pattern_to_response,
+    response_to_result,
+)
+from wordle_solver import AsyncOpenAIInterface, WordListGeneratorLLM
+
+
+class SlowInterface:
+    def __init__(self):
+        self.prompts = []
+
+    async def chat(self, prompt):
+        self.prompts.append(prompt)
+        await asyncio.sleep(60)
+
+
+@pytest.fixture
+def fake_server_options():
+    return {"latency": 0.01}
+
+@pytest.fixture
+def wordle_virtual_assistant(word_file):
+    wordle_virtual_assistant = WordListGeneratorLLM(word_file)
+    wordle_virtual_assistant.load()
+    return wordle_virtual_assistant
+
+
+def test_pattern_to_response():
+    assert pattern_to_response(0) == "....."
+    assert pattern_to_response(ALL_CORRECT_PATTERN) == "ggggg"
+    assert pattern_to_response(feedback_pattern("trace", "grace")) == ".gggg"
+    assert pattern_to_response(feedback_pattern("water", "trace")) == ".yyyy"
+
+def test_response_to_result(wordle_virtual_assistant):
+    assert response_to_result(wordle_virtual_assistant, "trace", ".gy.g") == {
+        "correct": [(1, 'r'), (4, 'e')], "present": [(2, 'a')], "absent": ['t', 'c'],
+    }
+    # a repeated letter marked absent is not absent when it is present elsewhere
+    assert response_to_result(wordle_virtual_assistant, "speed", ".yg..")["absent"] == ['s', 'd']
+    with pytest.raises(ValueError):
+        response_to_result(wordle_virtual_assistant, "trace", "gg?gg")
+
+def test_feedback_distribution(words):
+    distribution = feedback_distribution(words, "trace")
+    assert sum(probability for _, probability in distribution) == pytest.approx(1.0)
+    assert [probability for _, probability in distribution] == sorted(
+        (probability for _, probability in distribution), reverse=True)
+    assert dict(distribution)[".gggg"] == pytest.approx(2 / len(words))
+    assert feedback_distribution([], "trace") == []
+
+def test_local_suggestion():
+    assert local_suggestion(["trace", "crate", "fuzzy"]) in ("trace", "crate")
+    assert local_suggestion([]) is None
+
+def test_fork_keeps_the_original_state(wordle_virtual_assistant):
+    wordle_virtual_assistant.update_state({"correct": [(4, 'e')], "present": [], "absent": ['t']})
+    fork = wordle_virtual_assistant.fork()
+    fork.update_state({"correct": [], "present": [], "absent": ['w']})
+    fork.update_candidate_words()
+    assert wordle_virtual_assistant.global_state["absent"] == {'t'}
+    assert wordle_virtual_assistant.candidate_history == []
+    assert fork.global_state["absent"] == {'t', 'w'}
+
+def test_prefetch_hit_matches_the_entered_response(wordle_virtual_assistant, fake_server):
+    prefetcher = SpeculativePrefetcher(AsyncOpenAIInterface("local", base_url=fake_server.base_url), max_prefetches=3)
+    try:
+        responses = prefetcher.start(wordle_virtual_assistant, "trace")
+        assert len(responses) == 3
+        assert responses[0] == ".gggg"
+
+        future = prefetcher.take(".gggg")
+        fork, prompt, llm_response = future.result(timeout=10)
+        assert sorted(fork.candidate_words) == ["brace", "grace"]
+        assert prompt.endswith(fork.prompt_word_list)
+        assert llm_response["recommendation"] in ("brace", "grace")
+        # the generator of the game is not changed by its forks
+        assert wordle_virtual_assistant.global_state == {"present": set(), "correct": set(), "absent": set()}
+        assert prefetcher.stats["hits"] == 1
+        assert prefetcher.take("y....") is None
+        assert prefetcher.stats["misses"] == 1
+    finally:
+        prefetcher.close()
+
+def test_adopt_continues_from_the_prefetched_turn(wordle_virtual_assistant, fake_server, tmp_path):
+    dump_dir = tmp_path / "llm_trace_data"
+    dump_dir.mkdir()
+    wordle_virtual_assistant.dump_file_dir = str(dump_dir)
+    prefetcher = SpeculativePrefetcher(AsyncOpenAIInterface("local", base_url=fake_server.base_url), max_prefetches=1)
+    try:
+        prefetcher.start(wordle_virtual_assistant, "trace")
+        fork, prompt, llm_response = prefetcher.take(".gggg").result(timeout=10)
+    finally:
+        prefetcher.close()
+
+    # the fork wrote no prompts file, the generator writes the prompt the LLM answered
+    assert list(dump_dir.iterdir()) == []
+    previous_words = wordle_virtual_assistant.candidate_words
+    wordle_virtual_assistant.adopt(fork)
+    wordle_virtual_assistant.dump_prompt(prompt, previous_words)
+    assert sorted(wordle_virtual_assistant.candidate_words) == ["brace", "grace"]
+    assert wordle_virtual_assistant.guessed_word == "trace"
+    assert wordle_virtual_assistant.trace_sink is None
+    assert (dump_dir / "prompts_001.txt").read_text().endswith(prompt)
+
+    # the next turn filters from the adopted state
+    wordle_virtual_assistant.update_state(response_to_result(wordle_virtual_assistant, "grace", ".gggg"), "grace")
+    wordle_virtual_assistant.generate_llm_prompt()
+    assert wordle_virtual_assistant.candidate_words == ["brace"]
+    assert (dump_dir / "prompts_002.txt").exists()
+
+def test_unused_prefetches_are_cancelled(wordle_virtual_assistant):
+    llm_interface = SlowInterface()
+    prefetcher = SpeculativePrefetcher(llm_interface, max_prefetches=2, min_probability=0.0)
+    try:
+        prefetcher.start(wordle_virtual_assistant, "trace")
+        futures = list(prefetcher._prefetches.values())
+        assert len(futures) == 2
+
+        future = prefetcher.take(".gggg")
+        assert futures[1].cancelled()
+        assert prefetcher.stats == {"started": 2, "cancelled": 1, "hits": 1, "misses": 0}
+        future.cancel()
+        with pytest.raises(concurrent.futures.CancelledError):
+            future.result(timeout=1)
+    finally:
+        prefetcher.close()
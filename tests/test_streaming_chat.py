@@ -0,0 +1,111 @@
+import sys
+sys.path.append('./src')
+
+import json
+import threading
+
+import pytest
+
+from experiment_runner import run_games
+from llm_cache import PromptCache
+from streaming_chat import RecommendationScanner, StreamedChat
+from trace_sink import TraceSink, read_trace
+from wordle_solver import OpenAIInterface, WordListGeneratorLLM
+
+RESPONSE = '{"recommendation": "grace", "explanation": "It is \\"common\\"."}'
+
+
+def feed_chars(scanner, text):
+    for i, char in enumerate(text):
+        if scanner.feed(char) is not None:
+            return i
+    return None
+
+
+@pytest.fixture
+def fake_server_options():
+    return {"chunk_delay": 0.002}
+
+
+def test_scanner_finds_the_value_at_its_closing_quote():
+    scanner = RecommendationScanner()
+    assert feed_chars(scanner, RESPONSE) == RESPONSE.index('grace"') + len('grace')
+    assert scanner.value == "grace"
+
+@pytest.mark.parametrize("text, value", [
+    ('```json\n{"explanation": "a \\"recommendation\\": x", "recommendation": "cr\\u00e2te"}', "crâte"),
+    ('{"nested": {"recommendation": "water"}, "list": ["recommendation", 1], "recommendation": "zebra"}', "zebra"),
+    ('{"recommendation": null, "explanation": "none"}', None),
+    ('[{"recommendation": "trace"}]', None),
+])
+def test_scanner_only_reads_the_outer_key(text, value):
+    scanner = RecommendationScanner()
+    feed_chars(scanner, text)
+    assert scanner.value == value
+
+def test_recommendation_returns_before_the_stream_ends():
+    release = threading.Event()
+
+    def pieces():
+        yield RESPONSE[:30]
+        release.wait(5)
+        yield RESPONSE[30:]
+
+    streamed = StreamedChat(pieces())
+    recorded = []
+    streamed.add_done_callback(lambda streamed: recorded.append(streamed.content()))
+    assert streamed.recommendation(timeout=5) == "grace"
+    assert not streamed.done()
+    assert recorded == []
+
+    release.set()
+    assert streamed.wait(5)
+    assert recorded == [RESPONSE]
+    assert streamed.seconds_to_recommendation <= streamed.seconds_to_content
+
+def test_recommendation_falls_back_to_the_whole_response():
+    assert StreamedChat.from_content('{"recommendation": 12}').recommendation() == 12
+    with pytest.raises(json.JSONDecodeError):
+        StreamedChat.from_content('not json').recommendation()
+
+def test_stream_errors_are_raised_by_content():
+    def pieces():
+        yield '{"recommendation": "grace", '
+        raise ConnectionError("reset")
+
+    streamed = StreamedChat(pieces())
+    streamed.wait(5)
+    assert streamed.recommendation() == "grace"
+    assert isinstance(streamed.error, ConnectionError)
+    with pytest.raises(ConnectionError):
+        streamed.content()
+
+def test_chat_stream_matches_chat(fake_server):
+    llm_interface = OpenAIInterface("local", base_url=fake_server.base_url, cache=PromptCache(":memory:"))
+    prompt = "List of candidate words:\nwater\nzebra"
+    streamed = llm_interface.chat_stream(prompt)
+    assert streamed.recommendation(timeout=5) == "water"
+    assert streamed.wait(5)
+    assert streamed.content() == llm_interface.chat(prompt, bypass_cache=True)
+
+    # the streamed response was stored in the cache
+    assert llm_interface.chat_stream(prompt).content() == streamed.content()
+    assert fake_server.request_count == 2
+
+def test_streaming_games_record_every_response(word_file, fake_server, tmp_path):
+    trace_fp = str(tmp_path / "trace.jsonl.gz")
+    llm_interface = OpenAIInterface("local", base_url=fake_server.base_url)
+    with TraceSink(trace_fp) as sink:
+        wordle_virtual_assistant = WordListGeneratorLLM(word_file, llm_interface=llm_interface, stream=True)
+        wordle_virtual_assistant.load()
+        wordle_virtual_assistant.trace_sink = sink
+        results = run_games(lambda: wordle_virtual_assistant, ["grace", "zebra"], first_word="trace",
+                            solver_type="llm")
+        assert wordle_virtual_assistant.pending_responses == []
+
+    records = list(read_trace(trace_fp))
+    prompts = [(record["game"], record["turn"]) for record in records if record["event"] == "prompt"]
+    responses = [(record["game"], record["turn"]) for record in records if record["event"] == "llm_response"]
+    assert [result.word for result in results] == ["grace", "zebra"]
+    assert len(prompts) > 0
+    assert sorted(responses) == sorted(prompts)
@@ -0,0 +1,143 @@
+import sys
+sys.path.append('./src')
+
+import os
+
+import pytest
+
+from experiment_runner import run_games, solver_factory_for
+from trace_sink import TraceSink, apply_candidate_delta, candidate_delta, read_trace, state_to_json
+from wordle_solver import WordListGeneratorLLM, WordListGeneratorRandom
+
+
+@pytest.mark.parametrize("candidate_words", [[], ["trace"], ["trace", "grace", "brace", "place"],
+                                             ["water", "zebra", "trace", "crate", "grace", "brace", "place"]])
+def test_candidate_delta_round_trip(words, candidate_words):
+    delta = candidate_delta(words, candidate_words)
+    assert delta["count"] == len(candidate_words)
+    assert apply_candidate_delta(words, delta) == candidate_words
+
+def test_candidate_delta_stores_smaller_side(words):
+    assert candidate_delta(words, ["trace"]) == {"kept": ["trace"], "count": 1}
+    assert candidate_delta(words, words[1:]) == {"removed": ["apple"], "count": 7}
+
+def test_state_to_json():
+    state = {"present": {(1, 'r')}, "correct": {(4, 'e'), (0, 't')}, "absent": {'z', 'a'}}
+    assert state_to_json(state) == {"present": [[1, 'r']], "correct": [[0, 't'], [4, 'e']], "absent": ['a', 'z']}
+
+def test_off_mode_opens_nothing(tmp_path):
+    trace_fp = str(tmp_path / "trace.jsonl.gz")
+    sink = TraceSink(trace_fp, mode="off")
+    sink.emit("game", "event")
+    sink.close()
+    assert not os.path.exists(trace_fp)
+
+def test_rejects_unknown_mode_and_missing_file():
+    with pytest.raises(ValueError):
+        TraceSink("trace.jsonl.gz", mode="verbose")
+    with pytest.raises(ValueError):
+        TraceSink(mode="full")
+
+def test_sampled_mode_keeps_whole_games(tmp_path):
+    sink = TraceSink(str(tmp_path / "trace.jsonl.gz"), mode="sampled", sample_rate=0.5)
+    game_ids = [f"game{i}" for i in range(200)]
+    traced = [game_id for game_id in game_ids if sink.enabled_for(game_id)]
+    assert 50 < len(traced) < 150
+    assert traced == [game_id for game_id in game_ids if sink.enabled_for(game_id)]
+
+    for game_id in game_ids:
+        sink.emit(game_id, "first")
+        sink.emit(game_id, "second")
+    sink.close()
+
+    records = list(read_trace(sink.fp))
+    assert len(records) == 2 * len(traced)
+    assert {record["game"] for record in records} == set(traced)
+
+def test_unserializable_record_is_dropped(tmp_path):
+    sink = TraceSink(str(tmp_path / "trace.jsonl.gz"), queue_size=2)
+    sink.emit("game", "first")
+    sink.emit("game", "state", absent={'z'})
+    for i in range(5):
+        sink.emit("game", "after", i=i)
+    sink.close()
+
+    assert [record["event"] for record in read_trace(sink.fp)] == ["first"] + ["after"] * 5
+    assert sink.records_dropped == 1
+    assert not sink.failed
+
+def test_failed_trace_file_stops_tracing(tmp_path):
+    # a directory cannot be opened as the trace file
+    trace_dir = tmp_path / "trace.jsonl.gz"
+    trace_dir.mkdir()
+    sink = TraceSink(str(trace_dir), queue_size=2)
+    for i in range(10):
+        sink.emit("game", "event", i=i)
+    sink.close()
+
+    assert sink.failed
+    assert not sink.enabled_for("game")
+    assert sink.records_written == 0
+
+def test_random_generator_traces_instead_of_dump_files(word_file, words, tmp_path):
+    dump_dir = tmp_path / "dumps"
+    dump_dir.mkdir()
+    trace_fp = str(tmp_path / "trace.jsonl.gz")
+
+    with TraceSink(trace_fp) as sink:
+        wordle_virtual_assistant = WordListGeneratorRandom(word_file, dump_file_dir=str(dump_dir))
+        wordle_virtual_assistant.load()
+        wordle_virtual_assistant.trace_sink = sink
+        wordle_virtual_assistant.update_state({"present": set(), "correct": {(1, 'r'), (2, 'a')}, "absent": {'t'}})
+        wordle_virtual_assistant.get_candidate_word()
+
+    assert os.listdir(dump_dir) == []
+    [record] = read_trace(trace_fp)
+    assert record["game"] == wordle_virtual_assistant.game_id
+    assert record["event"] == "candidates"
+    assert record["turn"] == 1
+    assert apply_candidate_delta(words, record) == ["grace", "brace"]
+
+def test_llm_generator_traces_prompt_and_response(word_file, tmp_path):
+    trace_fp = str(tmp_path / "trace.jsonl.gz")
+    with TraceSink(trace_fp) as sink:
+        wordle_virtual_assistant = WordListGeneratorLLM(word_file)
+        wordle_virtual_assistant.dump_file_dir = str(tmp_path / "missing")
+        wordle_virtual_assistant.load()
+        wordle_virtual_assistant.trace_sink = sink
+        wordle_virtual_assistant.guessed_word = "trace"
+        wordle_virtual_assistant.update_state({"present": set(), "correct": {(1, 'r')}, "absent": {'t'}})
+        prompt = wordle_virtual_assistant.generate_llm_prompt()
+        wordle_virtual_assistant.record_llm_response({"recommendation": "grace", "explanation": ""})
+
+    prompt_record, response_record = read_trace(trace_fp)
+    assert prompt_record["event"] == "prompt"
+    assert prompt_record["prompt"] == prompt
+    assert prompt_record["guessed_word"] == "trace"
+    assert prompt_record["global_state"]["absent"] == ["t"]
+    assert response_record["event"] == "llm_response"
+    assert response_record["response"]["recommendation"] == "grace"
+    assert response_record["turn"] == prompt_record["turn"] == 1
+
+def test_run_games_tags_records_by_game(word_file, tmp_path):
+    trace_fp = str(tmp_path / "trace.jsonl.gz")
+    with TraceSink(trace_fp) as sink:
+        run_games(solver_factory_for("random", word_file, trace_sink=sink), ["grace", "zebra"], trials=2,
+                  first_word="trace", seed=1)
+
+    records = list(read_trace(trace_fp))
+    games = {}
+    for record in records:
+        games.setdefault(record["game"], []).append(record)
+
+    assert len(games) == 4
+    for game_records in games.values():
+        assert game_records[0]["event"] == "game"
+        assert game_records[-1]["event"] == "result"
+        assert game_records[-1]["word"] == game_records[0]["answer"]
+
+def test_runner_generators_write_no_dump_files_by_default(word_file, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("llm_trace_data")
+    run_games(solver_factory_for("random", word_file), ["grace"], first_word="trace", seed=1)
+    assert os.listdir("llm_trace_data") == []
@@ -0,0 +1,98 @@
+import sys
+sys.path.append('./src')
+
+import gc
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from word_dictionary import WordDictionary
+from wordle_solver import WordListGeneratorBase, WordListGeneratorLLM, WordListGeneratorRandom
+
+WORDS = ["apple", "water", "zebra", "trace", "crate", "grace"]
+
+
+@pytest.fixture
+def words():
+    return list(WORDS)
+
+
+def test_for_file_is_shared(word_file):
+    dictionary = WordDictionary.for_file(word_file)
+    assert WordDictionary.for_file(word_file) is dictionary
+    assert dictionary.words == WORDS
+    assert len(dictionary) == len(WORDS)
+
+def test_for_file_reloads_edited_file(word_file):
+    dictionary = WordDictionary.for_file(word_file)
+    with open(word_file, 'a') as file:
+        file.write("place\n")
+    stat = os.stat(word_file)
+    os.utime(word_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    edited = WordDictionary.for_file(word_file)
+    assert edited is not dictionary
+    assert edited.words[-1] == "place"
+
+def test_matrix_is_read_only(word_file):
+    matrix = WordDictionary.for_file(word_file).matrix
+    assert matrix.shape == (len(WORDS), 5)
+    with pytest.raises(ValueError):
+        matrix[0, 0] = 1
+
+def test_matrix_of_unencodable_words_is_none(tmp_path):
+    file_path = tmp_path / "answers.txt"
+    file_path.write_text("ABACK\nABASE\n")
+    assert WordDictionary.for_file(str(file_path)).matrix is None
+
+def test_indices_round_trip(word_file):
+    dictionary = WordDictionary.for_file(word_file)
+    indices = dictionary.indices_for(["grace", "apple"])
+    assert indices.tolist() == [5, 0]
+    assert indices.dtype == np.int32
+    assert dictionary.words_for(indices) == ["grace", "apple"]
+    with pytest.raises(KeyError):
+        dictionary.indices_for(["zzzzz"])
+
+def test_generators_share_the_dictionary(word_file):
+    random_generator = WordListGeneratorRandom(word_file)
+    llm_generator = WordListGeneratorLLM(word_file)
+    random_generator.load()
+    llm_generator.load()
+    assert random_generator.dictionary is llm_generator.dictionary
+    assert random_generator.candidate_words is llm_generator.candidate_words
+    assert random_generator.loaded_word_matrix is llm_generator.loaded_word_matrix
+
+def test_candidate_indices(word_file):
+    generator = WordListGeneratorBase(word_file)
+    generator.load()
+    generator.update_state({"present": set(), "correct": {(1, 'r')}, "absent": {'t'}})
+    generator.update_candidate_words()
+    assert generator.candidate_indices().tolist() == [5]
+
+@pytest.mark.parametrize("engine", ["regex", "numpy", "bitset"])
+def test_live_games_share_word_strings(engine):
+    template = WordListGeneratorBase("data/five-letter-words.txt", engine=engine)
+    template.load()
+    result = {"present": {(2, 'a')}, "correct": {(4, 'e')}, "absent": {'t', 'r', 'c'}}
+
+    gc.collect()
+    tracemalloc.start()
+    games = []
+    for _ in range(100):
+        game = template.clone()
+        game.update_state(result)
+        game.update_candidate_words()
+        games.append(game)
+        generator = WordListGeneratorBase("data/five-letter-words.txt", engine=engine)
+        generator.load()
+        games.append(generator)
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # a private copy of the 15,920 words would take about a megabyte per game
+    assert allocated / len(games) < 32 * 1024
+    assert all(game.loaded_words is template.loaded_words for game in games)
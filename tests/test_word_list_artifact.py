@@ -0,0 +1,99 @@
+import sys
+sys.path.append('./src')
+
+import os
+
+import numpy as np
+import pytest
+
+from word_list_artifact import artifact_path, compile_word_list, load_word_list_artifact
+from word_matrix import encode_words
+from wordle_solver import WordListGeneratorBase, WordListGeneratorEntropy
+
+WORDS = ["apple", "water", "zebra", "trace", "crate", "grace"]
+
+
+@pytest.fixture
+def words():
+    return list(WORDS)
+
+
+def test_artifact_path():
+    assert artifact_path("data/five-letter-words.txt") == "data/five-letter-words.wordlist"
+
+def test_compile_and_load_round_trip(word_file):
+    artifact_fp = compile_word_list(word_file)
+    assert artifact_fp == artifact_path(word_file)
+
+    words, matrix = load_word_list_artifact(word_file)
+    assert words == WORDS
+    assert isinstance(matrix, np.memmap)
+    assert np.array_equal(matrix, encode_words(WORDS))
+
+def test_uppercase_words_keep_case_without_matrix(tmp_path):
+    file_path = tmp_path / "answers.txt"
+    file_path.write_text("ABACK\nABASE\n")
+    compile_word_list(str(file_path))
+    assert load_word_list_artifact(str(file_path)) == (["ABACK", "ABASE"], None)
+
+def test_missing_or_stale_artifact(word_file):
+    assert load_word_list_artifact(word_file) is None
+
+    compile_word_list(word_file)
+    with open(word_file, 'a') as file:
+        file.write("place\n")
+    assert load_word_list_artifact(word_file) is None
+
+def test_touched_source_with_same_content_is_fresh(word_file):
+    compile_word_list(word_file)
+    stat = os.stat(word_file)
+    os.utime(word_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_word_list_artifact(word_file)[0] == WORDS
+
+def test_same_size_different_content_is_stale(word_file):
+    compile_word_list(word_file)
+    with open(word_file, 'w') as file:
+        file.write("\n".join(["apple", "water", "zebra", "trace", "crate", "brace"]) + "\n")
+    stat = os.stat(word_file)
+    os.utime(word_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_word_list_artifact(word_file) is None
+
+def test_corrupt_artifact_is_ignored(word_file):
+    artifact_fp = compile_word_list(word_file)
+    with open(artifact_fp, 'r+b') as file:
+        file.truncate(os.path.getsize(artifact_fp) - 1)
+    assert load_word_list_artifact(word_file) is None
+
+def test_compile_rejects_malformed_lines(tmp_path):
+    file_path = tmp_path / "words.txt"
+    file_path.write_text("apple\n\nwater\n")
+    with pytest.raises(ValueError):
+        compile_word_list(str(file_path))
+
+@pytest.mark.parametrize("engine", ["regex", "numpy", "bitset"])
+def test_load_uses_artifact(word_file, engine):
+    text_generator = WordListGeneratorBase(word_file, engine=engine)
+    text_generator.load()
+    assert not isinstance(text_generator.loaded_word_matrix, np.memmap)
+
+    # a new file, so the process-wide dictionary of the text file is not reused
+    artifact_file = os.path.join(os.path.dirname(word_file), "compiled.txt")
+    with open(artifact_file, 'w') as file:
+        file.write("\n".join(WORDS) + "\n")
+    compile_word_list(artifact_file)
+    artifact_generator = WordListGeneratorBase(artifact_file, engine=engine)
+    artifact_generator.load()
+    assert artifact_generator.candidate_words == text_generator.candidate_words
+    assert isinstance(artifact_generator.loaded_word_matrix, np.memmap)
+
+    state = {"present": {(0, 'g')}, "correct": {(2, 'a')}, "absent": {'p'}}
+    for generator in (text_generator, artifact_generator):
+        generator.update_state(state)
+        generator.update_candidate_words()
+    assert artifact_generator.candidate_words == text_generator.candidate_words
+
+def test_entropy_load_reuses_artifact_matrix(word_file):
+    compile_word_list(word_file)
+    wordle_virtual_assistant = WordListGeneratorEntropy(word_file)
+    wordle_virtual_assistant.load()
+    assert isinstance(wordle_virtual_assistant.loaded_word_matrix, np.memmap)
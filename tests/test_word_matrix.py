@@ -0,0 +1,70 @@
+import sys
+sys.path.append('./src')
+
+import numpy as np
+import pytest
+
+from word_matrix import encode_words, constraint_mask
+from wordle_solver import WordListGeneratorBase
+from wordle_judge import WordleJudge
+
+WORDS_FP = "data/five-letter-words.txt"
+
+
+def test_encode_words():
+    matrix = encode_words(["apple", "zebra"])
+    assert matrix.dtype == np.uint8
+    assert matrix.shape == (2, 5)
+    assert matrix[0].tolist() == [0, 15, 15, 11, 4]
+    assert matrix[1].tolist() == [25, 4, 1, 17, 0]
+
+def test_encode_words_empty():
+    assert encode_words([]).shape == (0, 5)
+
+def test_encode_words_invalid():
+    with pytest.raises(ValueError):
+        encode_words(["apple", "pear"])
+    with pytest.raises(ValueError):
+        encode_words(["APPLE"])
+
+def test_constraint_mask():
+    matrix = encode_words(["apple", "water", "zebra"])
+    state = {"present": {(0, 'a')}, "correct": set(), "absent": {'z'}}
+    assert constraint_mask(matrix, state).tolist() == [False, True, False]
+
+    state = {"present": set(), "correct": {(1, 'a')}, "absent": set()}
+    assert constraint_mask(matrix, state).tolist() == [False, True, False]
+
+@pytest.mark.parametrize("answer, guesses", [
+    ("apple", ["adieu", "alloy"]),
+    ("north", ["trace", "snort"]),
+    ("gusty", ["crate", "lusts", "bunty"]),
+])
+def test_numpy_engine_matches_regex_engine(answer, guesses):
+    regex_generator = WordListGeneratorBase(WORDS_FP)
+    numpy_generator = WordListGeneratorBase(WORDS_FP, engine="numpy")
+    regex_generator.load()
+    numpy_generator.load()
+
+    judge = WordleJudge(answer)
+    for guess in guesses:
+        result = judge.judge_guess(guess)
+        regex_generator.update_state(result)
+        numpy_generator.update_state(result)
+        regex_generator.update_candidate_words()
+        numpy_generator.update_candidate_words()
+        assert numpy_generator.candidate_words == regex_generator.candidate_words
+
+def test_numpy_engine_reencodes_replaced_candidates():
+    generator = WordListGeneratorBase(WORDS_FP, engine="numpy")
+    generator.load()
+    generator.update_state({"present": set(), "correct": {(0, 'a')}, "absent": set()})
+    generator.update_candidate_words()
+
+    generator.candidate_words = ["apple", "water", "zebra"]
+    generator.update_candidate_words()
+    assert generator.candidate_words == ["apple"]
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        WordListGeneratorBase(WORDS_FP, engine="bogus")
@@ -4,7 +4,9 @@ sys.path.append('./src')
 import random
 
 import pytest
-from wordle_judge import WordleJudge
+from feedback_patterns import ALL_CORRECT_PATTERN, PatternTable, feedback_pattern
+from wordle_judge import WordleJudge, BatchWordleJudge
+from wordle_solver import WordListGeneratorRandom
 
 
 def test_judge_guess_correct():
@@ -29,4 +31,54 @@ def test_judge_guess_partial_correct():
     judge = WordleJudge('apple')
     result = judge.judge_guess('ample')
     print(result)
-    assert result == {"present": [], "correct":  [(0, 'a'), (2, 'p'), (3, 'l'), (4, 'e')], "absent": ['m']}
\ No newline at end of file
+    assert result == {"present": [], "correct":  [(0, 'a'), (2, 'p'), (3, 'l'), (4, 'e')], "absent": ['m']}
+
+def test_batch_judge_cross():
+    guesses = ['alloy', 'apple', 'geese']
+    answers = ['apple', 'eerie', 'llama']
+    patterns = BatchWordleJudge().judge(guesses, answers)
+    assert patterns.shape == (3, 3)
+    assert patterns.tolist() == [[feedback_pattern(g, a) for a in answers] for g in guesses]
+
+def test_batch_judge_zip():
+    patterns = BatchWordleJudge().judge(['alloy', 'APPLE'], ['apple', 'apple'], mode='zip')
+    assert patterns.tolist() == [feedback_pattern('alloy', 'apple'), ALL_CORRECT_PATTERN]
+
+def test_batch_judge_repeated_letters():
+    # only one 'l' of 'alloy' is present in 'apple' by the Wordle rules
+    patterns = BatchWordleJudge().judge(['alloy'], ['apple'], mode='zip')
+    assert patterns.tolist() == [2 + 1 * 3]
+    # the results are those of judge_guess, which marks both
+    result = BatchWordleJudge.to_results(['alloy'], patterns)[0]
+    assert result == {"present": [(1, 'l'), (2, 'l')], "correct": [(0, 'a')], "absent": ['o', 'y']}
+    assert result == WordleJudge('apple').judge_guess('alloy')
+
+@pytest.mark.parametrize("engine", ["regex", "numpy", "bitset"])
+def test_batch_results_keep_the_answer(tmp_path, engine):
+    file_path = tmp_path / "words.txt"
+    file_path.write_text("apple\neerie\nalloy\nample\nbelle\nspeed\n")
+    guesses, answers = ['eerie', 'alloy', 'speed'], ['apple', 'apple', 'belle']
+    results = BatchWordleJudge.to_results(guesses, BatchWordleJudge().judge(guesses, answers, mode='zip'))
+    for guess, answer, result in zip(guesses, answers, results):
+        assert result == WordleJudge(answer).judge_guess(guess)
+        wordle_virtual_assistant = WordListGeneratorRandom(str(file_path), engine=engine)
+        wordle_virtual_assistant.load()
+        wordle_virtual_assistant.update_state(result)
+        wordle_virtual_assistant.update_candidate_words()
+        assert answer in wordle_virtual_assistant.candidate_words
+
+def test_batch_judge_pattern_table(tmp_path):
+    file_path = tmp_path / "words.txt"
+    file_path.write_text("apple\nalloy\nllama\n")
+    table = PatternTable.load(str(file_path), cache_dir=str(tmp_path / "cache"))
+    judge = BatchWordleJudge(pattern_table=table)
+    assert judge.judge(['alloy', 'llama'], ['apple'], mode='cross').tolist() == [[feedback_pattern('alloy', 'apple')], [feedback_pattern('llama', 'apple')]]
+    assert judge.judge(['alloy', 'llama'], ['apple', 'alloy'], mode='zip').tolist() == [feedback_pattern('alloy', 'apple'), feedback_pattern('llama', 'alloy')]
+    # words outside the table are computed
+    assert judge.judge(['ample'], ['apple'], mode='zip').tolist() == [feedback_pattern('ample', 'apple')]
+
+def test_batch_judge_invalid_arguments():
+    with pytest.raises(ValueError):
+        BatchWordleJudge().judge(['alloy'], ['apple'], mode='bogus')
+    with pytest.raises(ValueError):
+        BatchWordleJudge().judge(['alloy', 'apple'], ['apple'], mode='zip')
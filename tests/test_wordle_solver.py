@@ -6,6 +6,7 @@
 
 # one global modificaiton of generated code was to replace the file name "words.txt" with "data/five-letter-words.txt
 
+import math
 import os
 import sys
 sys.path.append('./src')
@@ -13,9 +14,13 @@ sys.path.append('./src')
 import pytest
 from unittest.mock import Mock, patch, mock_open
 
+from feedback_patterns import JUDGE_RULES, PatternTable, build_pattern_matrix, judge_patterns, pattern_entropy
+from word_matrix import encode_words
+
 from wordle_solver import (
     WordListGeneratorBase, 
     WordListGeneratorRandom, 
+    WordListGeneratorEntropy,
     WordListGeneratorLLM,
     OpenAIInterface,
     ExperimentRecorder,
@@ -91,6 +96,69 @@ def test_update_candidate_words(word_file):
     assert after_size <= before_size
 
 
+def test_update_candidate_words_applies_only_new_constraints(word_file):
+    word_list_generator = WordListGeneratorBase(word_file)
+    word_list_generator.load()
+    word_list_generator.update_state({"present": set(), "correct": set(), "absent": {'z'}})
+    word_list_generator.update_candidate_words()
+    assert word_list_generator.candidate_words == ["apple", "water"]
+
+    word_list_generator.update_state({"present": {(0, 'w')}, "correct": set(), "absent": {'y'}})
+    with patch.object(
+        word_list_generator, '_eliminate_words_with_absent_letters',
+        wraps=word_list_generator._eliminate_words_with_absent_letters,
+    ) as mock_absent:
+        word_list_generator.update_candidate_words()
+        mock_absent.assert_called_once_with({"present": {(0, 'w')}, "correct": set(), "absent": {'y'}})
+
+    assert word_list_generator.candidate_words == ["apple"]
+    assert word_list_generator.applied_state == word_list_generator.global_state
+
+@pytest.mark.parametrize("engine", ["regex", "numpy"])
+def test_incremental_filter_matches_full_filter(engine):
+    incremental = WordListGeneratorBase("data/five-letter-words.txt", engine=engine)
+    incremental.load()
+    results = [
+        {"present": [(3, 'e')], "correct": [(0, 'a')], "absent": ['d', 'i', 'u']},
+        {"present": [], "correct": [(0, 'a')], "absent": ['s', 't', 'o', 'r']},
+        {"present": [(2, 'a')], "correct": [(0, 'a'), (4, 'e')], "absent": ['w', 'k']},
+    ]
+    for result in results:
+        incremental.update_state(result)
+        incremental.update_candidate_words()
+
+    full = WordListGeneratorBase("data/five-letter-words.txt", engine=engine)
+    full.load()
+    full.global_state = incremental.global_state
+    full.update_candidate_words()
+
+    assert incremental.candidate_words == full.candidate_words
+
+def test_rollback(word_file):
+    word_list_generator = WordListGeneratorBase(word_file, engine="numpy")
+    word_list_generator.load()
+    word_list_generator.update_state({"present": set(), "correct": set(), "absent": {'z'}})
+    word_list_generator.update_candidate_words()
+    turn_one_candidates = word_list_generator.candidate_words
+
+    # what-if: apply a hypothetical result, inspect and roll back
+    word_list_generator.update_state({"present": set(), "correct": {(0, 'w')}, "absent": set()})
+    word_list_generator.update_candidate_words()
+    assert word_list_generator.candidate_words == ["water"]
+
+    word_list_generator.rollback()
+    assert word_list_generator.candidate_words is turn_one_candidates
+    assert word_list_generator.global_state == {"present": set(), "correct": set(), "absent": {'z'}}
+
+    word_list_generator.update_state({"present": set(), "correct": {(0, 'a')}, "absent": set()})
+    word_list_generator.update_candidate_words()
+    assert word_list_generator.candidate_words == ["apple"]
+
+    word_list_generator.rollback(2)
+    assert word_list_generator.candidate_words == WORDS
+    with pytest.raises(ValueError):
+        word_list_generator.rollback()
+
 def test_get_candidate_word(word_file):
     word_list_generator = WordListGeneratorRandom(word_file)
     word_list_generator.load()
@@ -173,6 +241,71 @@ def test_dump_file_count(setup_and_teardown, word_file):
     assert word_list_generator.dump_file_count == initial_count + 1
 
 
+###
+# Tests for WordListGeneratorEntropy
+###
+
+ENTROPY_WORDS = ["crane", "slate", "trace", "crate", "grace", "brace", "place", "space", "shade", "blade"]
+
+@pytest.fixture
+def entropy_word_file(tmp_path):
+    file_path = tmp_path / "entropy_words.txt"
+    file_path.write_text("\n".join(ENTROPY_WORDS) + "\n")
+    return str(file_path)
+
+def test_entropy_get_candidate_word(entropy_word_file):
+    word_list_generator = WordListGeneratorEntropy(entropy_word_file)
+    word_list_generator.load()
+    word_list_generator.update_state({"present": set(), "correct": {(4, 'e')}, "absent": {'z'}})
+
+    word = word_list_generator.get_candidate_word()
+    scores = word_list_generator.score_guesses()
+
+    assert len(scores) == len(ENTROPY_WORDS)
+    assert scores[ENTROPY_WORDS.index(word)] == pytest.approx(scores.max())
+
+def test_entropy_score_guesses_partition(entropy_word_file):
+    word_list_generator = WordListGeneratorEntropy(entropy_word_file)
+    word_list_generator.load()
+    word_list_generator.candidate_words = ["grace", "brace", "trace", "place"]
+
+    # 'place' splits the candidates into {'place'} and {'grace', 'brace', 'trace'}
+    scores = word_list_generator.score_guesses()
+    assert scores[ENTROPY_WORDS.index("place")] == pytest.approx(-0.25 * math.log2(0.25) - 0.75 * math.log2(0.75))
+    # 'blade' splits them into {'grace', 'trace'}, {'brace'} and {'place'}
+    assert scores[ENTROPY_WORDS.index("blade")] == pytest.approx(1.5)
+    # 'shade' gives the same pattern for every candidate
+    assert scores[ENTROPY_WORDS.index("shade")] == pytest.approx(0.0)
+
+def test_entropy_scores_judge_guess_feedback(tmp_path):
+    # the filters see judge_guess feedback, where every 'e' of a guess is present when the answer has an 'e'
+    words = ["eerie", "apple", "eagle", "lapel", "sheep"]
+    file_path = tmp_path / "repeated_words.txt"
+    file_path.write_text("\n".join(words) + "\n")
+    word_list_generator = WordListGeneratorEntropy(str(file_path))
+    word_list_generator.load()
+
+    word_matrix = encode_words(words)
+    expected = pattern_entropy(judge_patterns(word_matrix, word_matrix))
+    assert word_list_generator.score_guesses() == pytest.approx(expected)
+    # Wordle rules would tell all five answers apart after 'eerie', judge_guess cannot
+    assert expected[0] < math.log2(len(words))
+
+    # a judge-rule table gives the same scores, a Wordle-rule table is refused
+    table = PatternTable(words, words, build_pattern_matrix(word_matrix, word_matrix, rules=JUDGE_RULES), rules=JUDGE_RULES)
+    word_list_generator = WordListGeneratorEntropy(str(file_path), pattern_table=table)
+    word_list_generator.load()
+    assert word_list_generator.score_guesses() == pytest.approx(expected)
+    with pytest.raises(ValueError):
+        WordListGeneratorEntropy(str(file_path), pattern_table=PatternTable(words, words, build_pattern_matrix(word_matrix, word_matrix)))
+
+def test_entropy_get_candidate_word_no_candidates(entropy_word_file):
+    word_list_generator = WordListGeneratorEntropy(entropy_word_file)
+    word_list_generator.load()
+    word_list_generator.update_state({"present": set(), "correct": {(0, 'z')}, "absent": {'q'}})
+    assert word_list_generator.get_candidate_word() is None
+
+
 ###
 # Tests for WordListGeneratorLLM
 ###    
@@ -250,6 +383,26 @@ def test_generate_llm_prompt_with_candidate_words(word_file):
     assert "apple" in prompt
     assert "water" in prompt
 
+def test_llm_get_candidate_word(word_file):
+    llm_interface = Mock()
+    llm_interface.chat.return_value = '{"recommendation": "water", "explanation": "only word"}'
+    word_list_generator = WordListGeneratorLLM(word_file, llm_interface=llm_interface)
+    word_list_generator.load()
+    word_list_generator.update_state({"present": set(), "correct": {(1, 'a')}, "absent": {'z'}})
+
+    with patch('builtins.open', new_callable=mock_open) as mock_file:
+        word = word_list_generator.get_candidate_word()
+        mock_file.assert_called_with(
+            os.path.join(
+                word_list_generator.dump_file_dir,
+                'llm_response_001.txt',
+            ),
+            'w'
+        )
+
+    assert word == "water"
+    assert "water" in llm_interface.chat.call_args[0][0]
+
 # def test_generate_llm_prompt():
 #     # Create a WordListGeneratorLLM instance
 #     word_list_generator = WordListGeneratorLLM(word_file)